@@ -0,0 +1,128 @@
+# File: bench/kis_feed_stub.py
+"""
+KIS 실시간 WebSocket 로컬 대역 서버 (녹화 프레임 재생)
+────────────────────────────────────────────
+- 녹화 파일의 H0STCNT0 / HDFSCNT0 프레임을 원래 간격 / 배속으로 재생 (끝나면 처음부터 반복)
+  · 파일 형식: 한 줄에 "<녹화 시작부터 경과초>\t<원본 프레임>", '#' 로 시작하는 줄은 주석
+  · 기본 녹화: bench/kis_frames.txt (005930 · 000660 · AAPL|NAS 약 1분)
+- 구독 등록(tr_type=1)/해제(tr_type=2) 에 응답하고, 등록된 종목의 프레임만 전송
+  · 녹화에 없는 종목을 구독하면 같은 TR 의 녹화 프레임 종목코드를 바꿔 대신 전송
+- 주기적으로 PINGPONG 전송 (피드가 그대로 되돌려 보내야 함)
+- 접속키 발급 없이 피드를 붙여 볼 때 사용
+
+실행: python -m bench.kis_feed_stub [포트] [배속] [녹화 파일]
+      KIS_REALTIME=true KIS_WS_URL=ws://127.0.0.1:<포트> 로 앱 실행
+      (KISRealtimeFeed(approval_key="stub") 로 직접 생성해도 됨)
+"""
+import asyncio
+import json
+import os
+import sys
+
+from typing import Dict, List, Tuple
+
+import websockets
+
+from domain.fin.kis.kis_frames import DECODERS
+
+
+FRAMES_PATH   = os.path.join(os.path.dirname(__file__), "kis_frames.txt")
+PINGPONG_SECS = 10.0
+
+Frame = Tuple[float, str, str, str]     # (경과초, tr_id, 녹화 종목 tr_key, 원본 프레임)
+
+
+def load_frames(path: str = FRAMES_PATH) -> List[Frame]:
+    """녹화 파일 → 경과초 오름차순 프레임 목록 (지원하지 않는 TR 은 제외)"""
+    frames = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            offset, raw = line.split("\t", 1)
+            _, tr_id, _, data = raw.split("|", 3)
+            if tr_id in DECODERS:
+                frames.append((float(offset), tr_id, data.split("^", 1)[0], raw))
+    frames.sort(key=lambda fr: fr[0])
+    return frames
+
+
+def _rekey(raw: str, tr_id: str, key: str) -> str:
+    """녹화 프레임의 종목을 key 로 바꿈 (해외는 실시간종목코드와 종목코드 모두)"""
+    enc, _, count, data = raw.split("|", 3)
+    width  = DECODERS[tr_id][1]
+    fields = data.split("^")
+    for i in range(int(count)):
+        fields[i * width] = key
+        if tr_id == "HDFSCNT0":
+            fields[i * width + 1] = key[4:]
+    return f"{enc}|{tr_id}|{count}|" + "^".join(fields)
+
+
+async def _handler(ws, frames: List[Frame], speed: float) -> None:
+    subs     : set = set()
+    recorded = {(tr_id, key) for _, tr_id, key, _ in frames}
+    # 녹화에 없는 구독 종목 → 대신 재생할 녹화 종목 (TR 별 첫 종목)
+    standin  : Dict[str, str] = {}
+    for _, tr_id, key, _ in frames:
+        standin.setdefault(tr_id, key)
+
+    async def _player():
+        loop = asyncio.get_running_loop()
+        ping = loop.time() + PINGPONG_SECS
+        while True:
+            wall0 = loop.time()
+            for offset, tr_id, key, raw in frames:
+                delay = wall0 + offset / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                for sub_tr, sub_key in tuple(subs):
+                    if sub_tr != tr_id:
+                        continue
+                    if sub_key == key:
+                        await ws.send(raw)
+                    elif (tr_id, sub_key) not in recorded and standin.get(tr_id) == key:
+                        await ws.send(_rekey(raw, tr_id, sub_key))
+                if loop.time() >= ping:
+                    ping = loop.time() + PINGPONG_SECS
+                    await ws.send(json.dumps({"header": {"tr_id": "PINGPONG"}}))
+            await asyncio.sleep(0)
+
+    player = asyncio.create_task(_player())
+    try:
+        async for raw in ws:
+            msg = json.loads(raw)
+            hdr = msg.get("header", {})
+            if hdr.get("tr_id") == "PINGPONG":
+                continue
+            body = msg["body"]["input"]
+            key  = (body["tr_id"], body["tr_key"])
+            if hdr.get("tr_type") == "1":
+                subs.add(key)
+                msg1 = "SUBSCRIBE SUCCESS"
+            else:
+                subs.discard(key)
+                msg1 = "UNSUBSCRIBE SUCCESS"
+            await ws.send(json.dumps({
+                "header": {"tr_id": key[0], "tr_key": key[1], "encrypt": "N"},
+                "body":   {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": msg1},
+            }))
+    finally:
+        player.cancel()
+
+
+async def main(port: int = 21000, speed: float = 1.0, path: str = FRAMES_PATH) -> None:
+    frames = load_frames(path)
+    if not frames:
+        raise SystemExit(f"재생할 프레임이 없습니다: {path}")
+    async with websockets.serve(lambda ws: _handler(ws, frames, speed), "127.0.0.1", port):
+        print(f"KIS 실시간 대역 서버: ws://127.0.0.1:{port} ({len(frames)}개 프레임, {speed}배속)")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    port  = int(sys.argv[1])   if len(sys.argv) > 1 else 21000
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    path  = sys.argv[3]        if len(sys.argv) > 3 else FRAMES_PATH
+    asyncio.run(main(port, speed, path))
@@ -0,0 +1,83 @@
+# File: bench/quote_decode.py
+"""
+시세 1건 디코딩 CPU 시간 비교
+────────────────────────────────────────────
+before: output dict → DataFrame → to_json → json.loads → dict → int 변환
+after : output dict → StockQuote.from_output → to_dict
+
+실행: python -m bench.quote_decode [반복횟수]
+"""
+import json
+import sys
+import time
+
+import pandas as pd
+
+from domain.fin.kis.kis_quote import StockQuote
+
+
+# inquire-price(FHKST01010100) output 예시 (실제 응답과 같은 문자열 필드 구성)
+SAMPLE_OUTPUT = {
+    "iscd_stat_cls_code": "55", "marg_rate": "20.00", "rprs_mrkt_kor_name": "KOSPI200",
+    "bstp_kor_isnm": "전기·전자", "temp_stop_yn": "N", "oprc_rang_cont_yn": "N",
+    "clpr_rang_cont_yn": "N", "crdt_able_yn": "Y", "grmn_rate_cls_code": "40",
+    "elec_stck_prdy_vrss_sign": "5", "stck_prpr": "84100", "prdy_vrss": "-600",
+    "prdy_vrss_sign": "5", "prdy_ctrt": "-0.71", "acml_tr_pbmn": "1062394271800",
+    "acml_vol": "12634857", "prdy_vrss_vol_rate": "88.31", "stck_oprc": "84500",
+    "stck_hgpr": "85000", "stck_lwpr": "83600", "stck_mxpr": "110000",
+    "stck_llam": "59300", "stck_sdpr": "84700", "wghn_avrg_stck_prc": "84085.64",
+    "hts_frgn_ehrt": "55.72", "frgn_ntby_qty": "-1187420", "pgtr_ntby_qty": "-342112",
+    "pvt_scnd_dmrs_prc": "85766", "pvt_frst_dmrs_prc": "85233", "pvt_pont_val": "84466",
+    "pvt_frst_dmsp_prc": "83933", "pvt_scnd_dmsp_prc": "83166", "dmrs_val": "84850",
+    "dmsp_val": "83550", "cpfn": "7780", "rstc_wdth_prc": "25400",
+    "stck_fcam": "100", "stck_sspr": "67760", "aspr_unit": "100",
+    "hts_deal_qty_unit_val": "1", "lstn_stcn": "5919637922", "hts_avls": "4978415",
+    "per": "16.70", "pbr": "1.45", "stac_month": "12", "vol_tnrt": "0.21",
+    "eps": "5036.00", "bps": "57981.00", "d250_hgpr": "88800", "d250_hgpr_date": "20240711",
+    "d250_hgpr_vrss_prpr_rate": "-5.29", "d250_lwpr": "49900", "d250_lwpr_date": "20241114",
+    "d250_lwpr_vrss_prpr_rate": "68.54", "stck_dryy_hgpr": "88800",
+    "dryy_hgpr_vrss_prpr_rate": "-5.29", "dryy_hgpr_date": "20250711",
+    "stck_dryy_lwpr": "52000", "dryy_lwpr_vrss_prpr_rate": "61.73",
+    "dryy_lwpr_date": "20250102", "w52_hgpr": "88800", "w52_hgpr_vrss_prpr_ctrt": "-5.29",
+    "w52_hgpr_date": "20250711", "w52_lwpr": "49900", "w52_lwpr_vrss_prpr_ctrt": "68.54",
+    "w52_lwpr_date": "20241114", "whol_loan_rmnd_rate": "0.13", "ssts_yn": "Y",
+    "stck_shrn_iscd": "005930", "fcam_cnnm": "100", "cpfn_cnnm": "7,780 억",
+    "frgn_hldn_qty": "3298302734", "vi_cls_code": "N", "ovtm_vi_cls_code": "N",
+    "last_ssts_cntg_qty": "102334", "invt_caful_yn": "N", "mrkt_warn_cls_code": "00",
+    "short_over_yn": "N", "sltr_yn": "N",
+}
+
+
+def decode_before(out):
+    df  = pd.DataFrame(out, index=[0])
+    rec = json.loads(df.to_json(orient="records", force_ascii=False))[0]
+    return {
+        "price":  int(rec["stck_prpr"].replace(",", "")),
+        "change": int(rec["prdy_vrss"].replace(",", "")),
+    }
+
+
+def decode_after(out):
+    return StockQuote.from_output("005930", out).to_dict()
+
+
+def _cpu_per_call(fn, n: int) -> float:
+    fn(SAMPLE_OUTPUT)                       # 워밍업
+    start = time.process_time()
+    for _ in range(n):
+        fn(SAMPLE_OUTPUT)
+    return (time.process_time() - start) / n
+
+
+def main(n: int = 20_000) -> None:
+    assert decode_before(SAMPLE_OUTPUT) == decode_after(SAMPLE_OUTPUT)
+
+    before = _cpu_per_call(decode_before, max(n // 20, 1))
+    after  = _cpu_per_call(decode_after, n)
+    print(f"before (DataFrame → JSON → dict): {before * 1e6:10.2f} µs/quote")
+    print(f"after  (StockQuote.from_output) : {after  * 1e6:10.2f} µs/quote")
+    print(f"speedup                         : {before / after:10.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
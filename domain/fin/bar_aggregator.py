@@ -0,0 +1,179 @@
+# File: domain/fin/bar_aggregator.py
+"""
+실시간 틱 → 1분/5분/15분 OHLCV 봉 집계기
+────────────────────────────────────────────
+- 폴링 결과(업스트림 조회 1회)와 실시간 체결을 그대로 받아 봉을 갱신 → 추가 업스트림 호출 없음
+- 종목 · 주기별로 미리 할당한 NumPy 링 버퍼(BARS_CAPACITY 칸) 사용 → 종목당 메모리 고정
+- 거래량은 누적거래량 차이로 계산 (누적값이 줄면 새 거래일로 보고 다시 시작)
+- 현재 봉보다 이전 시각의 늦게 도착한 틱은 무시
+- 종목 수는 BARS_MAX_SYMBOLS 로 제한, 가장 오래 갱신되지 않은 종목부터 제거
+"""
+import logging
+import time
+
+from collections import OrderedDict
+from typing      import Any, Dict, Optional, Tuple
+
+import numpy as np
+from starlette.config import Config
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+BARS_CAPACITY    = config("BARS_CAPACITY",    cast=int, default=600)    # 주기별 보관 봉 수
+BARS_MAX_SYMBOLS = config("BARS_MAX_SYMBOLS", cast=int, default=2000)   # 집계할 최대 종목 수
+
+# 주기 이름 → 초
+TIMEFRAMES = {"1m": 60, "5m": 300, "15m": 900}
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+Key = Tuple[str, str]   # (kind, code)
+
+
+# ────────────────────────── 링 버퍼 ──────────────────────────
+class BarRing:
+    """한 주기의 봉 링 버퍼 (고정 길이 배열, head 가 진행 중인 봉)"""
+
+    FIELDS = ("time", "open", "high", "low", "close", "volume")
+    __slots__ = FIELDS + ("span", "head", "count")
+
+    def __init__(self, span: int, capacity: int = BARS_CAPACITY) -> None:
+        self.time   = np.zeros(capacity, dtype=np.int64)     # 봉 시작 (epoch 초)
+        self.open   = np.zeros(capacity, dtype=np.float64)
+        self.high   = np.zeros(capacity, dtype=np.float64)
+        self.low    = np.zeros(capacity, dtype=np.float64)
+        self.close  = np.zeros(capacity, dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.int64)
+        self.span   = span
+        self.head   = -1         # 진행 중인 봉 위치 (-1: 비어 있음)
+        self.count  = 0          # 채워진 봉 수 (최대 capacity)
+
+    def update(self, ts: int, price: float, volume: int) -> None:
+        start = ts - ts % self.span
+        i     = self.head
+        if i >= 0 and start == self.time[i]:
+            if price > self.high[i]:
+                self.high[i] = price
+            if price < self.low[i]:
+                self.low[i] = price
+            self.close[i]   = price
+            self.volume[i] += volume
+            return
+        if i >= 0 and start < self.time[i]:
+            return                                      # 늦게 도착한 틱
+
+        i = self.head = (i + 1) % len(self.time)
+        self.time[i]   = start
+        self.open[i]   = self.high[i] = self.low[i] = self.close[i] = price
+        self.volume[i] = volume
+        self.count     = min(self.count + 1, len(self.time))
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """오래된 봉 → 최신 봉 순서의 컬럼별 목록"""
+
+        n   = self.count if limit is None else max(min(limit, self.count), 0)
+        idx = np.arange(self.head - n + 1, self.head + 1) % len(self.time)
+        return {f: getattr(self, f)[idx].tolist() for f in self.FIELDS}
+
+
+class _Symbol:
+    """종목 1개의 주기별 링 버퍼 + 직전 누적거래량"""
+
+    __slots__ = ("rings", "last_volume", "updated_at")
+
+    def __init__(self, capacity: int) -> None:
+        self.rings       = {tf: BarRing(span, capacity) for tf, span in TIMEFRAMES.items()}
+        self.last_volume : Optional[int] = None
+        self.updated_at  = 0.0
+
+
+# ────────────────────────── 집계기 ──────────────────────────
+class BarAggregator:
+    """(kind, code) 별 1분/5분/15분 봉 실시간 집계"""
+
+    def __init__(self, capacity: int = BARS_CAPACITY, max_symbols: int = BARS_MAX_SYMBOLS) -> None:
+        self._capacity = capacity
+        self._max      = max_symbols
+        self._symbols  : "OrderedDict[Key, _Symbol]" = OrderedDict()
+        self.ticks     = 0
+
+    def observe(
+        self,
+        kind   : str,
+        code   : str,
+        price  : float,
+        volume : Optional[int] = None,
+        ts     : Optional[float] = None,
+    ) -> None:
+        """
+        틱 1건 반영.
+
+        * volume: 누적거래량 (없으면 거래량 0 으로 가격만 반영)
+        * ts    : 관측 시각 (epoch 초, 기본 현재)
+        """
+        if not price:
+            return
+
+        key = (kind, code)
+        sym = self._symbols.get(key)
+        if sym is None:
+            sym = self._symbols[key] = _Symbol(self._capacity)
+            self._evict()
+        else:
+            self._symbols.move_to_end(key)
+
+        traded = 0
+        if volume is not None:
+            last = sym.last_volume
+            if last is not None and volume >= last:
+                traded = volume - last
+            sym.last_volume = volume
+
+        now = int(ts if ts is not None else time.time())
+        for ring in sym.rings.values():
+            ring.update(now, price, traded)
+        sym.updated_at = now
+        self.ticks    += 1
+
+    def bars(self, kind: str, code: str, tf: str, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """주기별 봉 (집계 중이 아닌 종목이면 None, 알 수 없는 주기면 KeyError)"""
+
+        if tf not in TIMEFRAMES:
+            raise KeyError(f"지원하지 않는 주기: {tf}")
+        sym = self._symbols.get((kind, code))
+        if sym is None:
+            return None
+        return sym.rings[tf].to_dict(limit)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols"  : len(self._symbols),
+            "ticks"    : self.ticks,
+            "capacity" : self._capacity,
+        }
+
+    # ── 내부 ──────────────────────────────────────────
+    def _evict(self) -> None:
+        while len(self._symbols) > self._max:
+            key, _ = self._symbols.popitem(last=False)
+            _debug("BARS", f"evicted key={key}")
+
+
+# 프로세스 전역 집계기 (fin_router 에서 사용)
+bar_aggregator = BarAggregator()
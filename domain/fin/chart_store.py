@@ -0,0 +1,354 @@
+# File: domain/fin/chart_store.py
+"""
+국내 종목 일봉 로컬 저장소 + 증분 백필
+────────────────────────────────────────────
+- 종목(수정주가 구분)별 NumPy 컬럼 배열(.npz) 1개: date / open / high / low / close / volume / amount
+- 저장된 구간(covered_from ~ covered_to) 밖의 날짜만 KIS(FHKST03010100)에서 받아 병합
+  (140일 창 단위로 나눠 동시 호출 → 창 1개는 영업일 100일 이하라 호출 1회로 끝남,
+   동시에 진행하는 창은 저장소 전체에서 CHART_FETCH_CONCURRENCY 개까지)
+- 한 번에 조회할 수 있는 기간은 CHART_MAX_DAYS 일까지
+- 주/월/년봉은 일봉에서 로컬로 집계 (period_code 별 업스트림 호출 없음)
+- 장 마감 전 오늘 봉은 파일에 확정 저장하지 않고 CHART_LIVE_TTL 동안만 메모리 보관
+- 저장 구간 안의 조회는 로컬 I/O 만 수행
+"""
+import asyncio
+import logging
+import os
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime    import date, datetime, timedelta
+from typing      import Any, Dict, List, Optional, Tuple
+from zoneinfo    import ZoneInfo
+
+import numpy as np
+from starlette.config import Config
+
+from .kis import kis_async as kio
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+CHART_STORE_DIR     = config("CHART_STORE_DIR",     default=os.path.join(os.path.expanduser("~"), ".jandi", "charts"))
+CHART_DEFAULT_DAYS  = config("CHART_DEFAULT_DAYS",  cast=int,   default=100)   # 시작일 미지정 시 조회 기간
+CHART_LIVE_TTL      = config("CHART_LIVE_TTL",      cast=float, default=60.0)  # 장중 오늘 봉 재조회 주기 (초)
+CHART_CACHE_SYMBOLS = config("CHART_CACHE_SYMBOLS", cast=int,   default=256)   # 메모리에 올려둘 종목 수
+CHART_MAX_DAYS      = config("CHART_MAX_DAYS",      cast=int,   default=7300)  # 요청 1건의 최대 기간 (약 20년)
+
+# 동시에 진행할 140일 창 조회 수 (KIS_RATE_MAX_QUEUE 보다 충분히 작게)
+CHART_FETCH_CONCURRENCY = config("CHART_FETCH_CONCURRENCY", cast=int, default=8)
+
+KST          = ZoneInfo("Asia/Seoul")
+MARKET_CLOSE = (15, 40)          # 이 시각(KST) 이후 오늘 일봉을 확정으로 간주
+FETCH_WINDOW = 140               # 140일 = 20주 → 영업일 최대 100일 (TR 1회 최대 100건)
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+# ────────────────────────── 날짜 유틸 ──────────────────────────
+def _to_date(d: int) -> date:
+    return date(d // 10000, d // 100 % 100, d % 100)
+
+
+def _to_int(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _shift(d: int, days: int) -> int:
+    return _to_int(_to_date(d) + timedelta(days=days))
+
+
+def _days(dates: np.ndarray) -> np.ndarray:
+    """YYYYMMDD(int) 배열 → 1970-01-01 기준 일수 (벡터 연산)"""
+    y = (dates // 10000 - 1970).astype("datetime64[Y]")
+    m = (dates // 100 % 100 - 1).astype("timedelta64[M]")
+    d = (dates % 100 - 1).astype("timedelta64[D]")
+    return ((y.astype("datetime64[M]") + m).astype("datetime64[D]") + d).astype(np.int64)
+
+
+def today_kst() -> int:
+    return _to_int(datetime.now(KST).date())
+
+
+def last_final_day() -> int:
+    """일봉이 확정된 마지막 날짜 (장 마감 전이면 어제)"""
+    now = datetime.now(KST)
+    if (now.hour, now.minute) >= MARKET_CLOSE:
+        return _to_int(now.date())
+    return _to_int(now.date() - timedelta(days=1))
+
+
+def period_start(d: int, period: str) -> int:
+    """d 가 속한 주(월요일)/월/년의 첫 날"""
+    if period == "W":
+        return _shift(d, -_to_date(d).weekday())
+    if period == "M":
+        return d // 100 * 100 + 1
+    if period == "Y":
+        return d // 10000 * 10000 + 101
+    return d
+
+
+# ────────────────────────── 봉 배열 ──────────────────────────
+class Bars:
+    """날짜 오름차순 OHLCV 컬럼 배열"""
+
+    FIELDS = ("date", "open", "high", "low", "close", "volume", "amount")
+    __slots__ = FIELDS
+
+    def __init__(self, date, open, high, low, close, volume, amount):
+        self.date   = np.asarray(date,   dtype=np.int32)
+        self.open   = np.asarray(open,   dtype=np.int64)
+        self.high   = np.asarray(high,   dtype=np.int64)
+        self.low    = np.asarray(low,    dtype=np.int64)
+        self.close  = np.asarray(close,  dtype=np.int64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+        self.amount = np.asarray(amount, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    @classmethod
+    def empty(cls) -> "Bars":
+        return cls(*([[]] * len(cls.FIELDS)))
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "Bars":
+        """KIS 기간별시세 output2 행 → Bars (날짜 정렬 · 중복 제거)"""
+        cols = (
+            [r["stck_bsop_date"]        for r in rows],
+            [r.get("stck_oprc") or 0    for r in rows],
+            [r.get("stck_hgpr") or 0    for r in rows],
+            [r.get("stck_lwpr") or 0    for r in rows],
+            [r.get("stck_clpr") or 0    for r in rows],
+            [r.get("acml_vol") or 0     for r in rows],
+            [r.get("acml_tr_pbmn") or 0 for r in rows],
+        )
+        return cls.empty().merge(cls(*(np.asarray(c, dtype=np.int64) for c in cols)))
+
+    def _take(self, idx) -> "Bars":
+        return Bars(*(getattr(self, f)[idx] for f in self.FIELDS))
+
+    def slice(self, start: int, end: int) -> "Bars":
+        lo = np.searchsorted(self.date, start, side="left")
+        hi = np.searchsorted(self.date, end,   side="right")
+        return self._take(slice(lo, hi))
+
+    def merge(self, other: "Bars") -> "Bars":
+        """날짜 기준 합집합 (같은 날짜는 other 값 우선)"""
+        both  = Bars(*(np.concatenate([getattr(self, f), getattr(other, f)]) for f in self.FIELDS))
+        order = np.argsort(both.date, kind="stable")
+        dates = both.date[order]
+        last  = np.r_[dates[1:] != dates[:-1], True] if len(dates) else np.zeros(0, dtype=bool)
+        return both._take(order[last])
+
+    def resample(self, period: str) -> "Bars":
+        """일봉 → 주(W)/월(M)/년(Y)봉 (날짜는 구간 첫 거래일)"""
+        if period == "D" or not len(self):
+            return self
+        if period == "W":
+            key = (_days(self.date) + 3) // 7            # 1970-01-01(목) 기준 월요일 시작 주 번호
+        elif period == "M":
+            key = self.date // 100
+        else:
+            key = self.date // 10000
+
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        ends   = np.r_[starts[1:], len(key)] - 1
+        return Bars(
+            self.date[starts],
+            self.open[starts],
+            np.maximum.reduceat(self.high, starts),
+            np.minimum.reduceat(self.low, starts),
+            self.close[ends],
+            np.add.reduceat(self.volume, starts),
+            np.add.reduceat(self.amount, starts),
+        )
+
+    def to_dict(self) -> Dict[str, List[int]]:
+        return {f: getattr(self, f).tolist() for f in self.FIELDS}
+
+
+@dataclass
+class _Series:
+    """종목 1개의 확정 일봉 + 저장 구간 (0 이면 없음)"""
+
+    bars          : Bars
+    covered_from  : int = 0
+    covered_to    : int = 0
+
+    def gaps(self, start: int, end: int) -> List[Tuple[int, int]]:
+        if not self.covered_from:
+            return [(start, end)] if start <= end else []
+        out = []
+        if start < self.covered_from:
+            out.append((start, _shift(self.covered_from, -1)))
+        if end > self.covered_to:
+            out.append((_shift(self.covered_to, 1), end))
+        return [(a, b) for a, b in out if a <= b]
+
+
+# ────────────────────────── 저장소 ──────────────────────────
+class ChartStore:
+    """종목별 일봉 파일 + 메모리 LRU + 종목 단위 백필 잠금"""
+
+    def __init__(self, root: str = CHART_STORE_DIR, max_symbols: int = CHART_CACHE_SYMBOLS) -> None:
+        self.root     = root
+        self._max     = max_symbols
+        self._mem     : "OrderedDict[Tuple[str, str], _Series]"        = OrderedDict()
+        self._live    : Dict[Tuple[str, str], Tuple[float, Bars]]      = {}
+        self._locks   : Dict[Tuple[str, str], asyncio.Lock]            = {}
+        self.local    = 0       # 로컬만으로 응답한 횟수
+        self.backfill = 0       # 업스트림 백필이 필요했던 횟수
+        self.calls    = 0       # 업스트림 호출 수
+        self._slots   = asyncio.Semaphore(CHART_FETCH_CONCURRENCY)
+        os.makedirs(root, exist_ok=True)
+
+    # ── 조회 ──────────────────────────────────────────
+    async def daily(self, code: str, start: int, end: int, adj: str = "0") -> Bars:
+        """[start, end] 일봉 (확정 구간은 로컬, 없는 구간만 업스트림)"""
+
+        key   = (code, adj)
+        final = min(end, last_final_day())
+        s     = self._load(key)
+
+        if s.gaps(start, final):
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                s    = self._load(key)
+                gaps = s.gaps(start, final)
+                if gaps:
+                    self.backfill += 1
+                    fetched = await asyncio.gather(*(self._fetch(code, a, b, adj) for a, b in gaps))
+                    for bars in fetched:
+                        s.bars = s.bars.merge(bars)
+                    s.covered_from = min(start, s.covered_from or start)
+                    s.covered_to   = max(final, s.covered_to)
+                    self._save(key, s)
+                    _debug("CHART", f"backfilled {key} gaps={gaps} rows={len(s.bars)}")
+        else:
+            self.local += 1
+
+        bars = s.bars.slice(start, end)
+        if end > final:
+            bars = bars.merge(await self._today(code, adj, final, end))
+        return bars
+
+    async def chart(self, code: str, period: str, start: int, end: int, adj: str = "0") -> Bars:
+        """일(D)/주(W)/월(M)/년(Y)봉 — 주·월·년봉은 시작일을 구간 첫 날로 당겨 일봉에서 집계"""
+
+        return (await self.daily(code, period_start(start, period), end, adj)).resample(period)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols":  len(self._mem),
+            "local":    self.local,
+            "backfill": self.backfill,
+            "calls":    self.calls,
+        }
+
+    # ── 내부 ──────────────────────────────────────────
+    async def _today(self, code: str, adj: str, final: int, end: int) -> Bars:
+        """확정 전 봉(보통 오늘) — CHART_LIVE_TTL 동안 메모리 재사용"""
+
+        key = (code, adj)
+        hit = self._live.get(key)
+        now = time.monotonic()
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        bars = await self._fetch(code, _shift(final, 1), end, adj)
+        self._live[key] = (now + CHART_LIVE_TTL, bars)
+        return bars
+
+    async def _fetch(self, code: str, start: int, end: int, adj: str) -> Bars:
+        """[start, end] 를 140일 창으로 나눠 동시 조회 (각 창은 TR 1회, 동시 진행은 _slots 만큼)"""
+
+        windows = []
+        lo = start
+        while lo <= end:
+            hi = min(_shift(lo, FETCH_WINDOW - 1), end)
+            windows.append((lo, hi))
+            lo = _shift(hi, 1)
+
+        async def _window(a: int, b: int):
+            async with self._slots:
+                self.calls += 1
+                return await kio.get_daily_itemchart(code, str(a), str(b), "D", adj)
+
+        results = await asyncio.gather(*(_window(a, b) for a, b in windows))
+        if any(rows is None for rows in results):
+            raise RuntimeError(f"{code} 일봉 조회 실패")
+        return Bars.from_rows([row for rows in results for row in rows])
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        return os.path.join(self.root, f"{key[0]}_{key[1]}.npz")
+
+    def _load(self, key: Tuple[str, str]) -> _Series:
+        s = self._mem.get(key)
+        if s is not None:
+            self._mem.move_to_end(key)
+            return s
+
+        try:
+            with np.load(self._path(key)) as z:
+                s = _Series(
+                    Bars(*(z[f] for f in Bars.FIELDS)),
+                    int(z["covered_from"]),
+                    int(z["covered_to"]),
+                )
+        except FileNotFoundError:
+            s = _Series(Bars.empty())
+
+        self._mem[key] = s
+        while len(self._mem) > self._max:
+            self._mem.popitem(last=False)
+        return s
+
+    def _save(self, key: Tuple[str, str], s: _Series) -> None:
+        # 임시 파일에 쓴 뒤 rename → 동시에 읽는 프로세스가 반쯤 쓴 파일을 보지 않음
+        path = self._path(key)
+        tmp  = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp,
+            covered_from = np.int32(s.covered_from),
+            covered_to   = np.int32(s.covered_to),
+            **{f: getattr(s.bars, f) for f in Bars.FIELDS},
+        )
+        os.replace(tmp, path)
+
+
+def default_range(start: Optional[str], end: Optional[str]) -> Tuple[int, int]:
+    """
+    YYYYMMDD 문자열 → (start, end) 정수, 미지정 시 오늘 / CHART_DEFAULT_DAYS 일 전.
+    없는 날짜 · 역전된 구간 · CHART_MAX_DAYS 초과는 ValueError
+    """
+    try:
+        e = _to_int(_to_date(int(end))) if end else today_kst()
+        s = _to_int(_to_date(int(start))) if start else _shift(e, -CHART_DEFAULT_DAYS)
+    except ValueError:
+        raise ValueError("존재하지 않는 날짜입니다.")
+    if s < 19000101:
+        raise ValueError("1900년 이전은 조회할 수 없습니다.")
+    if s > e:
+        raise ValueError("시작일이 종료일보다 늦습니다.")
+    if (_to_date(e) - _to_date(s)).days > CHART_MAX_DAYS:
+        raise ValueError(f"조회 기간은 최대 {CHART_MAX_DAYS}일입니다.")
+    return s, e
+
+
+# 프로세스 전역 저장소 (fin_router 에서 사용)
+chart_store = ChartStore()
@@ -1,10 +1,13 @@
 # ─── 표준 라이브러리 ──────────────────────────────────────────────────────────
 import asyncio
 import json
-from typing import Any, Dict, List, Optional
+import re
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 # ─── 서드파티 ─────────────────────────────────────────────────────────────────
-import pandas as pd
+import numpy as np
 from fastapi import (
     APIRouter,
     HTTPException,
@@ -16,9 +19,25 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 # ─── 내부 모듈 ─────────────────────────────────────────────────────────────────
-from .codef.codef import fetch_transactions
-from .kis import kis_domstk as kb
 from .kis import kis_auth as ka
+from .kis import kis_async as kio
+from .kis import kis_realtime as kr
+from .kis.kis_client import default_pool
+from .kis.kis_ratelimit import RateLimitExceeded
+from .bar_aggregator import TIMEFRAMES, bar_aggregator
+from .chart_store import chart_store, default_range, today_kst
+from .market_calendar import CLOSED, KRX, session as market_session
+from .minute_chart import minute_chart
+from .quote_hub import DeltaEncoder, Mailbox, quote_hub
+from .quote_store import quote_store
+from .tick_recorder import tick_recorder
+from .quote_cache import (
+    QUOTE_STALE_MAX,
+    QUOTE_TTL_INDEX,
+    QUOTE_TTL_OVERSEAS,
+    QUOTE_TTL_STOCK,
+    quote_cache,
+)
 
 # 최초 1회 한국투자증권 토큰 발급
 ka.auth()
@@ -31,17 +50,6 @@ router = APIRouter(
 
 # ─── 유틸리티 ─────────────────────────────────────────────────────────────────
 
-def df_to_dicts(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    """DataFrame → list[dict] (UTF-8 한글 보존)
-
-    Notes
-    -----
-    * `orient="records"` 옵션으로 행(row) 단위 리스트를 생성합니다.
-    * `force_ascii=False` 로 한글 필드 값이 이스케이프되지 않도록 합니다.
-    """
-    return json.loads(df.to_json(orient="records", force_ascii=False))
-
-
 def record_to_json(rec: Dict[str, Any]) -> JSONResponse:
     """단일 `dict` → FastAPI `JSONResponse`. Swagger 예시로 활용가능."""
     return JSONResponse(content=rec)
@@ -51,28 +59,180 @@ def list_to_json(lst: List[Dict[str, Any]]) -> JSONResponse:
     """`list[dict]` → FastAPI `JSONResponse`. Swagger 예시로 활용가능."""
     return JSONResponse(content=lst)
 
+# ─── 시세 조회 헬퍼 (REST · WebSocket 공용) ───────────────────────────────────
+
+def _observe(kind: str, code: str, price, change, volume: Optional[int]) -> None:
+    """업스트림 관측값 1건 → 시세 저장소 · 봉 집계기 · 틱 기록기"""
+    quote_store.put(kind, code, price, change, volume)
+    bar_aggregator.observe(kind, code, price, volume)
+    tick_recorder.record(kind, code, price, change, volume)
+
+
+def _quote_payload(kind: str, code: str, quote) -> Dict[str, Any]:
+    """시세 레코드 → {"price", "change"} (조회 실패 시 예외)"""
+    if quote is None:
+        raise ValueError(f"{code} 응답 없음")
+    _observe(kind, code, quote.price, quote.change, quote.volume)
+    return quote.to_dict()
+
+
+async def fetch_stock(itm_no: str) -> Dict[str, Any]:
+    """국내 종목 현재가 → {"price", "change"}"""
+    return _quote_payload("stock", itm_no, await kio.get_stock_quote(itm_no))
+
+
+async def fetch_index(idx_code: str) -> Dict[str, Any]:
+    """국내 지수 현재가 → {"price", "change"}"""
+    return _quote_payload("index", idx_code, await kio.get_index_quote(idx_code))
+
+
+def _overseas_code(symb: str, excd: str) -> str:
+    """해외 허브 코드 "SYM|EXC" (대문자로 통일 → 실시간 체결 프레임의 코드와 같은 키)"""
+    return f"{symb.upper()}|{excd.upper()}"
+
+
+async def fetch_overseas(code: str) -> Dict[str, Any]:
+    """해외 종목 현재가("SYM|EXC") → {"price", "change"}"""
+    symb, excd = code.split("|", 1)
+    return _quote_payload("overseas", code, await kio.get_overseas_quote(symb, excd))
+
+
+# REST · WebSocket 모두 TTL 캐시를 거쳐 업스트림 호출 (동시 미스는 1건으로 합침)
+# 휴장 중에는 마지막 값을 다음 장 시작까지 유지
+quote_cache.register("stock",    fetch_stock,    QUOTE_TTL_STOCK,    partial(market_session, "stock"))
+quote_cache.register("index",    fetch_index,    QUOTE_TTL_INDEX,    partial(market_session, "index"))
+quote_cache.register("overseas", fetch_overseas, QUOTE_TTL_OVERSEAS, partial(market_session, "overseas"))
+
+
+async def _hub_fetch(kind: str, code: str) -> Dict[str, Any]:
+    """허브 폴링용 캐시 조회. as_of 는 stale 일 때만 실어 값이 같으면 프레임이 나가지 않게 함"""
+    payload = await quote_cache.get(kind, code)
+    if not payload["stale"]:
+        del payload["as_of"]
+    return payload
+
+
+# 종목당 폴러 1개만 두고 모든 소켓이 공유 (종류, 조회 함수, 정규장 폴링 간격, 장 상태)
+quote_hub.register("stock",    partial(_hub_fetch, "stock"),    0.5, partial(market_session, "stock"))
+quote_hub.register("index",    partial(_hub_fetch, "index"),    0.5, partial(market_session, "index"))
+quote_hub.register("overseas", partial(_hub_fetch, "overseas"), 1.0, partial(market_session, "overseas"))
+
+
+# 실시간 피드 (KIS_REALTIME=true 일 때 앱 lifespan 에서 시작, 미지원·한도 초과 종목은 폴링 유지)
+_realtime_feed: Optional[kr.KISRealtimeFeed] = None
+
+
+def _on_realtime_tick(kind: str, code: str, payload: Dict[str, Any]) -> None:
+    """실시간 체결 → 관측 기록 + 캐시 갱신 + 허브 브로드캐스트 (누적거래량은 관측 기록에만 사용)"""
+    volume = payload.pop("volume", None)
+    _observe(kind, code, payload["price"], payload["change"], volume)
+    quote_cache.put(kind, code, payload)
+    quote_hub.publish(kind, code, {**payload, "stale": False})
+
+
+async def start_realtime_feed() -> None:
+    """KIS 실시간 WebSocket 피드 시작 (허브 종목 활성/비활성에 맞춰 업스트림 구독)"""
+    global _realtime_feed
+    if not kr.KIS_REALTIME or _realtime_feed is not None:
+        return
+    _realtime_feed = kr.KISRealtimeFeed(_on_realtime_tick)
+    quote_hub.watch(_realtime_feed.on_topic)
+    _realtime_feed.start()
+
+
+async def stop_realtime_feed() -> None:
+    """KIS 실시간 WebSocket 피드 중지"""
+    global _realtime_feed
+    if _realtime_feed is None:
+        return
+    quote_hub.unwatch(_realtime_feed.on_topic)
+    await _realtime_feed.stop()
+    _realtime_feed = None
+
+
+async def _stream(websocket: WebSocket, kind: str, code: str) -> None:
+    """허브 구독 → 스냅샷 1회 후 변경 필드만 전송 (클라이언트 "resync" 수신 시 스냅샷 재전송)"""
+    key     = (kind, code)
+    mailbox = Mailbox()
+    encoder = DeltaEncoder()
+    quote_hub.subscribe(kind, code, mailbox)
+
+    async def _reader():
+        while True:
+            if (await websocket.receive_text()).strip() == "resync":
+                encoder.reset(key)
+                quote_hub.resync(kind, code, mailbox)
+
+    async def _writer():
+        while True:
+            for payload in (await mailbox.drain()).values():
+                frame = encoder.encode(key, payload)
+                if frame is not None:
+                    await websocket.send_json(frame)
+
+    tasks = [asyncio.create_task(_reader()), asyncio.create_task(_writer())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        quote_hub.unsubscribe(kind, code, mailbox)
+
 # ─── Pydantic 모델 (Swagger 모델 스키마) ─────────────────────────────────────
 
 class Investment(BaseModel):
     """국내 종목 시세"""
     price:  int   = Field(..., description="현재가 (KRW)")
     change: int   = Field(..., description="전일 대비 (KRW)")
+    as_of:  float = Field(..., description="값을 받은 시각 (epoch 초)")
+    stale:  bool  = Field(..., description="업스트림 오류로 이전 값을 응답 중이면 true")
 
 class IndexPrice(BaseModel):
     """국내 지수 시세"""
     price:  float = Field(..., description="현재 지수 값")
     change: float = Field(..., description="전일 대비")
+    as_of:  float = Field(..., description="값을 받은 시각 (epoch 초)")
+    stale:  bool  = Field(..., description="업스트림 오류로 이전 값을 응답 중이면 true")
 
 class OverseasPrice(BaseModel):
     """해외 종목 시세"""
     price:  float = Field(..., description="현재가 (해당 통화)")
     change: float = Field(..., description="전일 대비")
+    as_of:  float = Field(..., description="값을 받은 시각 (epoch 초)")
+    stale:  bool  = Field(..., description="업스트림 오류로 이전 값을 응답 중이면 true")
 
 class OverseasIndexPrice(BaseModel):
     """해외 지수 시세"""
     price:  float = Field(..., description="현재 지수 값")
     change: float = Field(..., description="전일 대비")
 
+class BatchInvestmentItem(BaseModel):
+    """국내 종목 시세 (배치 항목)"""
+    code:   str   = Field(..., description="종목코드 (6자리)")
+    price:  int   = Field(..., description="현재가 (KRW)")
+    change: int   = Field(..., description="전일 대비 (KRW)")
+    as_of:  float = Field(..., description="값을 받은 시각 (epoch 초)")
+    stale:  bool  = Field(..., description="업스트림 오류로 이전 값을 응답 중이면 true")
+
+class BatchInvestment(BaseModel):
+    """국내 종목 배치 시세"""
+    quotes:  List[BatchInvestmentItem] = Field(..., description="요청 순서대로 정렬된 시세")
+    missing: List[str]                 = Field(..., description="조회되지 않은 종목코드")
+
+class ChartBars(BaseModel):
+    """국내 종목 기간별 봉 (컬럼 배열, 날짜 오름차순)"""
+    code:   str       = Field(..., description="종목코드 (6자리)")
+    period: str       = Field(..., description="D: 일, W: 주, M: 월, Y: 년")
+    date:   List[int] = Field(..., description="봉 날짜 (YYYYMMDD, 주·월·년봉은 구간 첫 거래일)")
+    open:   List[int] = Field(..., description="시가")
+    high:   List[int] = Field(..., description="고가")
+    low:    List[int] = Field(..., description="저가")
+    close:  List[int] = Field(..., description="종가")
+    volume: List[int] = Field(..., description="거래량")
+    amount: List[int] = Field(..., description="거래대금")
+
 # ─── REST: 종목 현재가 ────────────────────────────────────────────────────────
 
 @router.get(
@@ -86,17 +246,204 @@ async def get_investment(
 ):
     """단일 국내 종목 현재가 조회"""
     try:
-        loop = asyncio.get_running_loop()
-        df   = await loop.run_in_executor(None, kb.get_inquire_price, itm_no)
-        rec  = df_to_dicts(df)[0]
-        payload = {
-            "price":  int(rec["stck_prpr"].replace(",", "")),
-            "change": int(rec["prdy_vrss"].replace(",", "")),
-        }
-        return record_to_json(payload)
+        return record_to_json(await quote_cache.get("stock", itm_no))
+    except RateLimitExceeded as e:
+        raise HTTPException(429, f"KIS 호출 한도 초과: {e}")
     except Exception as e:
         raise HTTPException(500, f"종목 조회 실패: {e}")
 
+# ─── REST: 종목 현재가 배치 ────────────────────────────────────────────────────
+
+BATCH_MAX_CODES = 300   # 요청 1건당 최대 종목 수
+
+
+@router.get(
+    "/investments/batch",
+    response_model=BatchInvestment,
+    summary="국내 종목 현재가 배치 조회",
+    description="쉼표로 구분한 **6자리 종목코드**(최대 300개)의 현재가를 한 번에 조회합니다.\n\n"
+                "시세 저장소에 TTL 이내 값이 없는 종목만 KIS 관심종목(멀티종목) 시세 TR 로 30개씩 묶어 동시에 조회합니다.\n\n"
+                "조회에 실패한 묶음은 저장소의 이전 값을 `stale: true` 로 대신 응답합니다.",
+)
+async def get_investments_batch(
+    itm_nos: str = Query(..., description="종목코드 목록 (쉼표 구분, 예: 005930,000660)"),
+):
+    """다수 국내 종목 현재가 조회 → ceil(N/30) 회 업스트림 호출"""
+    codes = list(dict.fromkeys(c.strip() for c in itm_nos.split(",") if c.strip()))
+    if not codes or len(codes) > BATCH_MAX_CODES:
+        raise HTTPException(400, f"종목코드는 1~{BATCH_MAX_CODES}개여야 합니다.")
+    bad = [c for c in codes if not (c.isdigit() and len(c) == 6)]
+    if bad:
+        raise HTTPException(400, f"종목코드 형식 오류: {', '.join(bad[:10])}")
+
+    # TTL 이내 시세는 저장소에서 한 번에 읽음 (휴장 중에는 장 마감 이후 관측값이면 그대로 사용)
+    max_age = QUOTE_TTL_STOCK
+    if KRX.state()[0] == CLOSED:
+        max_age = max(max_age, time.time() - KRX.closed_at())
+    found  = _stored_stock_quotes(codes, max_age, stale=False)
+    misses = [c for c in codes if c not in found]
+
+    step    = kio.MULTI_PRICE_MAX
+    groups  = [misses[i:i + step] for i in range(0, len(misses), step)]
+    results = await asyncio.gather(*(kio.get_multi_stock_quotes(g) for g in groups), return_exceptions=True)
+
+    failed: List[str] = []
+    error:  Optional[BaseException] = None
+    for group, quotes in zip(groups, results):
+        if isinstance(quotes, BaseException) or quotes is None:
+            failed.extend(group)
+            error = quotes if isinstance(quotes, BaseException) else error
+            continue
+        for quote in quotes:
+            payload = quote.to_dict()
+            quote_cache.put("stock", quote.code, payload)
+            _observe("stock", quote.code, quote.price, quote.change, quote.volume)
+            found[quote.code] = {**payload, "as_of": time.time(), "stale": False}
+
+    # 실패한 묶음은 저장소의 이전 값으로 대신 응답 (stale)
+    if failed:
+        found.update(_stored_stock_quotes(failed, QUOTE_STALE_MAX, stale=True))
+        if not found:
+            if isinstance(error, RateLimitExceeded):
+                raise HTTPException(429, f"KIS 호출 한도 초과: {error}")
+            raise HTTPException(500, f"배치 조회 실패: {error or '응답 없음'}")
+
+    return record_to_json({
+        "quotes":  [{"code": c, **found[c]} for c in codes if c in found],
+        "missing": [c for c in codes if c not in found],
+    })
+
+
+def _stored_stock_quotes(codes: List[str], max_age: float, stale: bool) -> Dict[str, Dict[str, Any]]:
+    """시세 저장소 일괄 읽기 → {code: {"price", "change", "as_of", "stale"}} (max_age 이내만)"""
+    cols = quote_store.read([("stock", c) for c in codes], max_age=max_age)
+    hit  = np.flatnonzero(cols["found"])
+    return {
+        codes[j]: {"price": p, "change": d, "as_of": t, "stale": stale}
+        for j, p, d, t in zip(hit.tolist(),
+                              cols["last"][hit].astype(np.int64).tolist(),
+                              cols["change"][hit].astype(np.int64).tolist(),
+                              cols["ts"][hit].tolist())
+    }
+
+# ─── REST: 종목 기간별 차트 ────────────────────────────────────────────────────
+
+@router.get(
+    "/investments/chart",
+    response_model=ChartBars,
+    summary="국내 종목 일/주/월/년봉 조회",
+    description="로컬 일봉 저장소에서 응답하고, 저장되지 않은 날짜 구간만 KIS 기간별시세 TR 로 받아 채웁니다.\n\n"
+                "주·월·년봉은 일봉에서 서버가 직접 집계합니다.",
+)
+async def get_investment_chart(
+    itm_no: str           = Query(..., regex=r"^\d{6}$", description="종목코드 (6자리, 예: 005930)"),
+    period: str           = Query("D", regex=r"^[DWMY]$", description="D: 일, W: 주, M: 월, Y: 년"),
+    start:  Optional[str] = Query(None, regex=r"^\d{8}$", description="시작일 (YYYYMMDD, 기본: 100일 전)"),
+    end:    Optional[str] = Query(None, regex=r"^\d{8}$", description="종료일 (YYYYMMDD, 기본: 오늘)"),
+    adj:    str           = Query("0", regex=r"^[01]$", description="0: 수정주가 반영, 1: 미반영"),
+):
+    """기간별 봉 조회 (저장된 구간은 로컬 I/O 만)"""
+    try:
+        s, e = default_range(start, end)
+    except ValueError as ex:
+        raise HTTPException(400, str(ex))
+    try:
+        bars = await chart_store.chart(itm_no, period, s, e, adj)
+    except RateLimitExceeded as ex:
+        raise HTTPException(429, f"KIS 호출 한도 초과: {ex}")
+    except Exception as ex:
+        raise HTTPException(500, f"차트 조회 실패: {ex}")
+    return record_to_json({"code": itm_no, "period": period, **bars.to_dict()})
+
+
+@router.get(
+    "/investments/minute-chart",
+    summary="국내 종목 당일 분봉 조회",
+    description="정규장(09:00~15:30) 1분봉을 컬럼 배열로 반환합니다 (`time` 은 HHMM).\n\n"
+                "오늘은 아직 확정되지 않은 구간만 30분 단위로 동시에 조회하고, 장 마감 후 확정된 날은 저장본으로 응답합니다.",
+)
+async def get_investment_minute_chart(
+    itm_no: str           = Query(..., regex=r"^\d{6}$", description="종목코드 (6자리, 예: 005930)"),
+    date:   Optional[str] = Query(None, regex=r"^\d{8}$", description="날짜 (YYYYMMDD, 기본: 오늘)"),
+):
+    """당일 분봉 (확정된 날은 로컬 I/O 만)"""
+    try:
+        day = await minute_chart.day(itm_no, int(date) if date else None)
+    except RateLimitExceeded as ex:
+        raise HTTPException(429, f"KIS 호출 한도 초과: {ex}")
+    except Exception as ex:
+        raise HTTPException(500, f"분봉 조회 실패: {ex}")
+    if day is None:
+        raise HTTPException(404, "저장된 분봉이 없습니다. (KIS 는 당일 분봉만 제공)")
+    return record_to_json({"code": itm_no, "date": int(date) if date else today_kst(), **day.to_dict()})
+
+
+@router.get(
+    "/chart-store/stats",
+    summary="차트 저장소 통계",
+    description="일봉: 로컬 응답 / 백필 횟수, 업스트림 호출 수, 메모리 종목 수 · 분봉: 메모리 일수, 업스트림 호출 수 · 실시간 봉: 집계 종목 수, 틱 수를 반환합니다.",
+)
+async def get_chart_store_stats():
+    """차트 저장소 카운터 조회"""
+    return record_to_json({"daily": chart_store.stats(), "minute": minute_chart.stats(), "bars": bar_aggregator.stats()})
+
+
+@router.get(
+    "/bars",
+    summary="실시간 봉 조회 (1분/5분/15분)",
+    description="허브 폴링 · 실시간 체결로 들어온 시세를 서버에서 집계한 OHLCV 봉을 컬럼 배열로 반환합니다 (`time` 은 봉 시작 epoch 초).\n\n"
+                "추가 업스트림 호출은 없으며, 최근에 시세가 조회·구독된 종목만 집계됩니다.",
+)
+async def get_bars(
+    type:  str           = Query("stock", description="stock | index | overseas"),
+    code:  str           = Query(..., description="종목코드 (해외는 SYM|EXC, 예: AAPL|NAS)"),
+    tf:    str           = Query("1m", description="주기 (" + " | ".join(TIMEFRAMES) + ")"),
+    limit: Optional[int] = Query(None, ge=1, description="최근 N개 봉만 반환"),
+):
+    """실시간 봉 (메모리 링 버퍼)"""
+    if type == "overseas":
+        code = code.upper()
+    pattern = _MARKET_CODE_RE.get(type)
+    if pattern is None or not pattern.match(code):
+        raise HTTPException(400, f"잘못된 종목: {type} {code}")
+    if tf not in TIMEFRAMES:
+        raise HTTPException(400, f"지원하지 않는 주기: {tf}")
+
+    bars = bar_aggregator.bars(type, code, tf, limit)
+    if bars is None:
+        raise HTTPException(404, "집계 중인 종목이 아닙니다. (시세를 먼저 조회하거나 구독하세요)")
+    return record_to_json({"type": type, "code": code, "tf": tf, **bars})
+
+
+@router.get(
+    "/ticks",
+    summary="기록된 틱 조회",
+    description="시세 파이프라인이 관측해 파일로 기록한 틱을 컬럼 배열로 반환합니다 (`ts` 는 epoch 초, `volume` 은 누적거래량).\n\n"
+                "파일을 메모리 매핑해 읽으므로 업스트림 호출이 없습니다. `date` 를 생략하면 기록된 날짜 목록을 반환합니다.",
+)
+async def get_ticks(
+    type:  str           = Query("stock", description="stock | index | overseas"),
+    code:  str           = Query(..., description="종목코드 (해외는 SYM|EXC, 예: AAPL|NAS)"),
+    date:  Optional[str] = Query(None, regex=r"^\d{8}$", description="날짜 (YYYYMMDD, KST)"),
+    start: Optional[float] = Query(None, description="시작 시각 (epoch 초)"),
+    end:   Optional[float] = Query(None, description="종료 시각 (epoch 초)"),
+    limit: int           = Query(10_000, ge=1, le=100_000, description="최대 틱 수 (마지막 N개)"),
+):
+    """틱 히스토리 (memmap 구간 슬라이스)"""
+    if type == "overseas":
+        code = code.upper()
+    pattern = _MARKET_CODE_RE.get(type)
+    if pattern is None or not pattern.match(code):
+        raise HTTPException(400, f"잘못된 종목: {type} {code}")
+    if date is None:
+        return record_to_json({"type": type, "code": code, "days": tick_recorder.days(type, code)})
+
+    ticks = tick_recorder.read(type, code, int(date), start, end)[-limit:]
+    return record_to_json({
+        "type": type, "code": code, "date": int(date),
+        **{name: ticks[name].tolist() for name in ticks.dtype.names},
+    })
+
 # ─── REST: 지수 현재가 ────────────────────────────────────────────────────────
 
 @router.get(
@@ -110,14 +457,9 @@ async def get_index_price(
 ):
     """단일 국내 지수 현재가 조회"""
     try:
-        loop = asyncio.get_running_loop()
-        df   = await loop.run_in_executor(None, kb.get_inquire_index_price, idx_code)
-        rec  = df_to_dicts(df)[0]
-        payload = {
-            "price":  float(rec["bstp_nmix_prpr"].replace(",", "")),
-            "change": float(rec["bstp_nmix_prdy_vrss"].replace(",", "")),
-        }
-        return record_to_json(payload)
+        return record_to_json(await quote_cache.get("index", idx_code))
+    except RateLimitExceeded as e:
+        raise HTTPException(429, f"KIS 호출 한도 초과: {e}")
     except Exception as e:
         raise HTTPException(500, f"지수 조회 실패: {e}")
 
@@ -137,17 +479,106 @@ async def get_overseas_price(
 ):
     """단일 해외 종목 현재가 조회"""
     try:
-        loop = asyncio.get_running_loop()
-        df   = await loop.run_in_executor(None, kb.get_overseas_price_detail, symb, excd)
-        rec  = df_to_dicts(df)[0]
-        payload = {
-            "price":  float(rec.get("last",  0)),
-            "change": float(rec.get("diff",  0)),
-        }
-        return record_to_json(payload)
+        return record_to_json(await quote_cache.get("overseas", _overseas_code(symb, excd)))
+    except RateLimitExceeded as e:
+        raise HTTPException(429, f"KIS 호출 한도 초과: {e}")
     except Exception as e:
         raise HTTPException(500, f"해외 종목 조회 실패: {e}")
 
+# ─── REST: 시세 저장소 (여러 종목 일괄 읽기) ───────────────────────────────────
+
+SNAPSHOT_MAX_CODES = 5000   # 스냅샷 · 평가 요청 1건당 최대 종목 수
+
+class ValuationItem(BaseModel):
+    """평가 대상 종목"""
+    type: str   = Field("stock", description="stock | index | overseas")
+    code: str   = Field(..., description="종목코드 (해외는 SYM|EXC)")
+    qty:  float = Field(..., description="보유 수량")
+
+class ValuationRequest(BaseModel):
+    """평가 요청"""
+    items: List[ValuationItem] = Field(..., description="보유 종목 목록")
+
+
+@router.get(
+    "/quotes/snapshot",
+    summary="시세 저장소 스냅샷 (히트맵용)",
+    description="쉼표로 구분한 종목들의 마지막 관측 시세를 컬럼 배열로 반환합니다 (`ts` 는 관측 시각 epoch 초).\n\n"
+                "업스트림을 호출하지 않으며, 한 번도 관측되지 않은 종목은 `missing` 에 담깁니다.",
+)
+async def get_quotes_snapshot(
+    type:  str = Query("stock", description="stock | index | overseas"),
+    codes: str = Query(..., description="종목코드 목록 (쉼표 구분)"),
+):
+    """다수 종목 시세 일괄 읽기 (메모리 컬럼 인덱싱)"""
+    try:
+        keys = _parse_market_items([{"type": type, "code": c.strip()} for c in codes.split(",") if c.strip()])
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if not keys or len(keys) > SNAPSHOT_MAX_CODES:
+        raise HTTPException(400, f"종목코드는 1~{SNAPSHOT_MAX_CODES}개여야 합니다.")
+
+    cols  = quote_store.read(keys)
+    hit   = np.flatnonzero(cols["found"])
+    price = cols["last"][hit]
+    chg   = cols["change"][hit]
+    if type == "stock":
+        price, chg = price.astype(np.int64), chg.astype(np.int64)
+    return record_to_json({
+        "code":    [keys[j][1] for j in hit.tolist()],
+        "price":   price.tolist(),
+        "change":  chg.tolist(),
+        "volume":  cols["volume"][hit].tolist(),
+        "ts":      cols["ts"][hit].tolist(),
+        "missing": [keys[j][1] for j in np.flatnonzero(~cols["found"]).tolist()],
+    })
+
+
+@router.post(
+    "/quotes/valuation",
+    summary="보유 종목 평가금액",
+    description="보유 수량 × 마지막 관측 시세로 종목별 평가금액, 합계, 전일 대비 손익을 계산합니다.\n\n"
+                "업스트림을 호출하지 않으며, 시세가 없는 종목은 `missing` 에 담기고 합계에서 빠집니다. (통화 환산 없음)",
+)
+async def post_quotes_valuation(req: ValuationRequest):
+    """포트폴리오 평가 (메모리 컬럼 연산)"""
+    try:
+        keys = _parse_market_items([{"type": it.type, "code": it.code} for it in req.items])
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if not keys or len(keys) > SNAPSHOT_MAX_CODES:
+        raise HTTPException(400, f"종목은 1~{SNAPSHOT_MAX_CODES}개여야 합니다.")
+
+    res = quote_store.valuate(keys, [it.qty for it in req.items])
+    return record_to_json({
+        "value":   res["value"],
+        "change":  res["change"],
+        "items":   [{"type": k[0], "code": k[1], "value": v} for k, v in zip(keys, res["items"])],
+        "missing": [{"type": k[0], "code": k[1]} for k in res["missing"]],
+    })
+
+# ─── REST: 시세 캐시 통계 ─────────────────────────────────────────────────────
+
+@router.get(
+    "/quote-cache/stats",
+    summary="시세 캐시 통계",
+    description="종류별 **hit / miss / coalesced / errors** 카운터와 TTL, 현재 항목 수, 컬럼형 시세 저장소(종목 수 · 기록/조회 수)를 반환합니다.",
+)
+async def get_quote_cache_stats():
+    """TTL 튜닝용 캐시 카운터 조회"""
+    return record_to_json({**quote_cache.stats(), "store": quote_store.stats()})
+
+# ─── REST: KIS 호출 한도 상태 ──────────────────────────────────────────────────
+
+@router.get(
+    "/kis/rate-limit",
+    summary="KIS TR 호출 한도 상태",
+    description="앱키 풀의 앱키별 **최근 1초 사용량**, 잔여 토큰, 우선순위 클래스별 대기/허가/거절 수, 제외(EGW00201) 상태를 반환합니다.",
+)
+async def get_kis_rate_limit():
+    """KIS 앱키 풀 · 속도 제한기 예산 사용량 조회"""
+    return record_to_json(default_pool().stats())
+
 # ---- (WebSocket 엔드포인트들은 Swagger UI 에 직접 노출되지는 않으므로 주석만 자세히 달아둡니다.)
 #      필요 시 FastAPI "description" 매개변수를 사용하여 문서화할 수 있습니다.
 
@@ -156,7 +587,7 @@ async def get_overseas_price(
 # ---------------------------------------------------------------------------
 @router.websocket("/ws/investments")
 async def ws_investment(websocket: WebSocket):
-    """클라이언트 → 종목코드(6자리) 전송 ↔ 서버 → 0.5초 간격 실시간 시세 JSON"""
+    """클라이언트 → 종목코드(6자리) 전송 ↔ 서버 → 스냅샷 후 변경 필드만 (seq 포함)"""
     await websocket.accept()
     try:
         itm = await websocket.receive_text()
@@ -164,15 +595,7 @@ async def ws_investment(websocket: WebSocket):
             await websocket.close(code=1008, reason="종목코드 형식 오류")
             return
 
-        loop = asyncio.get_running_loop()
-        while True:
-            df  = await loop.run_in_executor(None, kb.get_inquire_price, itm)
-            rec = df_to_dicts(df)[0]
-            await websocket.send_json({
-                "price":  int(rec["stck_prpr"].replace(",", "")),
-                "change": int(rec["prdy_vrss"].replace(",", "")),
-            })
-            await asyncio.sleep(0.5)
+        await _stream(websocket, "stock", itm)
     except WebSocketDisconnect:
         pass
     except Exception:
@@ -183,7 +606,7 @@ async def ws_investment(websocket: WebSocket):
 # ---------------------------------------------------------------------------
 @router.websocket("/ws/index")
 async def ws_index(websocket: WebSocket):
-    """클라이언트 → 지수코드(4자리) 전송 ↔ 서버 → 0.5초 간격 실시간 지수 JSON"""
+    """클라이언트 → 지수코드(4자리) 전송 ↔ 서버 → 스냅샷 후 변경 필드만 (seq 포함)"""
     await websocket.accept()
     try:
         idx = await websocket.receive_text()
@@ -191,15 +614,7 @@ async def ws_index(websocket: WebSocket):
             await websocket.close(code=1008, reason="지수코드 형식 오류")
             return
 
-        loop = asyncio.get_running_loop()
-        while True:
-            df  = await loop.run_in_executor(None, kb.get_inquire_index_price, idx)
-            rec = df_to_dicts(df)[0]
-            await websocket.send_json({
-                "price":  float(rec["bstp_nmix_prpr"].replace(",", "")),
-                "change": float(rec["bstp_nmix_prdy_vrss"].replace(",", "")),
-            })
-            await asyncio.sleep(0.5)
+        await _stream(websocket, "index", idx)
     except WebSocketDisconnect:
         pass
     except Exception:
@@ -210,13 +625,12 @@ async def ws_index(websocket: WebSocket):
 # ---------------------------------------------------------------------------
 @router.websocket("/ws/overseas")
 async def ws_overseas(websocket: WebSocket):
-    """클라이언트 → "SYM|EXC" 형식 전송 ↔ 서버 → 1초 간격 실시간 시세 JSON"""
+    """클라이언트 → "SYM|EXC" 형식 전송 ↔ 서버 → 스냅샷 후 변경 필드만 (seq 포함)"""
     await websocket.accept()
     try:
         raw = await websocket.receive_text()
         if "|" in raw:
             symb, excd = raw.split("|", 1)
-            excd = excd.upper()
         else:
             symb, excd = raw, "NAS"
 
@@ -224,18 +638,182 @@ async def ws_overseas(websocket: WebSocket):
             await websocket.close(code=1008, reason="티커 형식 오류")
             return
 
-        loop = asyncio.get_running_loop()
+        await _stream(websocket, "overseas", _overseas_code(symb, excd))
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        await websocket.close(code=1011, reason="서버 오류")
+
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# WebSocket: 멀티 종목 시세 스트림 (국내 종목 · 국내 지수 · 해외 종목 혼합)
+# ---------------------------------------------------------------------------
+MARKET_MAX_SUBS   = 100     # 소켓 1개당 최대 구독 수
+MARKET_BATCH_SECS = 0.25    # 배치 전송 간격 (초)
+
+# 종류별 코드 형식 (해외는 "SYM|EXC")
+_MARKET_CODE_RE = {
+    "stock":    re.compile(r"^\d{6}$"),
+    "index":    re.compile(r"^\d{4}$"),
+    "overseas": re.compile(r"^[A-Za-z.\-]{1,10}\|[A-Z]{3}$"),
+}
+
+
+def _parse_market_items(items: Any) -> List[Tuple[str, str]]:
+    """[{"type", "code"}, ...] → [(kind, code), ...] (형식 오류 시 ValueError)"""
+    if not isinstance(items, list):
+        raise ValueError("items 는 배열이어야 합니다.")
+
+    keys = []
+    for item in items:
+        kind = item.get("type") if isinstance(item, dict) else None
+        code = item.get("code") if isinstance(item, dict) else None
+        if kind == "overseas" and isinstance(code, str):
+            symb, _, excd = code.partition("|")
+            code = _overseas_code(symb, excd or "NAS")
+        pattern = _MARKET_CODE_RE.get(kind)
+        if pattern is None or not isinstance(code, str) or not pattern.match(code):
+            raise ValueError(f"잘못된 종목: {item}")
+        keys.append((kind, code))
+    return keys
+
+
+@router.websocket("/ws/replay")
+async def ws_replay(websocket: WebSocket):
+    """기록된 하루를 배속 재생 (KIS 호출 없음 · 스트리밍 엔드포인트 부하 테스트용)
+
+    클라이언트 → 서버 (JSON 텍스트 1회)
+        {"type": "stock", "code": "005930", "date": "20261017", "speed": 10, "start": 1792198800}
+        (speed 1~100, 기본 1 · start 는 선택, epoch 초)
+
+    서버 → 클라이언트
+        실시간 스트림과 같은 형식 — 스냅샷 후 변경 필드만 (seq 포함), 값에 기록 시각 ts 추가
+        재생이 끝나면 1000 으로 종료
+    """
+    await websocket.accept()
+    try:
+        msg   = json.loads(await websocket.receive_text())
+        kind  = msg.get("type", "stock")
+        code  = msg.get("code")
+        date  = str(msg.get("date", ""))
+        speed = float(msg.get("speed", 1))
+        start = msg.get("start")
+        pattern = _MARKET_CODE_RE.get(kind)
+        if pattern is None or not isinstance(code, str) or not pattern.match(code) \
+                or not (date.isdigit() and len(date) == 8):
+            await websocket.close(code=1008, reason="요청 형식 오류")
+            return
+
+        key     = (kind, code)
+        encoder = DeltaEncoder()
+        cast    = int if kind == "stock" else float      # 실시간 스트림과 같은 타입으로
+        async for tick in tick_recorder.replay(kind, code, int(date), speed, start):
+            payload = {"price": cast(tick["price"]), "change": cast(tick["change"]), "ts": tick["ts"]}
+            frame   = encoder.encode(key, payload)
+            if frame is not None:
+                await websocket.send_json(frame)
+        await websocket.close(code=1000, reason="재생 완료")
+    except WebSocketDisconnect:
+        pass
+    except (ValueError, TypeError):
+        await websocket.close(code=1008, reason="요청 형식 오류")
+    except Exception:
+        await websocket.close(code=1011, reason="서버 오류")
+
+
+@router.websocket("/ws/market")
+async def ws_market(websocket: WebSocket):
+    """한 소켓에서 여러 종목을 구독/해제 ↔ 서버 → 종목 태그가 붙은 배치 프레임
+
+    클라이언트 → 서버 (JSON 텍스트)
+        {"action": "subscribe",   "items": [{"type": "stock",    "code": "005930"},
+                                            {"type": "index",    "code": "0001"},
+                                            {"type": "overseas", "code": "AAPL|NAS"}]}
+        {"action": "unsubscribe", "items": [...]}
+        {"action": "resync",      "items": [...]}     # seq 누락 감지 시 스냅샷 재요청
+
+    서버 → 클라이언트
+        {"type": "ack",    "action": "...", "subscriptions": [{"type", "code"}, ...]}
+        {"type": "quotes", "data": [{"type", "code", "seq", "snapshot": true, "price", "change", "stale": false},
+                                    {"type", "code", "seq", "price"}, ...]}   # 이후는 변경 필드만
+        (업스트림 오류 중에는 {"stale": true, "as_of": <값을 받은 epoch 초>} 로 마지막 값 유지 → 복구되면 "stale": false)
+        {"type": "error",  "message": "..."}
+    """
+    await websocket.accept()
+    mailbox = Mailbox()
+    encoder = DeltaEncoder()
+    subs: Set[Tuple[str, str]] = set()
+
+    async def _reader():
         while True:
-            df  = await loop.run_in_executor(None, kb.get_overseas_price_detail, symb, excd)
-            rec = df_to_dicts(df)[0]
+            try:
+                msg = json.loads(await websocket.receive_text())
+                if not isinstance(msg, dict):
+                    raise ValueError(f"잘못된 메시지: {msg}")
+                action = msg.get("action")
+                keys   = _parse_market_items(msg.get("items"))
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "message": str(e) or "JSON 형식 오류"})
+                continue
+
+            if action == "subscribe":
+                new = [k for k in dict.fromkeys(keys) if k not in subs]
+                if len(subs) + len(new) > MARKET_MAX_SUBS:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": f"구독 한도 초과 (최대 {MARKET_MAX_SUBS}개)",
+                    })
+                    continue
+                for kind, code in new:
+                    quote_hub.subscribe(kind, code, mailbox)
+                    subs.add((kind, code))
+            elif action == "unsubscribe":
+                for kind, code in keys:
+                    if (kind, code) in subs:
+                        quote_hub.unsubscribe(kind, code, mailbox)
+                        subs.discard((kind, code))
+                        encoder.forget((kind, code))
+            elif action == "resync":
+                for kind, code in keys:
+                    if (kind, code) in subs:
+                        encoder.reset((kind, code))
+                        quote_hub.resync(kind, code, mailbox)
+                continue
+            else:
+                await websocket.send_json({"type": "error", "message": f"알 수 없는 action: {action}"})
+                continue
+
             await websocket.send_json({
-                "price":  float(rec.get("last", 0)),
-                "change": float(rec.get("diff", 0)),
+                "type": "ack",
+                "action": action,
+                "subscriptions": [{"type": k, "code": c} for k, c in sorted(subs)],
             })
-            await asyncio.sleep(1.0)
+
+    async def _writer():
+        while True:
+            data = []
+            for (kind, code), payload in (await mailbox.drain()).items():
+                if (kind, code) not in subs:
+                    continue
+                frame = encoder.encode((kind, code), payload)
+                if frame is not None:
+                    data.append({"type": kind, "code": code, **frame})
+            if data:
+                await websocket.send_json({"type": "quotes", "data": data})
+            await asyncio.sleep(MARKET_BATCH_SECS)
+
+    tasks = [asyncio.create_task(_reader()), asyncio.create_task(_writer())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
     except WebSocketDisconnect:
         pass
     except Exception:
         await websocket.close(code=1011, reason="서버 오류")
-
-
+    finally:
+        for task in tasks:
+            task.cancel()
+        for kind, code in subs:
+            quote_hub.unsubscribe(kind, code, mailbox)
@@ -18,6 +18,7 @@ import pandas as pd
 
 # 내부 모듈
 from .. import kis_auth as kis
+from ..kis_paging import CTX_100, CTX_200, KIS_MAX_PAGES, collect, iter_pages
 
 ##############################################################################################
 
@@ -151,12 +152,12 @@ def get_order_rvsecncl(ord_orgno="", orgn_odno="", ord_dvsn="", rvse_cncl_dvsn_c
 
 # [국내주식] 주문/계좌 > 주식정정취소가능주문조회 [v1_국내주식-004]
 # 기능: 정정/취소 가능 주문 리스트 조회 후 DataFrame 반환 (페이징 처리 포함)
-def get_inquire_psbl_rvsecncl_lst(tr_cont="", FK100="", NK100="", dataframe=None):
+async def get_inquire_psbl_rvsecncl_lst(tr_cont="", FK100="", NK100="", max_pages=KIS_MAX_PAGES):
     # 입력:
     #   tr_cont    str             조회 구분 (첫 호출 공란, 이후 "N")
     #   FK100      str             CTX_AREA_FK100 (이전 조회 키)
     #   NK100      str             CTX_AREA_NK100 (이전 조회 키)
-    #   dataframe  pd.DataFrame | None  누적된 DataFrame (첫 호출 None)
+    #   max_pages  int             최대 페이지 수 (기본 KIS_MAX_PAGES)
     # 반환:
     #   pd.DataFrame   조회된 주문 리스트
     url   = '/uapi/domestic-stock/v1/trading/inquire-psbl-rvsecncl'
@@ -171,21 +172,8 @@ def get_inquire_psbl_rvsecncl_lst(tr_cont="", FK100="", NK100="", dataframe=None
         "CTX_AREA_NK100":   NK100                       # 페이징 키 NK100
     }
 
-    res = kis._url_fetch(url, tr_id, tr_cont, params)
-
-    current_data = pd.DataFrame(res.getBody().output)
-    dataframe = pd.concat([dataframe, current_data], ignore_index=True) if dataframe is not None else current_data
-
-    tr_cont, FK100, NK100 = (
-        res.getHeader().tr_cont,
-        res.getBody().ctx_area_fk100,
-        res.getBody().ctx_area_nk100
-    )
-
-    if tr_cont in ("D", "E"):   # 마지막 페이지
-        return pd.DataFrame(dataframe)
-    if tr_cont in ("F", "M"):   # 추가 페이지 존재
-        return get_inquire_psbl_rvsecncl_lst("N", FK100, NK100, dataframe)
+    # tr_cont F/M 연속조회는 kis_paging 반복자가 처리 (재귀 · 페이지별 pd.concat 없음)
+    return await collect(iter_pages(url, tr_id, params, "output", CTX_100, tr_cont, max_pages))
 
 ###############################################################################################
 
@@ -232,7 +220,7 @@ def get_inquire_daily_ccld_obj(dv="01", inqr_strt_dt=None, inqr_end_dt=None, tr_
 ##############################################################################################
 
 # 주식일별주문체결조회 종목별 List를 DataFrame 으로 반환
-def get_inquire_daily_ccld_lst(dv="01", inqr_strt_dt="", inqr_end_dt="", tr_cont="", FK100="", NK100="", dataframe=None):  # 국내주식주문 > 주식일별주문체결조회
+async def get_inquire_daily_ccld_lst(dv="01", inqr_strt_dt="", inqr_end_dt="", tr_cont="", FK100="", NK100="", max_pages=KIS_MAX_PAGES):  # 국내주식주문 > 주식일별주문체결조회
     # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
     #        dv 기간구분 - 01:3개월 이내(TTTC8001R),  02:3개월 이전(CTSC9115R)
     # Output: DataFrame (Option) output1 API 문서 참조 등
@@ -264,26 +252,8 @@ def get_inquire_daily_ccld_lst(dv="01", inqr_strt_dt="", inqr_end_dt="", tr_cont
         "CTX_AREA_FK100": FK100, # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_FK100 값 : 다음페이지 조회시(2번째부터)
         "CTX_AREA_NK100": NK100  # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK100 값 : 다음페이지 조회시(2번째부터)
     }
-    res = kis._url_fetch(url, tr_id, tr_cont, params) # API 호출, kis_auth.py에 존재
-
-    # Assuming 'output1' is a dictionary that you want to convert to a DataFrame
-    current_data = pd.DataFrame(res.getBody().output1)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100 # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    # print(dv, tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E": # 마지막 페이지
-        print("The End")
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M": # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        return get_inquire_daily_ccld_lst(dv, inqr_strt_dt, inqr_end_dt, "N", FK100, NK100, dataframe)
+    # tr_cont F/M 연속조회는 kis_paging 반복자가 처리 (재귀 · 페이지별 pd.concat 없음)
+    return await collect(iter_pages(url, tr_id, params, "output1", CTX_100, tr_cont, max_pages))
 
 ##############################################################################################
 
@@ -321,12 +291,12 @@ def get_inquire_balance_obj(tr_cont="", FK100="", NK100="", dataframe=None):
 
 # [국내주식] 주문/계좌 > 주식잔고조회(현재종목별 잔고) [v1_국내주식-006]
 # 기능: 종목별 잔고 리스트 조회 후 DataFrame 반환 (페이징 처리)
-def get_inquire_balance_lst(tr_cont="", FK100="", NK100="", dataframe=None):
+async def get_inquire_balance_lst(tr_cont="", FK100="", NK100="", max_pages=KIS_MAX_PAGES):
     # 입력:
     #   tr_cont    str               조회 구분 (첫 호출 공란, 이후 "N")
     #   FK100      str               페이징 키 FK100
     #   NK100      str               페이징 키 NK100
-    #   dataframe  pd.DataFrame|None  누적 DataFrame
+    #   max_pages  int               최대 페이지 수 (기본 KIS_MAX_PAGES)
     # 반환:
     #   pd.DataFrame  종목별 잔고 정보
     url   = '/uapi/domestic-stock/v1/trading/inquire-balance'
@@ -346,24 +316,8 @@ def get_inquire_balance_lst(tr_cont="", FK100="", NK100="", dataframe=None):
         "CTX_AREA_NK100":        NK100
     }
 
-    res = kis._url_fetch(url, tr_id, tr_cont, params)
-    current_data = pd.DataFrame(res.getBody().output1)
-
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = (
-        res.getHeader().tr_cont,
-        res.getBody().ctx_area_fk100,
-        res.getBody().ctx_area_nk100
-    )
-
-    if tr_cont in ("D", "E"):
-        return dataframe
-    if tr_cont in ("F", "M"):
-        return get_inquire_balance_lst("N", FK100, NK100, dataframe)
+    # tr_cont F/M 연속조회는 kis_paging 반복자가 처리 (재귀 · 페이지별 pd.concat 없음)
+    return await collect(iter_pages(url, tr_id, params, "output1", CTX_100, tr_cont, max_pages))
 
 ##############################################################################################
 
@@ -562,14 +516,14 @@ def get_order_resv_rvse(
 
 # [국내주식] 주문/계좌 > 주식예약주문조회 [v1_국내주식-020]
 # 기능: 예약주문 조회 리스트 반환 (페이징 처리 포함)
-def get_order_resv_ccnl(
+async def get_order_resv_ccnl(
     inqr_strt_dt=None,
     inqr_end_dt=None,
     ord_seq=0,
     tr_cont="",
     FK100="",
     NK100="",
-    dataframe=None
+    max_pages=KIS_MAX_PAGES
 ):
     # 입력:
     #   inqr_strt_dt  str               조회 시작 일자 ("YYYYMMDD"), 미입력 시 오늘
@@ -577,7 +531,7 @@ def get_order_resv_ccnl(
     #   ord_seq       int               예약주문순번 (0: 전체)
     #   tr_cont       str               조회 구분 (첫 호출 공란, 이후 "N")
     #   FK100, NK100  str               페이징 키
-    #   dataframe     pd.DataFrame|None  누적 DataFrame
+    #   max_pages     int               최대 페이지 수 (기본 KIS_MAX_PAGES)
     # 반환:
     #   pd.DataFrame  예약주문 내역 리스트
     url   = '/uapi/domestic-stock/v1/trading/order-resv-ccnl'
@@ -601,28 +555,8 @@ def get_order_resv_ccnl(
         "CTX_AREA_NK200":     NK100
     }
 
-    res = kis._url_fetch(url, tr_id, tr_cont, params)
-    current_data = pd.DataFrame(res.getBody().output)
-    dataframe = pd.concat([dataframe, current_data], ignore_index=True) if dataframe is not None else current_data
-
-    tr_cont, FK100, NK100 = (
-        res.getHeader().tr_cont,
-        res.getBody().ctx_area_fk200,
-        res.getBody().ctx_area_nk200
-    )
-
-    if tr_cont in ("D", "E"):
-        return dataframe
-    if tr_cont in ("F", "M"):
-        return get_order_resv_ccnl(
-            inqr_strt_dt,
-            inqr_end_dt,
-            ord_seq,
-            "N",
-            FK100,
-            NK100,
-            dataframe
-        )
+    # tr_cont F/M 연속조회는 kis_paging 반복자가 처리 (재귀 · 페이지별 pd.concat 없음)
+    return await collect(iter_pages(url, tr_id, params, "output", CTX_200, tr_cont, max_pages))
 
 ##############################################################################################
 
@@ -659,7 +593,7 @@ def get_inquire_balance_rlz_pl_obj(tr_cont="", FK100="", NK100="", dataframe=Non
 
 # [국내주식] 주문/계좌 > 주식잔고조회_실현손익 (보유주식내역 Output1)
 # 기능: 보유 주식별 실현 손익 리스트 조회 후 DataFrame 반환 (페이징 처리)
-def get_inquire_balance_rlz_pl_lst(tr_cont="", FK100="", NK100="", dataframe=None):
+async def get_inquire_balance_rlz_pl_lst(tr_cont="", FK100="", NK100="", max_pages=KIS_MAX_PAGES):
     # 입력:
     #   tr_cont    str               조회 구분 (첫 호출 공란, 이후 "N")
     #   FK100      str               페이징 키 FK100
@@ -684,20 +618,8 @@ def get_inquire_balance_rlz_pl_lst(tr_cont="", FK100="", NK100="", dataframe=Non
         "CTX_AREA_NK100":        NK100
     }
 
-    res = kis._url_fetch(url, tr_id, tr_cont, params)
-    current_data = pd.DataFrame(res.getBody().output1)
-    dataframe = pd.concat([dataframe, current_data], ignore_index=True) if dataframe is not None else current_data
-
-    tr_cont, FK100, NK100 = (
-        res.getHeader().tr_cont,
-        res.getBody().ctx_area_fk100,
-        res.getBody().ctx_area_nk100
-    )
-
-    if tr_cont in ("D", "E"):
-        return dataframe
-    return get_inquire_balance_rlz_pl_lst("N", FK100, NK100, dataframe)
-
+    # tr_cont F/M 연속조회는 kis_paging 반복자가 처리 (재귀 · 페이지별 pd.concat 없음)
+    return await collect(iter_pages(url, tr_id, params, "output1", CTX_100, tr_cont, max_pages))
 
 ##############################################################################################
 
@@ -769,13 +691,13 @@ def get_inquire_period_trade_profit_obj(inqr_strt_dt=None, inqr_end_dt=None, tr_
 # [국내주식] 주문/계좌 > 기간별매매손익현황조회 [v1_국내주식-8715R]
 # 기능: 기간별 매매 손익 현황 단건 및 리스트 조회
 #   get_inquire_period_trade_profit_lst: 종목별 정보(Output1) 리스트 조회 (페이징 처리)
-def get_inquire_period_trade_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="", FK100="", NK100="", dataframe=None):
+async def get_inquire_period_trade_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="", FK100="", NK100="", max_pages=KIS_MAX_PAGES):
     # 입력:
     #   inqr_strt_dt  str   조회 시작 일자 ("YYYYMMDD"), None이면 오늘
     #   inqr_end_dt   str   조회 종료 일자 ("YYYYMMDD"), None이면 오늘
     #   tr_cont       str   조회 구분 (첫 호출 공란, 이후 "N")
     #   FK100, NK100  str   페이징 키
-    #   dataframe     DataFrame|None  누적 DataFrame (lst 전용)
+    #   max_pages     int   최대 페이지 수 (기본 KIS_MAX_PAGES)
     # 반환:
     #   DataFrame    조회 결과
     url   = '/uapi/domestic-stock/v1/trading/inquire-period-trade-profit'
@@ -796,19 +718,8 @@ def get_inquire_period_trade_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_
         "CTX_AREA_NK100":   NK100
     }
 
-    res = kis._url_fetch(url, tr_id, tr_cont, params)
-    current_data = pd.DataFrame(res.getBody().output1)
-    dataframe = pd.concat([dataframe, current_data], ignore_index=True) if dataframe is not None else current_data
-
-    tr_cont, FK100, NK100 = (
-        res.getHeader().tr_cont,
-        res.getBody().ctx_area_fk100,
-        res.getBody().ctx_area_nk100
-    )
-
-    if tr_cont in ("D", "E"):
-        return dataframe
-    return get_inquire_period_trade_profit_lst(inqr_strt_dt, inqr_end_dt, "N", FK100, NK100, dataframe)
+    # tr_cont F/M 연속조회는 kis_paging 반복자가 처리 (재귀 · 페이지별 pd.concat 없음)
+    return await collect(iter_pages(url, tr_id, params, "output1", CTX_100, tr_cont, max_pages))
 
 ##############################################################################################
 
@@ -851,13 +762,13 @@ def get_inquire_period_profit_obj(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="
 
 # [국내주식] 주문/계좌 > 기간별손익일별합산조회 (output1) [v1_국내주식-8708R]
 # 기능: 기간별 손익 일별 합산 정보 리스트 조회 후 DataFrame 반환 (페이징 처리)
-def get_inquire_period_profit_lst(
+async def get_inquire_period_profit_lst(
     inqr_strt_dt=None,
     inqr_end_dt=None,
     tr_cont="",
     FK100="",
     NK100="",
-    dataframe=None
+    max_pages=KIS_MAX_PAGES
 ):
     # 입력:
     #   inqr_strt_dt  str               조회 시작 일자 ("YYYYMMDD"), None이면 오늘
@@ -865,7 +776,7 @@ def get_inquire_period_profit_lst(
     #   tr_cont       str               조회 구분 (첫 호출 공란, 이후 "N")
     #   FK100         str               페이징 키 FK100
     #   NK100         str               페이징 키 NK100
-    #   dataframe     pd.DataFrame|None  누적 DataFrame
+    #   max_pages     int               최대 페이지 수 (기본 KIS_MAX_PAGES)
     # 반환:
     #   pd.DataFrame  기간별 손익 일별 합산 정보 리스트
     url   = '/uapi/domestic-stock/v1/trading/inquire-period-profit'
@@ -887,20 +798,8 @@ def get_inquire_period_profit_lst(
         "CTX_AREA_NK100":   NK100
     }
 
-    res = kis._url_fetch(url, tr_id, tr_cont, params)
-    current_data = pd.DataFrame(res.getBody().output1)
-    dataframe = pd.concat([dataframe, current_data], ignore_index=True) if dataframe is not None else current_data
-
-    tr_cont, FK100, NK100 = (
-        res.getHeader().tr_cont,
-        res.getBody().ctx_area_fk100,
-        res.getBody().ctx_area_nk100
-    )
-
-    if tr_cont in ("D", "E"):
-        return dataframe
-    return get_inquire_period_profit_lst(inqr_strt_dt, inqr_end_dt, "N", FK100, NK100, dataframe)
-
+    # tr_cont F/M 연속조회는 kis_paging 반복자가 처리 (재귀 · 페이지별 pd.concat 없음)
+    return await collect(iter_pages(url, tr_id, params, "output1", CTX_100, tr_cont, max_pages))
 
 #######################################################################################
 
@@ -0,0 +1,274 @@
+# kis_async.py
+"""
+한국투자증권 Open API 비동기 클라이언트
+────────────────────────────────────────────
+- 프로세스 공용 httpx.AsyncClient (keep-alive 커넥션 풀, 선택적 HTTP/2)
+- kis_auth._url_fetch 의 비동기 버전 `url_fetch` (앱키 풀 kis_client 경유)
+- 시세 조회 함수의 awaitable 버전 (executor 스레드 미사용)
+- 시세 레코드 조회 (get_*_quote): DataFrame 없이 __slots__ 레코드 반환
+"""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pandas as pd
+from starlette.config import Config
+
+from . import kis_client
+from .kis_domstk import _output, _output_frame, _output_quote, _overseas_index_result
+from .kis_quote import IndexQuote, OverseasQuote, StockQuote
+
+config = Config(".env")
+
+# 관심종목(멀티종목) 시세 TR 1회당 최대 종목 수
+MULTI_PRICE_MAX = 30
+
+# 커넥션 풀 설정 (.env 로 조정 가능)
+KIS_HTTP2           = config("KIS_HTTP2", default="false").lower() == "true"
+KIS_MAX_CONNECTIONS = config("KIS_MAX_CONNECTIONS", cast=int, default=20)
+KIS_MAX_KEEPALIVE   = config("KIS_MAX_KEEPALIVE", cast=int, default=10)
+KIS_KEEPALIVE_SECS  = config("KIS_KEEPALIVE_SECS", cast=float, default=30.0)
+KIS_TIMEOUT_SECS    = config("KIS_TIMEOUT_SECS", cast=float, default=5.0)
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  (httpx[http2] 선택 의존성)
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에 묶인 공용 AsyncClient 반환 (없으면 생성)"""
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2   = KIS_HTTP2 and _http2_available(),
+            timeout = KIS_TIMEOUT_SECS,
+            limits  = httpx.Limits(
+                max_connections           = KIS_MAX_CONNECTIONS,
+                max_keepalive_connections = KIS_MAX_KEEPALIVE,
+                keepalive_expiry          = KIS_KEEPALIVE_SECS,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def aclose() -> None:
+    """공용 AsyncClient 종료 (앱 종료 시 호출)"""
+    global _client, _client_loop
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client, _client_loop = None, None
+
+
+########### API call wrapping : 비동기 API 호출 공통
+
+async def url_fetch(api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, priority=None, sticky=None):
+    # 시세·차트 TR 은 앱키 풀에서 가장 한가한 키로, 주문·계좌 TR 은 기본 앱키로 (kis_client.KISClientPool)
+    # 연속조회처럼 같은 앱키가 이어받아야 하는 호출은 sticky 키 지정
+    return await kis_client.default_pool().fetch(
+        api_url, ptr_id, tr_cont, params, appendHeaders, postFlag, priority=priority, sticky=sticky
+    )
+
+
+# — 국내 주식 현재가 조회 —
+async def get_inquire_price(
+    itm_no: str,
+    div_code: str = "J",
+    tr_cont: str = "",
+) -> pd.DataFrame | None:
+    if not itm_no:
+        print("⚠️ itm_no is 필요합니다.")
+        return None
+
+    res = await url_fetch(
+        "/uapi/domestic-stock/v1/quotations/inquire-price",
+        "FHKST01010100",
+        tr_cont,
+        {
+            "FID_COND_MRKT_DIV_CODE": div_code,
+            "FID_INPUT_ISCD": itm_no,
+        },
+    )
+    return _output_frame(res)
+
+
+# — 국내 지수 현재가 조회 —
+async def get_inquire_index_price(
+    idx_code: str = "0001",
+    div_code: str = "U",
+    tr_cont: str = "",
+) -> pd.DataFrame | None:
+    res = await url_fetch(
+        "/uapi/domestic-stock/v1/quotations/inquire-index-price",
+        "FHPUP02100000",
+        tr_cont,
+        {
+            "FID_COND_MRKT_DIV_CODE": div_code,
+            "FID_INPUT_ISCD": idx_code,
+        },
+    )
+    return _output_frame(res)
+
+
+# — 해외 주식 상세가 조회 —
+async def get_overseas_price_detail(
+    symb: str,
+    excd: str = "NAS",
+    auth: str = "",
+    tr_cont: str = "",
+) -> pd.DataFrame | None:
+    if not symb:
+        print("⚠️ symb is 필요합니다.")
+        return None
+
+    res = await url_fetch(
+        "/uapi/overseas-price/v1/quotations/price-detail",
+        "HHDFS00000300",
+        tr_cont,
+        {
+            "AUTH": auth,
+            "EXCD": excd.upper(),
+            "SYMB": symb.upper(),
+        },
+    )
+    return _output_frame(res)
+
+
+# — 시세 레코드 조회 (REST · WebSocket 핸들러용, DataFrame 미생성) —
+async def get_stock_quote(itm_no: str, div_code: str = "J") -> StockQuote | None:
+    res = await url_fetch(
+        "/uapi/domestic-stock/v1/quotations/inquire-price",
+        "FHKST01010100",
+        "",
+        {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no},
+    )
+    return _output_quote(res, StockQuote, itm_no)
+
+
+async def get_index_quote(idx_code: str = "0001", div_code: str = "U") -> IndexQuote | None:
+    res = await url_fetch(
+        "/uapi/domestic-stock/v1/quotations/inquire-index-price",
+        "FHPUP02100000",
+        "",
+        {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": idx_code},
+    )
+    return _output_quote(res, IndexQuote, idx_code)
+
+
+async def get_overseas_quote(symb: str, excd: str = "NAS") -> OverseasQuote | None:
+    res = await url_fetch(
+        "/uapi/overseas-price/v1/quotations/price-detail",
+        "HHDFS00000300",
+        "",
+        {"AUTH": "", "EXCD": excd.upper(), "SYMB": symb.upper()},
+    )
+    return _output_quote(res, OverseasQuote, f"{symb}|{excd}")
+
+
+# — 관심종목(멀티종목) 시세 조회: 최대 30종목 1회 호출 —
+async def get_multi_stock_quotes(itm_nos: list[str], div_code: str = "J") -> list[StockQuote] | None:
+    if not itm_nos or len(itm_nos) > MULTI_PRICE_MAX:
+        print(f"⚠️ itm_nos 는 1~{MULTI_PRICE_MAX}개여야 합니다.")
+        return None
+
+    params = {}
+    for i, itm_no in enumerate(itm_nos, start=1):
+        params[f"FID_COND_MRKT_DIV_CODE_{i}"] = div_code
+        params[f"FID_INPUT_ISCD_{i}"] = itm_no
+
+    res = await url_fetch(
+        "/uapi/domestic-stock/v1/quotations/intstock-multprice",
+        "FHKST11300006",
+        "",
+        params,
+    )
+    data = _output(res)
+    if data is None:
+        return None
+    return [StockQuote.from_multi_output(row) for row in data if row.get("inter_shrn_iscd")]
+
+
+# — 국내주식 기간별시세(일/주/월/년): 1회 최대 100건, 최신 날짜부터 —
+async def get_daily_itemchart(
+    itm_no: str,
+    inqr_strt_dt: str,
+    inqr_end_dt: str,
+    period_code: str = "D",
+    adj_prc: str = "0",
+    div_code: str = "J",
+) -> list[dict] | None:
+    res = await url_fetch(
+        "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice",
+        "FHKST03010100",
+        "",
+        {
+            "FID_COND_MRKT_DIV_CODE": div_code,
+            "FID_INPUT_ISCD":         itm_no,
+            "FID_INPUT_DATE_1":       inqr_strt_dt,
+            "FID_INPUT_DATE_2":       inqr_end_dt,
+            "FID_PERIOD_DIV_CODE":    period_code,
+            "FID_ORG_ADJ_PRC":        adj_prc,
+        },
+    )
+    if res is None:
+        return None
+    body = res.getBody()
+    if str(body.rt_cd) != "0":
+        print(f"⛔ {body.msg_cd} — {body.msg1}")
+        return None
+    return [row for row in (body.output2 or []) if row.get("stck_bsop_date")]
+
+
+# — 국내주식 당일분봉: 기준시각(HHMMSS) 포함 이전 최대 30건, 최신 시각부터 —
+async def get_minute_itemchart(itm_no: str, inqr_hour: str, div_code: str = "J") -> list[dict] | None:
+    res = await url_fetch(
+        "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice",
+        "FHKST03010200",
+        "",
+        {
+            "FID_ETC_CLS_CODE":       "",
+            "FID_COND_MRKT_DIV_CODE": div_code,
+            "FID_INPUT_ISCD":         itm_no,
+            "FID_INPUT_HOUR_1":       inqr_hour,
+            "FID_PW_DATA_INCU_YN":    "N",
+        },
+    )
+    if res is None:
+        return None
+    body = res.getBody()
+    if str(body.rt_cd) != "0":
+        print(f"⛔ {body.msg_cd} — {body.msg1}")
+        return None
+    return [row for row in (body.output2 or []) if row.get("stck_cntg_hour")]
+
+
+# — 해외 지수 조회 —
+async def get_overseas_index_price(
+    symb: str = "IXIC",
+    excd: str = "NAS",
+    tr_cont: str = ""
+    ):
+    code = f"{excd}@{symb}".upper()
+    resp = await url_fetch(
+        "/uapi/overseas-price/v1/quotations/inquire-time-indexchartprice",
+        "FHKST03030200",
+        tr_cont,
+        {
+            "FID_COND_MRKT_DIV_CODE": "N",
+            "FID_INPUT_ISCD":  code,
+            "FID_HOUR_CLS_CODE": "0",
+            "FID_PW_DATA_INCU_YN": "Y",
+        },
+    )
+    return _overseas_index_result(resp)
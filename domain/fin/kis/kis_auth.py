@@ -15,18 +15,14 @@ import pandas as pd
 from collections import namedtuple
 from datetime import datetime
 
+from . import kis_ratelimit
+from ...utils.token_store import TokenManager, TokenRecord
+
 clearConsole = lambda: os.system('cls' if os.name in ('nt', 'dos') else 'clear')
 
 key_bytes = 32
 
 config_root = os.path.dirname(os.path.abspath(__file__)) + '/'  # kis_devlp.yaml 파일이 있는 경로
-#token_tmp = config_root + 'KIS000000'  # 토큰 로컬저장시 파일 이름 지정, 파일이름을 토큰값이 유추가능한 파일명은 삼가바랍니다.
-#token_tmp = config_root + 'KIS' + datetime.today().strftime("%Y%m%d%H%M%S")  # 토큰 로컬저장시 파일명 년월일시분초
-token_tmp = config_root + 'KIS' + datetime.today().strftime("%Y%m%d")  # 토큰 로컬저장시 파일명 년월일
-
-# 접근토큰 관리하는 파일 존재여부 체크, 없으면 생성
-if os.path.exists(token_tmp) == False:
-    f = open(token_tmp, "w+")
 
 # 앱키, 앱시크리트, 토큰, 계좌번호 등 저장관리, 자신만의 경로와 파일명으로 설정하시기 바랍니다.
 # pip install PyYAML (패키지설치)
@@ -48,42 +44,73 @@ _base_headers = {
 }
 
 
-# 토큰 발급 받아 저장 (토큰값, 토큰 유효시간,1일, 6시간 이내 발급신청시는 기존 토큰값과 동일, 발급시 알림톡 발송)
-def save_token(my_token, my_expired):
-    valid_date = datetime.strptime(my_expired, '%Y-%m-%d %H:%M:%S')
-    # print('Save token date: ', valid_date)
-    with open(token_tmp, 'w', encoding='utf-8') as f:
-        f.write(f'token: {my_token}\n')
-        f.write(f'valid-date: {valid_date}\n')
+# 접근토큰은 TokenManager 가 관리 (uvicorn worker · Celery 프로세스가 공유 저장소로 토큰 1개를 같이 사용)
+# - 만료 TOKEN_REFRESH_SECS 전부터 백그라운드에서 선제 갱신, 발급은 프로세스 간 잠금으로 항상 1건
+# - 저장소: TOKEN_STORE_URL=redis://... 이면 Redis, 아니면 로컬 파일 (domain/utils/token_store.py)
+_token_managers = dict()   # svr → TokenManager
+
+
+def _issueToken(base_url, app, sec):
+    """토큰 발급 (유효기간 1일, 6시간 이내 재발급시 기존 토큰값과 동일, 발급시 알림톡 발송)"""
+    p = {
+        "grant_type": "client_credentials",
+        "appkey": app,
+        "appsecret": sec,
+    }
+
+    url = f'{base_url}/oauth2/tokenP'
+    res = requests.post(url, data=json.dumps(p), headers=copy.deepcopy(_base_headers))  # 토큰 발급
+    if res.status_code != 200:
+        raise RuntimeError(f'Get Authentification token fail! ({res.status_code})')
+
+    body = res.json()
+    if 'expires_in' in body:
+        expires_at = time.time() + float(body['expires_in'])
+    else:
+        expires_at = datetime.strptime(body['access_token_token_expired'], '%Y-%m-%d %H:%M:%S').timestamp()
+    return TokenRecord(token=body['access_token'], expires_at=expires_at)
+
+
+# 실전/모의 앱키 (auth 가 토큰을 발급하는 키)
+def _appKeys(svr):
+    if svr == 'prod':  # 실전투자
+        return _cfg['my_app'], _cfg['my_sec']
+    return _cfg['paper_app'], _cfg['paper_sec']  # 모의투자
+
+
+def _tokenName(svr, app):
+    return f"kis-{svr}-{app[:8]}"
+
 
+def _tokenManager(svr):
+    tm = _token_managers.get(svr)
+    if tm is None:
+        app, sec = _appKeys(svr)
+        tm = _token_managers[svr] = TokenManager(_tokenName(svr, app), lambda: _issueToken(_cfg[svr], app, sec))
+    return tm
 
-# 토큰 확인 (토큰값, 토큰 유효시간_1일, 6시간 이내 발급신청시는 기존 토큰값과 동일, 발급시 알림톡 발송)
-def read_token():
+
+# 토큰 확인 (저장소 또는 신규 발급), 실패시 None
+def read_token(svr='prod'):
     try:
-        # 토큰이 저장된 파일 읽기
-        with open(token_tmp, encoding='UTF-8') as f:
-            tkg_tmp = yaml.load(f, Loader=yaml.FullLoader)
-
-        # 토큰 만료 일,시간
-        exp_dt = datetime.strftime(tkg_tmp['valid-date'], '%Y-%m-%d %H:%M:%S')
-        # 현재일자,시간
-        now_dt = datetime.today().strftime("%Y-%m-%d %H:%M:%S")
-
-        # print('expire dt: ', exp_dt, ' vs now dt:', now_dt)
-        # 저장된 토큰 만료일자 체크 (만료일시 > 현재일시 인경우 보관 토큰 리턴)
-        if exp_dt > now_dt:
-            return tkg_tmp['token']
-        else:
-            # print('Need new token: ', tkg_tmp['valid-date'])
-            return None
+        return _tokenManager(svr).get()
     except Exception as e:
-        # print('read token error: ', e)
+        print(f'⛔ read token error: {e}')
         return None
 
-# 토큰 유효시간 체크해서 만료된 토큰이면 재발급처리
+
+# 만료(EGW00123)/무효(EGW00121) 토큰 응답이면 공유 토큰 무효화, 다음 호출에서 재발급
+def _checkTokenError(res):
+    if 'EGW00123' in res.text or 'EGW00121' in res.text:
+        _tokenManager('vps' if _isPaper else 'prod').invalidate()
+
+
+# 메모리 토큰만 읽음 (만료 임박이면 백그라운드 갱신, 만료 시에만 호출 스레드가 갱신)
 def _getBaseHeader():
-    if _autoReAuth: reAuth()
-    return copy.deepcopy(_base_headers)
+    h = copy.deepcopy(_base_headers)
+    if 'authorization' in h:
+        h['authorization'] = f"Bearer {_tokenManager('vps' if _isPaper else 'prod').get()}"
+    return h
 
 
 # 가져오기 : 앱키, 앱시크리트, 종합계좌번호(계좌번호 중 숫자8자리), 계좌상품코드(계좌번호 중 숫자2자리), 토큰, 도메인
@@ -132,8 +159,21 @@ def changeTREnv(token_key, svr='vps', product=_cfg['my_prod']):
     _setTRENV(cfg)
 
 
+# 응답 레코드 타입 캐시: (이름, TR id, 필드 목록) → namedtuple 클래스
+# namedtuple 클래스 생성은 비싸므로 응답마다 만들지 않고 재사용
+_record_types = dict()
+
+
+def _recordType(name, tr_id, fields):
+    key = (name, tr_id, fields)
+    rt = _record_types.get(key)
+    if rt is None:
+        rt = _record_types[key] = namedtuple(name, fields)
+    return rt
+
+
 def _getResultObject(json_data):
-    _tc_ = namedtuple('res', json_data.keys())
+    _tc_ = _recordType('res', '', tuple(json_data.keys()))
 
     return _tc_(**json_data)
 
@@ -141,38 +181,11 @@ def _getResultObject(json_data):
 # Token 발급, 유효기간 1일, 6시간 이내 발급시 기존 token값 유지, 발급시 알림톡 무조건 발송
 # 모의투자인 경우  svr='vps', 투자계좌(01)이 아닌경우 product='XX' 변경하세요 (계좌번호 뒤 2자리)
 def auth(svr='prod', product=_cfg['my_prod'], url=None):
-    p = {
-        "grant_type": "client_credentials",
-    }
-    # 개인 환경파일 "kis_devlp.yaml" 파일을 참조하여 앱키, 앱시크리트 정보 가져오기
-    # 개인 환경파일명과 위치는 고객님만 아는 위치로 설정 바랍니다.
-    if svr == 'prod':  # 실전투자
-        ak1 = 'my_app'  # 앱키 (실전투자용)
-        ak2 = 'my_sec'  # 앱시크리트 (실전투자용)
-    elif svr == 'vps':  # 모의투자
-        ak1 = 'paper_app'  # 앱키 (모의투자용)
-        ak2 = 'paper_sec'  # 앱시크리트 (모의투자용)
-
-    # 앱키, 앱시크리트 가져오기
-    p["appkey"] = _cfg[ak1]
-    p["appsecret"] = _cfg[ak2]
-
-    # 기존 발급된 토큰이 있는지 확인
-    saved_token = read_token()  # 기존 발급 토큰 확인
-    # print("saved_token: ", saved_token)
-    if saved_token is None:  # 기존 발급 토큰 확인이 안되면 발급처리
-        url = f'{_cfg[svr]}/oauth2/tokenP'
-        res = requests.post(url, data=json.dumps(p), headers=_getBaseHeader())  # 토큰 발급
-        rescode = res.status_code
-        if rescode == 200:  # 토큰 정상 발급
-            my_token = _getResultObject(res.json()).access_token  # 토큰값 가져오기
-            my_expired= _getResultObject(res.json()).access_token_token_expired  # 토큰값 만료일시 가져오기
-            save_token(my_token, my_expired)  # 새로 발급 받은 토큰 저장
-        else:
-            print('Get Authentification token fail!\nYou have to restart your app!!!')
-            return
-    else:
-        my_token = saved_token  # 기존 발급 토큰 확인되어 기존 토큰 사용
+    # 공유 저장소의 토큰 사용, 없거나 만료 임박이면 1건만 발급
+    my_token = read_token(svr)
+    if my_token is None:
+        print('Get Authentification token fail!\nYou have to restart your app!!!')
+        return
 
     # 발급토큰 정보 포함해서 헤더값 저장 관리, API 호출시 필요
     changeTREnv(f"Bearer {my_token}", svr, product)
@@ -188,12 +201,9 @@ def auth(svr='prod', product=_cfg['my_prod'], url=None):
         print(f'[{_last_auth_time}] => get AUTH Key completed!')
 
 
-# end of initialize, 토큰 재발급, 토큰 발급시 유효시간 1일
-# 프로그램 실행시 _last_auth_time에 저장하여 유효시간 체크, 유효시간 만료시 토큰 발급 처리
+# end of initialize, 토큰 재발급 (만료 여부 확인은 TokenManager 가 처리)
 def reAuth(svr='prod', product=_cfg['my_prod']):
-    n2 = datetime.now()
-    if (n2 - _last_auth_time).seconds >= 86400:  # 유효시간 1일
-        auth(svr, product)
+    read_token(svr)
 
 
 def getEnv():
@@ -219,14 +229,18 @@ def set_order_hash_key(h, p):
 
 
 # API 호출 응답에 필요한 처리 공통 함수
+# - JSON 은 1회만 파싱, body/header 레코드 타입은 TR id + 필드 목록 단위로 캐시
+# - header 는 getHeader() 최초 호출 시 생성
 class APIResp:
-    def __init__(self, resp):
+    def __init__(self, resp, tr_id=''):
         self._rescode = resp.status_code
         self._resp = resp
-        self._header = self._setHeader()
+        self._tr_id = tr_id
+        self._json = resp.json()
+        self._header = None
         self._body = self._setBody()
-        self._err_code = self._body.msg_cd
-        self._err_message = self._body.msg1
+        self._err_code = self._json.get('msg_cd')
+        self._err_message = self._json.get('msg1')
 
     def getResCode(self):
         return self._rescode
@@ -234,18 +248,21 @@ class APIResp:
     def _setHeader(self):
         fld = dict()
         for x in self._resp.headers.keys():
-            if x.islower():
+            # httpx 는 모든 헤더명을 소문자로 주므로 식별자 형태(tr_cont 등)만 사용
+            if x.islower() and x.isidentifier():
                 fld[x] = self._resp.headers.get(x)
-        _th_ = namedtuple('header', fld.keys())
+        _th_ = _recordType('header', self._tr_id, tuple(fld.keys()))
 
         return _th_(**fld)
 
     def _setBody(self):
-        _tb_ = namedtuple('body', self._resp.json().keys())
+        _tb_ = _recordType('body', self._tr_id, tuple(self._json.keys()))
 
-        return _tb_(**self._resp.json())
+        return _tb_(**self._json)
 
     def getHeader(self):
+        if self._header is None:
+            self._header = self._setHeader()
         return self._header
 
     def getBody(self):
@@ -286,9 +303,14 @@ class APIResp:
 
 ########### API call wrapping : API 호출 공통
 
-def _url_fetch(api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, hashFlag=True):
+def _url_fetch(api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, hashFlag=True, priority=None):
     url = f"{getTREnv().my_url}{api_url}"
 
+    # 앱키 단위 초당 TR 한도 (우선순위: 주문 > 계좌 > 시세 > 차트)
+    if priority is None:
+        priority = kis_ratelimit.tr_priority(ptr_id)
+    kis_ratelimit.limiter_for(isPaperTrading()).acquire(priority)
+
     headers = _getBaseHeader()  # 기본 header 값 정리
 
     # 추가 Header 설정
@@ -320,10 +342,11 @@ def _url_fetch(api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=Fa
         res = requests.get(url, headers=headers, params=params)
 
     if res.status_code == 200:
-        ar = APIResp(res)
+        ar = APIResp(res, tr_id)
         if (_DEBUG): ar.printAll()
         return ar
     else:
+        _checkTokenError(res)
         print("Error Code : " + str(res.status_code) + " | " + res.text)
         return None
 
@@ -0,0 +1,257 @@
+# kis_client.py
+"""
+한국투자증권 앱키 단위 클라이언트 + 다중 앱키 풀
+────────────────────────────────────────────
+- KISClient     : 앱키 1개의 자격증명 · 토큰 · 헤더 · 초당 예산(TokenBucket)을 직접 보유
+                  (kis_auth 전역 _cfg/_TRENV/_isPaper 미사용 → 실전·모의 동시 사용 가능)
+- KISClientPool : 시세·차트 TR 을 가장 한가한 정상 앱키로 분산
+    * 주문 · 계좌 TR 은 계좌가 묶인 기본 앱키로만 호출
+    * sticky 키: 연속조회(tr_cont)처럼 같은 앱키가 이어받아야 하는 호출은 같은 클라이언트 고정
+    * EGW00201(초당 거래건수 초과) 응답 시 해당 앱키를 잠시 제외하고 다른 키로 재시도
+- 앱키 추가: kis_devlp.yaml 의 quote_keys 목록에 {app, sec} 항목 추가 (코드 변경 없음)
+
+    quote_keys:
+      - {app: "PSxxxx...", sec: "xxxx..."}
+      - {app: "PSyyyy...", sec: "yyyy..."}
+"""
+from __future__ import annotations
+
+import copy
+import json
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from starlette.config import Config
+
+from . import kis_auth as kis
+from . import kis_async
+from .kis_ratelimit import (
+    KIS_PAPER_RATE_BURST, KIS_PAPER_RATE_PER_SEC, KIS_RATE_BURST, KIS_RATE_PER_SEC,
+    Priority, TokenBucket, limiter_for, tr_priority,
+)
+from ...utils.token_store import TokenManager
+
+config = Config(".env")
+
+KIS_EJECT_SECS     = config("KIS_EJECT_SECS",     cast=float, default=1.0)    # 첫 제외 시간, 연속 시 2배
+KIS_EJECT_MAX_SECS = config("KIS_EJECT_MAX_SECS", cast=float, default=30.0)
+KIS_STICKY_MAX     = config("KIS_STICKY_MAX",     cast=int,   default=1024)   # 기억할 sticky 키 수
+
+
+class KISThrottled(Exception):
+    """EGW00201: 앱키 초당 거래건수 초과"""
+
+
+# ────────────────────────── 앱키 클라이언트 ──────────────────────────
+class KISClient:
+    """앱키 1개 = 자격증명 + 토큰 + 헤더 + 초당 예산 + 상태"""
+
+    def __init__(
+        self,
+        name    : str,
+        app     : str,
+        sec     : str,
+        url     : str,
+        paper   : bool = False,
+        token   : Optional[TokenManager] = None,
+        limiter : Optional[TokenBucket] = None,
+    ) -> None:
+        svr          = "vps" if paper else "prod"
+        self.name    = name
+        self.url     = url
+        self.paper   = paper
+        self.token   = token or TokenManager(kis._tokenName(svr, app), lambda: kis._issueToken(url, app, sec))
+        self.limiter = limiter or (
+            TokenBucket(KIS_PAPER_RATE_PER_SEC, KIS_PAPER_RATE_BURST) if paper
+            else TokenBucket(KIS_RATE_PER_SEC, KIS_RATE_BURST)
+        )
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept":       "text/plain",
+            "charset":      "UTF-8",
+            "User-Agent":   kis.getEnv().get("my_agent", ""),
+            "appkey":       app,
+            "appsecret":    sec,
+        }
+
+        self.ejected_until = 0.0                # monotonic, 이 시각 전까지 분산 대상에서 제외
+        self._strikes      = 0
+        self.calls         = 0
+        self.throttled     = 0
+
+    async def headers(self) -> Dict[str, str]:
+        """요청 헤더 (토큰 재발급이 필요하면 워커 스레드에서 → 이벤트 루프를 막지 않음)"""
+        h = copy.copy(self._headers)
+        h["authorization"] = f"Bearer {await self.token.aget()}"
+        return h
+
+    def healthy(self, now: Optional[float] = None) -> bool:
+        return (time.monotonic() if now is None else now) >= self.ejected_until
+
+    def _eject(self) -> None:
+        self._strikes      += 1
+        self.throttled     += 1
+        hold               = min(KIS_EJECT_SECS * 2 ** (self._strikes - 1), KIS_EJECT_MAX_SECS)
+        self.ejected_until = time.monotonic() + hold
+        print(f"⚠️ KIS 앱키 {self.name} 초당 한도 초과 → {hold:.1f}s 제외")
+
+    async def fetch(self, api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, priority=None):
+        """kis_async.url_fetch 와 같은 계약 (성공 시 APIResp, 실패 시 None / EGW00201 은 KISThrottled)"""
+        url = f"{self.url}{api_url}"
+
+        if priority is None:
+            priority = tr_priority(ptr_id)
+        await self.limiter.acquire_async(priority)
+
+        headers = await self.headers()
+
+        tr_id = ptr_id
+        if ptr_id[0] in ('T', 'J', 'C') and self.paper:  # 모의투자용 TR id 식별
+            tr_id = 'V' + ptr_id[1:]
+
+        headers["tr_id"]    = tr_id
+        headers["custtype"] = "P"
+        headers["tr_cont"]  = tr_cont
+        if appendHeaders:
+            headers.update(appendHeaders)
+
+        if (kis._DEBUG):
+            print(f"< Sending Info ({self.name}) >")
+            print(f"URL: {url}, TR: {tr_id}")
+
+        self.calls += 1
+        client = kis_async.get_client()
+        if (postFlag):
+            res = await client.post(url, headers=headers, content=json.dumps(params))
+        else:
+            res = await client.get(url, headers=headers, params=params)
+
+        if res.status_code == 200:
+            self._strikes = 0
+            ar = kis.APIResp(res, tr_id)
+            if (kis._DEBUG): ar.printAll()
+            return ar
+
+        if 'EGW00201' in res.text:
+            self._eject()
+            raise KISThrottled(self.name)
+        if 'EGW00123' in res.text or 'EGW00121' in res.text:
+            self.token.invalidate()
+        print(f"Error Code ({self.name}) : " + str(res.status_code) + " | " + res.text)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "name":       self.name,
+            "paper":      self.paper,
+            "healthy":    self.healthy(now),
+            "ejected_for": round(max(self.ejected_until - now, 0.0), 3),
+            "calls":      self.calls,
+            "throttled":  self.throttled,
+            "limiter":    self.limiter.stats(),
+        }
+
+
+# ────────────────────────── 앱키 풀 ──────────────────────────
+class KISClientPool:
+    """시세 TR 분산 (가장 한가한 정상 앱키), 주문·계좌는 기본 앱키 고정"""
+
+    def __init__(self, clients: Iterable[KISClient], primary: Optional[KISClient] = None) -> None:
+        self.clients = list(clients)
+        self.primary = primary or self.clients[0]
+        self._sticky : "OrderedDict[Any, KISClient]" = OrderedDict()
+
+    def pick(self, priority: Priority = Priority.QUOTE, sticky=None, exclude=()) -> Optional[KISClient]:
+        """
+        호출할 앱키 선택.
+
+        * 주문 · 계좌 → 기본 앱키
+        * sticky 키가 이미 배정됐으면 같은 앱키 (연속조회는 제외 중이어도 유지)
+        * 그 외 → 정상 앱키 중 예상 대기 시간이 가장 짧은 키 (모두 제외 중이면 가장 먼저 풀리는 키)
+        """
+        if priority <= Priority.ACCOUNT:
+            return self.primary
+
+        if sticky is not None and sticky in self._sticky:
+            self._sticky.move_to_end(sticky)
+            return self._sticky[sticky]
+
+        now  = time.monotonic()
+        pool = [c for c in self.clients if c not in exclude]
+        if not pool:
+            return None
+        live   = [c for c in pool if c.healthy(now)]
+        client = min(live, key=lambda c: c.limiter.load()) if live else min(pool, key=lambda c: c.ejected_until)
+
+        if sticky is not None:
+            self._sticky[sticky] = client
+            while len(self._sticky) > KIS_STICKY_MAX:
+                self._sticky.popitem(last=False)
+        return client
+
+    def release(self, sticky) -> None:
+        """연속조회 종료 → sticky 배정 해제"""
+        self._sticky.pop(sticky, None)
+
+    async def fetch(self, api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False,
+                    priority=None, sticky=None):
+        """선택한 앱키로 호출, EGW00201 이면 다른 앱키로 재시도 (sticky · 주문 · 계좌는 재시도 없음)"""
+        if priority is None:
+            priority = tr_priority(ptr_id)
+
+        tried: List[KISClient] = []
+        while True:
+            client = self.pick(priority, sticky, exclude=tried)
+            if client is None:
+                print(f"⛔ 모든 KIS 앱키가 초당 한도 초과 ({ptr_id})")
+                return None
+            try:
+                return await client.fetch(api_url, ptr_id, tr_cont, params, appendHeaders, postFlag, priority)
+            except KISThrottled:
+                if sticky is not None or priority <= Priority.ACCOUNT:
+                    return None
+                tried.append(client)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "primary": self.primary.name,
+            "sticky":  len(self._sticky),
+            "clients": [c.stats() for c in self.clients],
+        }
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> "KISClientPool":
+        """
+        kis_auth 에서 인증한 앱키(기본, 토큰·버킷 공유) + kis_devlp.yaml quote_keys 의 추가 앱키.
+        추가 앱키는 기본 앱키와 같은 서버(실전/모의)로 호출합니다.
+        """
+        cfg   = cfg or kis.getEnv()
+        paper = kis.isPaperTrading()
+        svr   = "vps" if paper else "prod"
+        app, sec = kis._appKeys(svr)
+
+        primary = KISClient(
+            "primary", app, sec, cfg[svr], paper,
+            token   = kis._tokenManager(svr),
+            limiter = limiter_for(paper),
+        )
+        clients = [primary]
+        for i, key in enumerate(cfg.get("quote_keys") or [], start=1):
+            if key.get("app") == app:
+                continue
+            clients.append(KISClient(key.get("name", f"quote{i}"), key["app"], key["sec"], cfg[svr], paper))
+        return cls(clients, primary)
+
+
+_pool: Optional[KISClientPool] = None
+
+
+def default_pool() -> KISClientPool:
+    """프로세스 공용 풀 (최초 호출 시 kis_devlp.yaml 로 구성)"""
+    global _pool
+    if _pool is None:
+        _pool = KISClientPool.from_config()
+    return _pool
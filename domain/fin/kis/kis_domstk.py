@@ -5,6 +5,44 @@ from datetime import datetime
 
 from . import kis_auth as kis
 
+
+# — 공통: 응답 → output (dict | list) —
+def _output(res):
+    # 호출 실패 (한도 초과 · HTTP 오류) → 호출부에서 이미 로그를 남김
+    if res is None:
+        return None
+
+    body = res.getBody()
+
+    # 성공 시 output 반환
+    if str(body.rt_cd) == "0":
+        return body.output
+
+    # 오류 메시지 출력 후 None 반환
+    print(f"⛔ {body.msg_cd} — {body.msg1}")
+    return None
+
+
+# — 공통: 단일 output 응답 → DataFrame —
+def _output_frame(res) -> pd.DataFrame | None:
+    data = _output(res)
+    if data is None:
+        return None
+    # 출력이 dict 일 경우 리스트로 감싸서 DataFrame 생성
+    if isinstance(data, dict):
+        return pd.DataFrame([data])
+    return pd.DataFrame(data)
+
+
+# — 공통: 단일 output 응답 → 시세 레코드 (pandas 미사용) —
+def _output_quote(res, cls, code: str):
+    data = _output(res)
+    if data is None:
+        return None
+    if isinstance(data, list):
+        data = data[0]
+    return cls.from_output(code, data)
+
 # — 국내 주식 현재가 조회 —
 def get_inquire_price(
     itm_no: str,
@@ -24,15 +62,7 @@ def get_inquire_price(
             "FID_INPUT_ISCD": itm_no,
         },
     )
-    body = res.getBody()
-
-    # 성공 시 DataFrame 반환
-    if str(body.rt_cd) == "0":
-        return pd.DataFrame(body.output, index=[0])
-
-    # 오류 메시지 출력 후 None 반환
-    print(f"⛔ {body.msg_cd} — {body.msg1}")
-    return None
+    return _output_frame(res)
 
 
 # — 국내 지수 현재가 조회 —
@@ -50,13 +80,7 @@ def get_inquire_index_price(
             "FID_INPUT_ISCD": idx_code,
         },
     )
-    body = res.getBody()
-
-    if str(body.rt_cd) == "0":
-        return pd.DataFrame(body.output, index=[0])
-
-    print(f"⛔ {body.msg_cd} — {body.msg1}")
-    return None
+    return _output_frame(res)
 
 
 # — 해외 주식 상세가 조회 —
@@ -80,17 +104,7 @@ def get_overseas_price_detail(
             "SYMB": symb.upper(),
         },
     )
-    body = res.getBody()
-
-    if str(body.rt_cd) == "0":
-        data = body.output
-        # 출력이 dict 일 경우 리스트로 감싸서 DataFrame 생성
-        if isinstance(data, dict):
-            return pd.DataFrame([data])
-        return pd.DataFrame(data)
-
-    print(f"⛔ {body.msg_cd} — {body.msg1}")
-    return None
+    return _output_frame(res)
 
 # — 해외 지수 조회 —
 def get_overseas_index_price(
@@ -110,6 +124,13 @@ def get_overseas_index_price(
             "FID_PW_DATA_INCU_YN": "Y",      # ★ 변경
         },
     )
+    return _overseas_index_result(resp)
+
+
+def _overseas_index_result(resp):
+    if resp is None:
+        return None, None            # 호출 실패
+
     body = resp.getBody()
     print(body)
     if str(body.rt_cd) != "0":
@@ -0,0 +1,84 @@
+# kis_frames.py
+"""
+한국투자증권 실시간 체결 프레임 디코딩
+────────────────────────────────────────────
+- 형식: "<암호화 0|1>|<tr_id>|<건수>|필드^필드^..." (건수만큼 레코드가 이어짐)
+- 자격증명 · 네트워크와 무관한 순수 함수 → 피드(kis_realtime) · 대역 서버(bench) · 테스트 공용
+
+지원 TR
+    H0STCNT0  국내주식 실시간체결가   (kind="stock",    tr_key="005930")
+    HDFSCNT0  해외주식 실시간지연체결가 (kind="overseas", tr_key="DNASAAPL")
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+
+def _signed(value: str, sign: str) -> float:
+    """전일 대비 값에 부호 적용 (대비부호 4: 하한, 5: 하락)"""
+    v = float(value or 0)
+    return -abs(v) if sign in ("4", "5") else v
+
+
+def _decode_stock(f: List[str]) -> Tuple[str, Dict[str, Any]]:
+    # 0 종목코드, 1 체결시간, 2 현재가, 3 대비부호, 4 전일대비, 12 체결거래량, 13 누적거래량
+    return f[0], {
+        "price":  int(f[2]),
+        "change": int(_signed(f[4], f[3])),
+        "volume": int(f[13]),
+    }
+
+
+def _decode_overseas(f: List[str]) -> Tuple[str, Dict[str, Any]]:
+    # 0 실시간종목코드(DNASAAPL), 1 종목코드, 11 현재가, 12 대비부호, 13 전일대비, 20 누적거래량
+    rsym = f[0]
+    return f"{f[1]}|{rsym[1:4]}", {
+        "price":  float(f[11]),
+        "change": _signed(f[13], f[12]),
+        "volume": int(f[20]),
+    }
+
+
+# tr_id → (kind, 레코드당 필드 수, 디코더)
+DECODERS = {
+    "H0STCNT0": ("stock",    46, _decode_stock),
+    "HDFSCNT0": ("overseas", 26, _decode_overseas),
+}
+
+# kind → 실시간 TR id
+TR_BY_KIND = {kind: tr_id for tr_id, (kind, _, _) in DECODERS.items()}
+
+
+def tr_key(kind: str, code: str) -> str:
+    """허브 코드 → 실시간 tr_key ("AAPL|NAS" → "DNASAAPL")"""
+    if kind == "overseas":
+        symb, excd = code.split("|", 1)
+        return f"D{excd}{symb}"
+    return code
+
+
+def parse_frame(raw: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    데이터 프레임 → [(kind, code, payload), ...]
+
+    형식: "<암호화 0|1>|<tr_id>|<건수>|필드^필드^..." (건수만큼 레코드가 이어짐)
+    암호화 프레임과 지원하지 않는 TR 은 빈 리스트.
+    """
+    parts = raw.split("|", 3)
+    if len(parts) != 4 or parts[0] != "0":
+        return []
+    _, tr_id, count, data = parts
+    spec = DECODERS.get(tr_id)
+    if spec is None:
+        return []
+
+    kind, width, decode = spec
+    fields = data.split("^")
+    ticks  = []
+    for i in range(int(count)):
+        rec = fields[i * width:(i + 1) * width]
+        if len(rec) < width:
+            break
+        code, payload = decode(rec)
+        ticks.append((kind, code, payload))
+    return ticks
@@ -0,0 +1,142 @@
+# kis_paging.py
+"""
+연속조회(tr_cont) TR 공용 비동기 페이지 반복자
+────────────────────────────────────────────
+- iter_pages : 응답 헤더 tr_cont 가 F/M 이면 CTX_AREA_* 키를 넘겨 다음 페이지 호출 (재귀 없음)
+               페이지가 도착하는 대로 yield, max_pages 상한, 중간에 break 하면 즉시 중단
+               한 번의 연속조회는 같은 앱키로 호출 (kis_client sticky)
+- ColumnBuffer : 행(dict) → 컬럼별 list 에 누적, DataFrame 은 마지막에 1회만 생성
+                 (페이지마다 pd.concat 하던 O(n²) 복사 제거)
+- collect    : iter_pages → ColumnBuffer → DataFrame (until / limit 로 조기 종료)
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+from starlette.config import Config
+
+from . import kis_async as kio
+from . import kis_client
+
+config = Config(".env")
+
+KIS_MAX_PAGES = config("KIS_MAX_PAGES", cast=int, default=100)   # 연속조회 1회당 최대 페이지 수
+
+# 연속조회 키 (요청 파라미터 이름, 응답 body 는 같은 이름의 소문자)
+CTX_100 = ("CTX_AREA_FK100", "CTX_AREA_NK100")
+CTX_200 = ("CTX_AREA_FK200", "CTX_AREA_NK200")
+
+
+class Page:
+    """연속조회 1페이지"""
+
+    __slots__ = ("index", "rows", "body", "tr_cont")
+
+    def __init__(self, index: int, rows: List[Dict[str, Any]], body, tr_cont: str):
+        self.index   = index        # 0부터
+        self.rows    = rows         # output 행 목록
+        self.body    = body         # APIResp body (output2 등 다른 필드 참조용)
+        self.tr_cont = tr_cont      # F/M: 다음 페이지 있음, D/E: 마지막
+
+    @property
+    def has_next(self) -> bool:
+        return self.tr_cont in ("F", "M")
+
+
+def _rows(body, output: str) -> List[Dict[str, Any]]:
+    data = getattr(body, output, None)
+    if not data:
+        return []
+    return [data] if isinstance(data, dict) else list(data)
+
+
+async def iter_pages(
+    api_url   : str,
+    tr_id     : str,
+    params    : Dict[str, Any],
+    output    : str = "output1",
+    ctx       : Sequence[str] = CTX_100,
+    tr_cont   : str = "",
+    max_pages : int = KIS_MAX_PAGES,
+    priority  = None,
+) -> AsyncIterator[Page]:
+    """
+    연속조회 TR 페이지 반복.
+
+    * 첫 호출은 tr_cont="" (이어서 조회하려면 tr_cont="N" 과 params 의 CTX_AREA_* 지정)
+    * 응답 tr_cont 가 F/M 이면 body 의 ctx 값을 다음 요청 파라미터로 넘겨 "N" 으로 재호출
+    * 호출 실패(None) 또는 rt_cd != "0" 이면 오류 출력 후 종료
+    """
+    params  = dict(params)
+    session = object()                      # 이번 연속조회 전용 sticky 키
+    try:
+        for index in range(max_pages):
+            res = await kio.url_fetch(api_url, tr_id, tr_cont, params, priority=priority, sticky=session)
+            if res is None:
+                return
+            body = res.getBody()
+            if str(getattr(body, "rt_cd", "0")) != "0":
+                print(f"⛔ {body.msg_cd} — {body.msg1}")
+                return
+
+            page = Page(index, _rows(body, output), body, res.getHeader().tr_cont)
+            yield page
+            if not page.has_next:
+                return
+
+            for key in ctx:
+                params[key] = getattr(body, key.lower(), "")
+            tr_cont = "N"
+        print(f"⚠️ {tr_id} 연속조회 {max_pages}페이지 상한 도달")
+    finally:
+        kis_client.default_pool().release(session)
+
+
+class ColumnBuffer:
+    """행(dict) 누적 → 컬럼별 list, 마지막에 DataFrame 1회 생성"""
+
+    def __init__(self) -> None:
+        self._cols : Dict[str, List[Any]] = {}
+        self._n    = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def extend(self, rows: List[Dict[str, Any]]) -> None:
+        cols = self._cols
+        for row in rows:
+            for key in row:
+                if key not in cols:                     # 새 컬럼은 앞 행 수만큼 None 으로 채움
+                    cols[key] = [None] * self._n
+            for key, col in cols.items():
+                col.append(row.get(key))
+            self._n += 1
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self._cols)
+
+
+async def collect(
+    pages : AsyncIterator[Page],
+    until : Optional[Callable[[Page], bool]] = None,
+    limit : Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    페이지 → DataFrame.
+
+    * until(page) 가 True 면 그 페이지까지 담고 중단
+    * limit 행을 채우면 중단 (초과분은 잘라냄)
+    """
+    buf = ColumnBuffer()
+    try:
+        async for page in pages:
+            rows = page.rows
+            if limit is not None:
+                rows = rows[:limit - len(buf)]
+            buf.extend(rows)
+            if (limit is not None and len(buf) >= limit) or (until is not None and until(page)):
+                break
+    finally:
+        await pages.aclose()
+    return buf.to_frame()
@@ -0,0 +1,108 @@
+# kis_quote.py
+"""
+시세 응답 → 경량 레코드 (pandas 미사용)
+────────────────────────────────────────────
+단건 시세 응답의 `output` dict 에서 필요한 필드만 바로 숫자로 변환합니다.
+DataFrame → JSON → dict 왕복 없이 REST / WebSocket 핸들러가 그대로 사용합니다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+
+def _num(value: Any, default: float = 0.0) -> float:
+    """KIS 숫자 문자열("84,100", "-600", "") → float"""
+    if value is None or value == "":
+        return default
+    if isinstance(value, str):
+        value = value.replace(",", "")
+    return float(value)
+
+
+class StockQuote:
+    """국내 종목 현재가 (inquire-price output)"""
+
+    __slots__ = ("code", "price", "change", "change_rate", "volume")
+
+    def __init__(self, code: str, price: int, change: int, change_rate: float, volume: int):
+        self.code        = code
+        self.price       = price
+        self.change      = change
+        self.change_rate = change_rate
+        self.volume      = volume
+
+    @classmethod
+    def from_output(cls, code: str, out: Dict[str, Any]) -> "StockQuote":
+        return cls(
+            code,
+            int(_num(out["stck_prpr"])),
+            int(_num(out["prdy_vrss"])),
+            _num(out.get("prdy_ctrt")),
+            int(_num(out.get("acml_vol"))),
+        )
+
+    @classmethod
+    def from_multi_output(cls, out: Dict[str, Any]) -> "StockQuote":
+        """관심종목(멀티종목) 시세 output 1행 → 레코드"""
+        return cls(
+            out["inter_shrn_iscd"],
+            int(_num(out["inter2_prpr"])),
+            int(_num(out["inter2_prdy_vrss"])),
+            _num(out.get("prdy_ctrt")),
+            int(_num(out.get("acml_vol"))),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"price": self.price, "change": self.change}
+
+
+class IndexQuote:
+    """국내 지수 현재가 (inquire-index-price output)"""
+
+    __slots__ = ("code", "price", "change", "change_rate", "volume")
+
+    def __init__(self, code: str, price: float, change: float, change_rate: float, volume: int):
+        self.code        = code
+        self.price       = price
+        self.change      = change
+        self.change_rate = change_rate
+        self.volume      = volume
+
+    @classmethod
+    def from_output(cls, code: str, out: Dict[str, Any]) -> "IndexQuote":
+        return cls(
+            code,
+            _num(out["bstp_nmix_prpr"]),
+            _num(out["bstp_nmix_prdy_vrss"]),
+            _num(out.get("bstp_nmix_prdy_ctrt")),
+            int(_num(out.get("acml_vol"))),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"price": self.price, "change": self.change}
+
+
+class OverseasQuote:
+    """해외 종목 현재가 (price-detail output)"""
+
+    __slots__ = ("code", "price", "change", "change_rate", "volume")
+
+    def __init__(self, code: str, price: float, change: float, change_rate: float, volume: int):
+        self.code        = code
+        self.price       = price
+        self.change      = change
+        self.change_rate = change_rate
+        self.volume      = volume
+
+    @classmethod
+    def from_output(cls, code: str, out: Dict[str, Any]) -> "OverseasQuote":
+        return cls(
+            code,
+            _num(out.get("last")),
+            _num(out.get("diff")),
+            _num(out.get("rate")),
+            int(_num(out.get("tvol"))),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"price": self.price, "change": self.change}
@@ -0,0 +1,201 @@
+# kis_ratelimit.py
+"""
+한국투자증권 TR 호출 공용 속도 제한기
+────────────────────────────────────────────
+- 앱키(실전/모의)별 토큰 버킷: 초당 TR 한도 바로 아래에서 호출
+- 우선순위: 주문 > 계좌 조회 > 시세 > 차트
+  (상위 클래스 대기자가 있으면 하위 클래스는 토큰을 가져가지 않음)
+- 클래스별 대기열 상한 + 데드라인, 초과 시 RateLimitExceeded
+- 동기(_url_fetch, 스레드)·비동기(kis_async.url_fetch) 호출 모두 지원
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from collections import deque
+from enum import IntEnum
+
+from starlette.config import Config
+
+config = Config(".env")
+
+# 초당 한도: 실전 20건 / 모의 2건 → 버킷 rate + burst 가 한도를 넘지 않도록 설정
+KIS_RATE_PER_SEC       = config("KIS_RATE_PER_SEC",       cast=float, default=15.0)
+KIS_RATE_BURST         = config("KIS_RATE_BURST",         cast=float, default=5.0)
+KIS_PAPER_RATE_PER_SEC = config("KIS_PAPER_RATE_PER_SEC", cast=float, default=1.0)
+KIS_PAPER_RATE_BURST   = config("KIS_PAPER_RATE_BURST",   cast=float, default=1.0)
+KIS_RATE_MAX_QUEUE     = config("KIS_RATE_MAX_QUEUE",     cast=int,   default=64)
+
+
+class Priority(IntEnum):
+    """TR 우선순위 (값이 작을수록 먼저)"""
+    ORDER   = 0   # 주문
+    ACCOUNT = 1   # 계좌 조회
+    QUOTE   = 2   # 시세
+    CHART   = 3   # 차트
+
+
+# 클래스별 기본 대기 한도 (초)
+DEFAULT_DEADLINE = {
+    Priority.ORDER:   5.0,
+    Priority.ACCOUNT: 3.0,
+    Priority.QUOTE:   1.0,
+    Priority.CHART:   10.0,
+}
+
+# 차트성 TR (기간별·분봉·일자별·시간대별)
+_CHART_TRS = {
+    "FHKST03010100",  # 국내주식기간별시세(일/주/월/년)
+    "FHKST03010200",  # 주식당일분봉조회
+    "FHKST01010400",  # 주식현재가 일자별
+    "FHPST01060000",  # 주식현재가 당일시간대별체결
+    "FHPST02320000",  # 주식현재가 시간외일자별주가
+    "FHKST03030200",  # 해외지수 분봉
+}
+
+
+class RateLimitExceeded(Exception):
+    """대기열이 가득 찼거나 데드라인 안에 토큰을 얻지 못함"""
+
+
+def tr_priority(tr_id: str) -> Priority:
+    """TR id → 우선순위 클래스"""
+    if tr_id in _CHART_TRS:
+        return Priority.CHART
+    if tr_id.endswith("U"):                     # 주문·정정·취소·예약 (TTTC0802U, CTSC0008U ...)
+        return Priority.ORDER
+    if tr_id[:4] in ("TTTC", "VTTC", "CTSC", "VTSC", "CTRP"):
+        return Priority.ACCOUNT                 # 계좌 조회 (TTTC8434R ...)
+    return Priority.QUOTE
+
+
+class TokenBucket:
+    """우선순위·데드라인을 지원하는 스레드 안전 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: float, max_queue: int = KIS_RATE_MAX_QUEUE):
+        self.rate      = rate
+        self.burst     = burst
+        self.max_queue = max_queue
+
+        self._lock     = threading.Lock()
+        self._tokens   = burst
+        self._stamp    = time.monotonic()
+        self._waiting  = [0] * len(Priority)
+        self._granted  = [0] * len(Priority)
+        self._rejected = [0] * len(Priority)
+        self._recent   = deque()                # 최근 1초 내 허가 시각
+
+    # ── 내부 ──────────────────────────────────────────
+    def _prune(self, now: float) -> None:
+        while self._recent and now - self._recent[0] > 1.0:
+            self._recent.popleft()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp  = now
+
+    def _try_take(self, prio: Priority) -> float:
+        """토큰 획득 시 0, 아니면 다음 시도까지 대기 시간(초)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1 and not any(self._waiting[:prio]):
+                self._tokens -= 1
+                self._granted[prio] += 1
+                self._recent.append(now)
+                self._prune(now)                # 최근 1초만 유지 (stats 를 안 불러도 늘어나지 않음)
+                return 0.0
+            return max((1 - self._tokens) / self.rate, 1 / self.rate / 4)
+
+    def _enter(self, prio: Priority) -> None:
+        with self._lock:
+            if self._waiting[prio] >= self.max_queue:
+                self._rejected[prio] += 1
+                raise RateLimitExceeded(f"{prio.name} 대기열 초과 ({self.max_queue})")
+            self._waiting[prio] += 1
+
+    def _leave(self, prio: Priority, ok: bool) -> None:
+        with self._lock:
+            self._waiting[prio] -= 1
+            if not ok:
+                self._rejected[prio] += 1
+
+    # ── 획득 ──────────────────────────────────────────
+    def acquire(self, prio: Priority = Priority.QUOTE, timeout: float | None = None) -> None:
+        """동기 획득 (스레드 블로킹)"""
+        deadline = time.monotonic() + (DEFAULT_DEADLINE[prio] if timeout is None else timeout)
+        self._enter(prio)
+        ok = False
+        try:
+            while True:
+                wait = self._try_take(prio)
+                if wait == 0:
+                    ok = True
+                    return
+                remain = deadline - time.monotonic()
+                if remain <= 0:
+                    raise RateLimitExceeded(f"{prio.name} 데드라인 초과")
+                time.sleep(min(wait, remain))
+        finally:
+            self._leave(prio, ok)
+
+    async def acquire_async(self, prio: Priority = Priority.QUOTE, timeout: float | None = None) -> None:
+        """비동기 획득 (이벤트 루프 비블로킹)"""
+        deadline = time.monotonic() + (DEFAULT_DEADLINE[prio] if timeout is None else timeout)
+        self._enter(prio)
+        ok = False
+        try:
+            while True:
+                wait = self._try_take(prio)
+                if wait == 0:
+                    ok = True
+                    return
+                remain = deadline - time.monotonic()
+                if remain <= 0:
+                    raise RateLimitExceeded(f"{prio.name} 데드라인 초과")
+                await asyncio.sleep(min(wait, remain))
+        finally:
+            self._leave(prio, ok)
+
+    # ── 상태 ──────────────────────────────────────────
+    def load(self) -> float:
+        """지금 요청하면 예상 대기 시간(초) — 여러 앱키 중 가장 한가한 키 선택용"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(sum(self._waiting) + 1 - self._tokens, 0.0) / self.rate
+
+    def stats(self) -> dict:
+        """현재 예산 사용량 (최근 1초 허가 수 / 초당 한도)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._prune(now)
+            return {
+                "rate":        self.rate,
+                "burst":       self.burst,
+                "tokens":      round(self._tokens, 3),
+                "last_1s":     len(self._recent),
+                "utilization": round(len(self._recent) / (self.rate + self.burst), 3),
+                "classes": {
+                    p.name.lower(): {
+                        "waiting":  self._waiting[p],
+                        "granted":  self._granted[p],
+                        "rejected": self._rejected[p],
+                    }
+                    for p in Priority
+                },
+            }
+
+
+# 앱키(실전/모의)별 버킷
+_limiters = {
+    False: TokenBucket(KIS_RATE_PER_SEC, KIS_RATE_BURST),
+    True:  TokenBucket(KIS_PAPER_RATE_PER_SEC, KIS_PAPER_RATE_BURST),
+}
+
+
+def limiter_for(paper: bool) -> TokenBucket:
+    """실전(False) / 모의(True) 앱키의 버킷"""
+    return _limiters[bool(paper)]
@@ -0,0 +1,250 @@
+# kis_realtime.py
+"""
+한국투자증권 실시간(WebSocket) 시세 피드 어댑터
+────────────────────────────────────────────
+- 웹소켓 접속키(approval_key) 발급 후 업스트림 WebSocket 1개만 유지
+- 필요한 종목만 구독/해제 (세션당 구독 한도 내, 초과분은 대기열에 두었다가 자리가 나면 구독)
+- '|' · '^' 구분 실시간 프레임 디코딩(kis_frames) → on_tick(kind, code, payload)
+- PINGPONG 응답, 끊기면 지수 백오프로 재접속 후 전체 재구독
+- 접속키는 만료(약 24시간) 전에 재발급, 인증 오류로 거부 · 종료되면 버리고 새로 발급
+- url / approval_key 를 주입하면 로컬 대역 서버(녹화 프레임 재생)로 테스트 가능
+
+지원 TR
+    H0STCNT0  국내주식 실시간체결가   (kind="stock",    tr_key="005930")
+    HDFSCNT0  해외주식 실시간지연체결가 (kind="overseas", tr_key="DNASAAPL")
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import websockets
+from starlette.config import Config
+
+from . import kis_auth as kis
+from . import kis_async
+from .kis_frames import TR_BY_KIND, parse_frame, tr_key
+
+config = Config(".env")
+
+KIS_REALTIME       = config("KIS_REALTIME",       default="false").lower() == "true"
+KIS_WS_URL         = config("KIS_WS_URL",         default="")              # 미설정 시 kis_devlp.yaml / 기본값
+KIS_WS_MAX_SUBS    = config("KIS_WS_MAX_SUBS",    cast=int,   default=40)   # 세션당 등록 한도(41) 바로 아래
+KIS_WS_BACKOFF_MAX = config("KIS_WS_BACKOFF_MAX", cast=float, default=30.0)
+KIS_WS_KEY_REFRESH = config("KIS_WS_KEY_REFRESH", cast=float, default=82800.0)   # 접속키 재발급 주기 (유효 24시간)
+
+_DEFAULT_WS_URL = {
+    False: "ws://ops.koreainvestment.com:21000",   # 실전
+    True:  "ws://ops.koreainvestment.com:31000",   # 모의
+}
+
+Tick = Callable[[str, str, Dict[str, Any]], None]
+
+# 구독 거부 · 연결 종료 사유에 이 문구가 있으면 접속키 문제로 판단
+_AUTH_ERRORS = ("approval", "appkey", "invalid key", "expired")
+
+
+def _auth_error(message: str) -> bool:
+    message = (message or "").lower()
+    return any(word in message for word in _AUTH_ERRORS)
+
+
+# ────────────────────────── 접속키 ──────────────────────────
+async def issue_approval_key() -> str:
+    """웹소켓 접속키 발급 (/oauth2/Approval)"""
+    cfg   = kis.getEnv()
+    paper = kis.isPaperTrading()
+    app, sec = (cfg["paper_app"], cfg["paper_sec"]) if paper else (cfg["my_app"], cfg["my_sec"])
+    url   = f"{cfg['vps' if paper else 'prod']}/oauth2/Approval"
+
+    res = await kis_async.get_client().post(
+        url,
+        headers={"content-type": "application/json; utf-8"},
+        content=json.dumps({"grant_type": "client_credentials", "appkey": app, "secretkey": sec}),
+    )
+    res.raise_for_status()
+    return res.json()["approval_key"]
+
+
+# ────────────────────────── 피드 ──────────────────────────
+class KISRealtimeFeed:
+    """업스트림 실시간 WebSocket 1개 ↔ 허브 on_tick"""
+
+    def __init__(
+        self,
+        on_tick      : Tick,
+        url          : Optional[str] = None,
+        approval_key : Optional[str] = None,
+        max_subs     : int = KIS_WS_MAX_SUBS,
+    ) -> None:
+        self.on_tick       = on_tick
+        self.url           = url or KIS_WS_URL or kis.getEnv().get(
+            "vops" if kis.isPaperTrading() else "ops", _DEFAULT_WS_URL[kis.isPaperTrading()]
+        )
+        self.max_subs      = max_subs
+        self._approval_key = approval_key
+        self._fixed_key    = approval_key is not None            # 주입한 키(대역 서버용)는 재발급하지 않음
+        self._key_at       = time.monotonic()                    # 접속키 발급 시각
+        self._wanted       : Set[Tuple[str, str]] = set()        # 구독하고 싶은 종목
+        self._pending      : Dict[Tuple[str, str], None] = {}    # 한도 초과로 대기 중인 종목 (도착 순서)
+        self._live         : Set[Tuple[str, str]] = set()        # 현재 세션에 등록된 종목
+        self._control      : asyncio.Queue = asyncio.Queue()     # 상태 변경된 종목
+        self._task         : Optional[asyncio.Task] = None
+        self._healthy      = False                               # 이번 세션에서 정상 메시지를 받았는지
+        self.connected     = False
+
+    # ── 구독 관리 (허브 watcher 로 호출) ──────────────────────
+    def supports(self, kind: str) -> bool:
+        return kind in TR_BY_KIND
+
+    def on_topic(self, kind: str, code: str, active: bool) -> None:
+        """
+        허브 종목 활성/비활성 → 업스트림 구독/해제.
+        한도 초과분은 대기열에 두고 REST 폴링 유지, 구독 중인 종목이 빠지면 가장 먼저 온 대기 종목을 구독
+        """
+        if not self.supports(kind):
+            return
+        key = (kind, code)
+        if active:
+            if key in self._wanted:
+                return
+            if len(self._wanted) >= self.max_subs:
+                self._pending[key] = None
+                return
+            self._wanted.add(key)
+            self._control.put_nowait(key)
+            return
+
+        self._pending.pop(key, None)
+        if key not in self._wanted:
+            return
+        self._wanted.discard(key)
+        self._control.put_nowait(key)
+        if self._pending:
+            promoted = next(iter(self._pending))
+            del self._pending[promoted]
+            self._wanted.add(promoted)
+            self._control.put_nowait(promoted)
+
+    # ── 수명 ──────────────────────────────────────────
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    # ── 내부 ──────────────────────────────────────────
+    def _message(self, tr_type: str, key: Tuple[str, str]) -> str:
+        return json.dumps({
+            "header": {
+                "approval_key": self._approval_key,
+                "custtype":     "P",
+                "tr_type":      tr_type,            # 1: 등록, 2: 해제
+                "content-type": "utf-8",
+            },
+            "body": {"input": {"tr_id": TR_BY_KIND[key[0]], "tr_key": tr_key(*key)}},
+        })
+
+    def _drop_key(self, reason: str) -> None:
+        """접속키 폐기 → 다음 접속 때 새로 발급"""
+        if not self._fixed_key:
+            self._approval_key = None
+            print(f"⚠️ KIS 실시간 접속키 폐기: {reason}")
+
+    async def _ensure_key(self) -> None:
+        expired = time.monotonic() - self._key_at >= KIS_WS_KEY_REFRESH
+        if self._approval_key is None or (expired and not self._fixed_key):
+            self._approval_key = await issue_approval_key()
+            self._key_at       = time.monotonic()
+
+    async def _run(self) -> None:
+        """접속 → 전체 재구독 → 수신, 끊기면 백오프 후 재접속"""
+        backoff = 1.0
+        while True:
+            try:
+                await self._ensure_key()
+                async with websockets.connect(self.url, ping_interval=None) as ws:
+                    self.connected = True
+                    self._healthy  = False
+                    self._live = set()
+                    for key in tuple(self._wanted):
+                        await self._sync(ws, key)
+                    await self._session(ws)
+            except asyncio.CancelledError:
+                raise
+            except websockets.ConnectionClosed as e:
+                if e.rcvd is not None and (e.rcvd.code == 1008 or _auth_error(e.rcvd.reason)):
+                    self._drop_key(f"연결 종료 {e.rcvd.code} {e.rcvd.reason}")
+                print(f"⚠️ KIS 실시간 피드 연결 종료: {e} (재접속 {backoff:.0f}s)")
+            except websockets.InvalidStatus as e:
+                if e.response.status_code in (401, 403):
+                    self._drop_key(f"접속 거부 {e.response.status_code}")
+                print(f"⚠️ KIS 실시간 피드 연결 오류: {e} (재접속 {backoff:.0f}s)")
+            except Exception as e:
+                print(f"⚠️ KIS 실시간 피드 연결 오류: {e} (재접속 {backoff:.0f}s)")
+            finally:
+                self.connected = False
+                self._live = set()
+            if self._healthy:
+                backoff = 1.0       # 정상 동작하던 세션 → 바로 재접속 (접속키 거부만 반복되면 백오프 유지)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, KIS_WS_BACKOFF_MAX)
+
+    async def _sync(self, ws, key: Tuple[str, str]) -> None:
+        """원하는 상태(_wanted)와 세션 등록 상태(_live)를 맞춤"""
+        if key in self._wanted and key not in self._live:
+            await ws.send(self._message("1", key))
+            self._live.add(key)
+        elif key not in self._wanted and key in self._live:
+            await ws.send(self._message("2", key))
+            self._live.discard(key)
+
+    async def _session(self, ws) -> None:
+        async def _writer():
+            while True:
+                await self._sync(ws, await self._control.get())
+
+        async def _rotate():
+            # 만료 전에 세션을 닫아 _run 이 새 접속키로 다시 접속 · 전체 재구독
+            if not self._fixed_key:
+                await asyncio.sleep(max(KIS_WS_KEY_REFRESH - (time.monotonic() - self._key_at), 0))
+                await ws.close(1000, "approval key refresh")
+
+        writer = asyncio.create_task(_writer())
+        rotate = asyncio.create_task(_rotate())
+        try:
+            async for raw in ws:
+                if isinstance(raw, bytes):
+                    raw = raw.decode()
+                if raw[:1] in ("0", "1"):
+                    self._healthy = True
+                    for kind, code, payload in parse_frame(raw):
+                        self.on_tick(kind, code, payload)
+                    continue
+
+                msg = json.loads(raw)
+                if msg.get("header", {}).get("tr_id") == "PINGPONG":
+                    self._healthy = True
+                    await ws.send(raw)
+                elif msg.get("body", {}).get("rt_cd") == "0":
+                    self._healthy = True
+                elif msg.get("body", {}).get("rt_cd") is not None:
+                    msg1 = msg["body"].get("msg1", "")
+                    print(f"⛔ 실시간 구독 오류: {msg1}")
+                    if _auth_error(msg1):
+                        self._drop_key(msg1)
+                        await ws.close(1000, "approval key rejected")
+        finally:
+            writer.cancel()
+            rotate.cancel()
@@ -0,0 +1,190 @@
+# File: domain/fin/market_calendar.py
+"""
+시장 달력 (KRX · 미국)
+────────────────────────────────────────────
+- 시장별 현지 시각 기준 세션: 동시호가(auction) → 정규장(open) → 종가 단일가·정착(auction) → 휴장(closed)
+- 주말 · 휴장일 · 조기 폐장일은 아래 표에 미리 정리 (매년 말 다음 해 공시 일정으로 갱신)
+  · 표에 없는 휴장일은 KRX_HOLIDAYS_EXTRA / US_HOLIDAYS_EXTRA (쉼표 구분 YYYYMMDD) 로 추가
+- 날짜별 세션 경계(epoch 초)는 한 번 계산해 캐시 → state() 는 비교 몇 번으로 끝남
+- session(kind, code): 허브 · 캐시가 폴링 간격과 TTL 을 정할 때 쓰는 (상태, 다음 전환까지 초)
+  · 달력이 없는 거래소(홍콩 · 도쿄 등)는 항상 open (기존 폴링 그대로)
+"""
+import time
+
+from datetime import date, datetime, timedelta
+from typing   import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from starlette.config import Config
+
+
+# ────────────────────────── 설정값 ──────────────────────────
+config = Config(".env")
+
+OPEN    = "open"
+AUCTION = "auction"
+CLOSED  = "closed"
+
+# 휴장일 (주말 제외)
+KRX_HOLIDAYS = (
+    # 2025
+    20250101, 20250127, 20250128, 20250129, 20250130, 20250303, 20250501, 20250505, 20250506,
+    20250603, 20250606, 20250815, 20251003, 20251006, 20251007, 20251008, 20251009, 20251225,
+    20251231,
+    # 2026
+    20260101, 20260216, 20260217, 20260218, 20260302, 20260501, 20260505, 20260525, 20260603,
+    20260817, 20260924, 20260925, 20261005, 20261009, 20261225, 20261231,
+    # 2027
+    20270101, 20270208, 20270209, 20270301, 20270505, 20270513, 20270816, 20270914, 20270915,
+    20270916, 20271004, 20271011, 20271227, 20271231,
+)
+
+US_HOLIDAYS = (
+    # 2025
+    20250101, 20250109, 20250120, 20250217, 20250418, 20250526, 20250619, 20250704, 20250901,
+    20251127, 20251225,
+    # 2026
+    20260101, 20260119, 20260216, 20260403, 20260525, 20260619, 20260703, 20260907, 20261126,
+    20261225,
+    # 2027
+    20270101, 20270118, 20270215, 20270326, 20270531, 20270618, 20270705, 20270906, 20271125,
+    20271224,
+)
+
+# 조기 폐장 (현지 시각 13:00)
+US_EARLY_CLOSE = (20250703, 20251128, 20251224, 20261127, 20261224, 20271126)
+
+# 미국 거래소 코드 (KIS 해외 시세 EXCD)
+US_EXCHANGES = frozenset({"NAS", "NYS", "AMS", "BAQ", "BAY", "BAA"})
+
+
+def _extra(name: str) -> Tuple[int, ...]:
+    raw = config(name, default="")
+    return tuple(int(d) for d in raw.split(",") if d.strip().isdigit())
+
+
+def _hm(hour: int, minute: int) -> int:
+    return hour * 60 + minute
+
+
+def _ymd(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+# ────────────────────────── 달력 ──────────────────────────
+class MarketCalendar:
+    """시장 1개의 거래일 · 세션 경계"""
+
+    def __init__(
+        self,
+        name        : str,
+        tz          : str,
+        open        : int,                  # 정규장 시작 (현지 분)
+        close       : int,                  # 정규장 종료
+        pre         : int,                  # 시작 전 동시호가 (분)
+        post        : int,                  # 종료 후 종가 단일가 · 정착 (분)
+        holidays    : Iterable[int],
+        early_close : Optional[Dict[int, int]] = None,
+    ) -> None:
+        self.name      = name
+        self.tz        = ZoneInfo(tz)
+        self._open     = open
+        self._close    = close
+        self._pre      = pre
+        self._post     = post
+        self._holidays : FrozenSet[int] = frozenset(holidays)
+        self._early    = early_close or {}
+        self._cache    : Dict[int, List[Tuple[float, float, str]]] = {}
+
+    def is_trading_day(self, d: date) -> bool:
+        return d.weekday() < 5 and _ymd(d) not in self._holidays
+
+    def sessions(self, d: date) -> List[Tuple[float, float, str]]:
+        """해당 날짜의 (시작 epoch, 종료 epoch, 상태) 목록 (휴장일이면 빈 목록)"""
+
+        ymd = _ymd(d)
+        out = self._cache.get(ymd)
+        if out is not None:
+            return out
+
+        out = []
+        if self.is_trading_day(d):
+            midnight = datetime(d.year, d.month, d.day, tzinfo=self.tz)
+            close    = self._early.get(ymd, self._close)
+            edges    = (
+                (self._open - self._pre, self._open,        AUCTION),
+                (self._open,             close,             OPEN),
+                (close,                  close + self._post, AUCTION),
+            )
+            # 분 → epoch (DST 전환일도 현지 시각 기준으로 맞도록 timedelta 가산 후 변환)
+            out = [
+                ((midnight + timedelta(minutes=s)).timestamp(), (midnight + timedelta(minutes=e)).timestamp(), st)
+                for s, e, st in edges if e > s
+            ]
+        if len(self._cache) > 64:
+            self._cache.clear()
+        self._cache[ymd] = out
+        return out
+
+    def state(self, ts: Optional[float] = None) -> Tuple[str, float]:
+        """(현재 상태, 다음 상태 전환 epoch)"""
+
+        ts = time.time() if ts is None else ts
+        d  = datetime.fromtimestamp(ts, self.tz).date()
+        for start, end, st in self.sessions(d):
+            if ts < start:
+                return CLOSED, start
+            if ts < end:
+                return st, end
+
+        for i in range(1, 15):                       # 연휴가 길어도 2주 안에는 거래일이 있음
+            sessions = self.sessions(d + timedelta(days=i))
+            if sessions:
+                return CLOSED, sessions[0][0]
+        return CLOSED, ts + 86400
+
+    def closed_at(self, ts: Optional[float] = None) -> float:
+        """ts 이전 마지막 세션 종료 epoch (장중이면 직전 종료, 2주 안에 없으면 0)"""
+
+        ts = time.time() if ts is None else ts
+        d  = datetime.fromtimestamp(ts, self.tz).date()
+        for i in range(15):
+            ends = [end for _, end, _ in self.sessions(d - timedelta(days=i)) if end <= ts]
+            if ends:
+                return ends[-1]
+        return 0.0
+
+
+KRX = MarketCalendar(
+    "KRX", "Asia/Seoul",
+    open=_hm(9, 0), close=_hm(15, 20), pre=30, post=15,          # 08:30 동시호가 ~ 15:30 종가 단일가 + 정착 5분
+    holidays=KRX_HOLIDAYS + _extra("KRX_HOLIDAYS_EXTRA"),
+)
+
+US = MarketCalendar(
+    "US", "America/New_York",
+    open=_hm(9, 30), close=_hm(16, 0), pre=5, post=5,            # 개장 · 폐장 크로스 전후 5분
+    holidays=US_HOLIDAYS + _extra("US_HOLIDAYS_EXTRA"),
+    early_close={d: _hm(13, 0) for d in US_EARLY_CLOSE},
+)
+
+
+def calendar_for(kind: str, code: str) -> Optional[MarketCalendar]:
+    """시세 종류 · 코드 → 시장 달력 (달력이 없는 거래소는 None)"""
+
+    if kind in ("stock", "index"):
+        return KRX
+    if kind == "overseas" and code.rpartition("|")[2] in US_EXCHANGES:
+        return US
+    return None
+
+
+def session(kind: str, code: str) -> Tuple[str, float]:
+    """(상태, 다음 전환까지 남은 초). 달력이 없으면 항상 open"""
+
+    cal = calendar_for(kind, code)
+    if cal is None:
+        return OPEN, float("inf")
+    now       = time.time()
+    st, until = cal.state(now)
+    return st, until - now
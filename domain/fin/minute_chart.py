@@ -0,0 +1,238 @@
+# File: domain/fin/minute_chart.py
+"""
+국내 종목 당일 분봉 서비스
+────────────────────────────────────────────
+- 정규장(09:00~15:30)을 1분 단위 고정 배열(391칸)로 표현: 분 index = 시각 - 09:00
+- 당일분봉 TR(FHKST03010200)은 기준시각 이전 30건만 주므로 세션을 30분 구간으로 나눠
+  기준시각 목록을 만든 뒤 동시에 호출 (KIS 속도 제한기 · 앱키 풀이 실제 호출 속도 조절,
+  동시에 진행하는 호출은 서비스 전체에서 MINUTE_FETCH_CONCURRENCY 개까지)
+- 응답은 분 index 위치에 그대로 기록 → 구간 경계 중복은 자동 제거
+- 장중: 이미 확정된 분(synced 이전)은 다시 받지 않고, synced 이후 구간만 증분 조회
+- 장 마감 후: 마지막 구간까지 채운 뒤 종목/날짜별 .npz 로 영구 저장, 이후 로컬 I/O 만
+- 당일분봉 TR 은 오늘 데이터만 제공 → 지난 날짜는 저장해 둔 날만 조회 가능
+"""
+import asyncio
+import logging
+import os
+import time
+
+from datetime import datetime
+from typing   import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from starlette.config import Config
+
+from .chart_store import KST, MARKET_CLOSE, today_kst
+from .kis import kis_async as kio
+from .market_calendar import KRX
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+MINUTE_STORE_DIR = config("MINUTE_STORE_DIR", default=os.path.join(os.path.expanduser("~"), ".jandi", "minutes"))
+MINUTE_LIVE_TTL  = config("MINUTE_LIVE_TTL",  cast=float, default=5.0)   # 장중 증분 조회 최소 간격 (초)
+MINUTE_MEM_DAYS  = config("MINUTE_MEM_DAYS",  cast=int,   default=512)   # 메모리에 올려둘 (종목, 날짜) 수
+
+# 동시에 진행할 30분 구간 조회 수 (KIS_RATE_MAX_QUEUE 보다 충분히 작게)
+MINUTE_FETCH_CONCURRENCY = config("MINUTE_FETCH_CONCURRENCY", cast=int, default=8)
+
+SESSION_OPEN  = 9 * 60               # 09:00
+SESSION_CLOSE = 15 * 60 + 30         # 15:30 (종가 단일가)
+SESSION_LEN   = SESSION_CLOSE - SESSION_OPEN + 1
+SLICE_LEN     = 30                   # TR 1회 최대 건수
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+# ────────────────────────── 시각 유틸 ──────────────────────────
+def _minute_now() -> int:
+    """현재(KST) 분 index (-1: 장 시작 전, SESSION_LEN - 1 이 마지막)"""
+    now = datetime.now(KST)
+    return max(min(now.hour * 60 + now.minute - SESSION_OPEN, SESSION_LEN - 1), -1)
+
+
+def _session_done() -> bool:
+    now = datetime.now(KST)
+    return (now.hour, now.minute) >= MARKET_CLOSE
+
+
+def _hhmmss(index: int) -> str:
+    m = SESSION_OPEN + index
+    return f"{m // 60:02d}{m % 60:02d}00"
+
+
+def slice_cursors(start: int, end: int) -> List[int]:
+    """[start, end] 분 구간을 덮는 기준시각(분 index) 목록 — 각 기준시각은 자신 포함 이전 30분을 받음"""
+    cursors = []
+    c = end
+    while c >= start:
+        cursors.append(c)
+        c -= SLICE_LEN
+    return cursors
+
+
+# ────────────────────────── 하루 분봉 배열 ──────────────────────────
+class MinuteDay:
+    """정규장 1일 분봉 (고정 길이 배열 + 채워진 칸 표시)"""
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+    __slots__ = FIELDS + ("filled", "synced", "final", "fetched_at")
+
+    def __init__(self) -> None:
+        for f in self.FIELDS:
+            setattr(self, f, np.zeros(SESSION_LEN, dtype=np.int64))
+        self.filled     = np.zeros(SESSION_LEN, dtype=bool)
+        self.synced     = 0          # 이 index 이전 분은 확정 (다시 받지 않음)
+        self.final      = False      # 장 마감 후 전체 확정
+        self.fetched_at = 0.0        # 마지막 증분 조회 시각 (monotonic)
+
+    def apply(self, rows: List[Dict[str, Any]]) -> None:
+        """당일분봉 output2 행 → 분 index 위치에 기록 (중복 시각은 덮어씀)"""
+        for r in rows:
+            h = r["stck_cntg_hour"]
+            i = int(h[:2]) * 60 + int(h[2:4]) - SESSION_OPEN
+            if 0 <= i < SESSION_LEN:
+                self.open[i]   = int(r.get("stck_oprc") or 0)
+                self.high[i]   = int(r.get("stck_hgpr") or 0)
+                self.low[i]    = int(r.get("stck_lwpr") or 0)
+                self.close[i]  = int(r.get("stck_prpr") or 0)
+                self.volume[i] = int(r.get("cntg_vol") or 0)
+                self.filled[i] = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        idx   = np.flatnonzero(self.filled)
+        mins  = idx + SESSION_OPEN
+        out   = {"time": (mins // 60 * 100 + mins % 60).tolist()}       # HHMM
+        for f in self.FIELDS:
+            out[f] = getattr(self, f)[idx].tolist()
+        out["final"] = self.final
+        return out
+
+    @classmethod
+    def load(cls, path: str) -> "MinuteDay":
+        day = cls()
+        with np.load(path) as z:
+            for f in cls.FIELDS + ("filled",):
+                setattr(day, f, z[f])
+        day.synced, day.final = SESSION_LEN, True
+        return day
+
+    def save(self, path: str) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, filled=self.filled, **{f: getattr(self, f) for f in self.FIELDS})
+        os.replace(tmp, path)
+
+
+# ────────────────────────── 서비스 ──────────────────────────
+class MinuteChartService:
+    """(종목, 날짜) 별 분봉: 확정된 날은 파일, 오늘은 메모리 + 증분 조회"""
+
+    def __init__(self, root: str = MINUTE_STORE_DIR, max_days: int = MINUTE_MEM_DAYS) -> None:
+        self.root   = root
+        self._max   = max_days
+        self._days  : Dict[Tuple[str, int], MinuteDay]    = {}
+        self._locks : Dict[Tuple[str, int], asyncio.Lock] = {}
+        self.calls  = 0
+        self._slots = asyncio.Semaphore(MINUTE_FETCH_CONCURRENCY)
+        os.makedirs(root, exist_ok=True)
+
+    async def day(self, code: str, ymd: Optional[int] = None) -> Optional[MinuteDay]:
+        """
+        분봉 조회.
+
+        * 확정된 날: 메모리 → 파일 (업스트림 호출 없음)
+        * 오늘: synced 이후 구간만 동시 조회, MINUTE_LIVE_TTL 이내 재요청은 메모리 응답
+        * 저장되지 않은 지난 날짜: None
+        """
+        today = today_kst()
+        ymd   = ymd or today
+        key   = (code, ymd)
+
+        day = self._days.get(key) or self._load(key)
+        if day is not None and day.final:
+            return day
+        if ymd != today:
+            return None
+
+        if day is None:
+            day = self._days[key] = MinuteDay()
+            self._evict()
+        if time.monotonic() - day.fetched_at < MINUTE_LIVE_TTL:
+            return day
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if time.monotonic() - day.fetched_at >= MINUTE_LIVE_TTL and not day.final:
+                await self._sync(code, day)
+                if day.final:
+                    day.save(self._path(key))
+                    self._locks.pop(key, None)
+        return day
+
+    def stats(self) -> Dict[str, Any]:
+        return {"days": len(self._days), "calls": self.calls}
+
+    # ── 내부 ──────────────────────────────────────────
+    async def _sync(self, code: str, day: MinuteDay) -> None:
+        """synced ~ 현재 분 구간을 30분 단위 기준시각으로 나눠 동시 조회 (동시 진행은 _slots 만큼)"""
+
+        done = _session_done()
+        now  = SESSION_LEN - 1 if done else _minute_now()
+        if now < 0 or not KRX.is_trading_day(datetime.now(KST).date()):   # 장 시작 전 · 휴장일은 호출 없음
+            day.fetched_at = time.monotonic()
+            return
+
+        async def _slice(cursor: int):
+            async with self._slots:
+                self.calls += 1
+                return await kio.get_minute_itemchart(code, _hhmmss(cursor))
+
+        cursors = slice_cursors(day.synced, now)
+        results = await asyncio.gather(*(_slice(c) for c in cursors))
+        if any(rows is None for rows in results):
+            raise RuntimeError(f"{code} 분봉 조회 실패")
+
+        for rows in results:
+            day.apply(rows)
+        # 진행 중인 분은 다음 조회에서 다시 받음, 장 마감 후에는 전체 확정
+        day.synced     = SESSION_LEN if done else now
+        day.final      = done
+        day.fetched_at = time.monotonic()
+        _debug("MINUTE", f"{code} synced={day.synced} calls={len(cursors)} final={done}")
+
+    def _path(self, key: Tuple[str, int]) -> str:
+        return os.path.join(self.root, f"{key[0]}_{key[1]}.npz")
+
+    def _load(self, key: Tuple[str, int]) -> Optional[MinuteDay]:
+        try:
+            day = MinuteDay.load(self._path(key))
+        except FileNotFoundError:
+            return None
+        self._days[key] = day
+        self._evict()
+        return day
+
+    def _evict(self) -> None:
+        # 오래 전에 올라온 확정일부터 제거 (오늘 진행 중인 날은 유지)
+        while len(self._days) > self._max:
+            old = next((k for k, d in self._days.items() if d.final), None)
+            if old is None:
+                break
+            del self._days[old]
+
+
+# 프로세스 전역 서비스 (fin_router 에서 사용)
+minute_chart = MinuteChartService()
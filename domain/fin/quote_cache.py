@@ -0,0 +1,225 @@
+# File: domain/fin/quote_cache.py
+"""
+시세 TTL 캐시 + 요청 합치기(singleflight)
+────────────────────────────────────────────
+- 종류(kind)별 TTL: 같은 종목은 TTL 동안 업스트림 재호출 없이 응답
+- 같은 키로 동시에 들어온 N 건의 미스는 업스트림 호출 1건으로 합침
+- hit / miss / coalesced 카운터로 TTL 튜닝 근거 제공
+- 장 상태(session)가 주어진 종류는 휴장 중 저장한 값을 다음 장 시작까지(최대 QUOTE_CLOSED_TTL) 유지
+- 업스트림 오류 시 마지막 정상 값을 stale=True 로 계속 응답 (stale-while-error, 최대 QUOTE_STALE_MAX 초)
+  · 실패가 이어지면 QUOTE_RETRY_BASE 부터 2배씩(최대 QUOTE_RETRY_MAX) 재시도 간격을 늘리고 그 사이엔 호출 안 함
+  · 이전 값이 없는 종목(잘못된 코드 등)도 빈 항목으로 재시도 대기를 걸어 요청마다 업스트림을 부르지 않음
+  · 응답에는 항상 as_of(값을 받은 시각, epoch 초)와 stale 포함
+"""
+import asyncio
+import logging
+import time
+
+from dataclasses import dataclass
+from typing      import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.config import Config
+
+from .market_calendar import CLOSED
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+# 종류별 기본 TTL (초)
+QUOTE_TTL_STOCK    = config("QUOTE_TTL_STOCK",    cast=float, default=0.5)
+QUOTE_TTL_INDEX    = config("QUOTE_TTL_INDEX",    cast=float, default=1.0)
+QUOTE_TTL_OVERSEAS = config("QUOTE_TTL_OVERSEAS", cast=float, default=1.0)
+QUOTE_CACHE_MAX    = config("QUOTE_CACHE_MAX",    cast=int,   default=10_000)
+QUOTE_CLOSED_TTL   = config("QUOTE_CLOSED_TTL",   cast=float, default=3600.0)   # 휴장 중 최대 TTL
+QUOTE_STALE_MAX    = config("QUOTE_STALE_MAX",    cast=float, default=600.0)    # 오류 시 이전 값을 내줄 최대 나이
+QUOTE_RETRY_BASE   = config("QUOTE_RETRY_BASE",   cast=float, default=1.0)      # 첫 재시도 대기
+QUOTE_RETRY_MAX    = config("QUOTE_RETRY_MAX",    cast=float, default=30.0)     # 최대 재시도 대기
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+# ────────────────────────── 타입 정의 ──────────────────────────
+Key     = Tuple[str, str]                                   # (종류, 코드)
+Payload = Dict[str, Any]
+Loader  = Callable[[str], Awaitable[Payload]]
+Session = Callable[[str], Tuple[str, float]]                # 코드 → (장 상태, 다음 전환까지 초)
+
+
+@dataclass
+class _Source:
+    """종류별 업스트림 조회 함수, TTL, 카운터"""
+
+    load      : Loader
+    ttl       : float
+    session   : Optional[Session] = None
+    hits      : int = 0
+    misses    : int = 0
+    coalesced : int = 0
+    errors    : int = 0
+    stale     : int = 0
+
+
+@dataclass
+class _Entry:
+    value    : Payload
+    expires  : float
+    as_of    : float                  # 값을 받은 시각 (epoch 초)
+    failures : int   = 0              # 연속 업스트림 실패 수
+    retry_at : float = 0.0            # 이 시각(monotonic) 전에는 재시도하지 않음
+
+
+# ────────────────────────── 캐시 ──────────────────────────
+class QuoteCache:
+    """종류별 TTL 캐시 + 키 단위 singleflight"""
+
+    def __init__(self, max_entries: int = QUOTE_CACHE_MAX) -> None:
+        self._sources  : Dict[str, _Source]       = {}
+        self._entries  : Dict[Key, _Entry]        = {}
+        self._inflight : Dict[Key, asyncio.Task]  = {}
+        self._max      = max_entries
+
+    def register(self, kind: str, load: Loader, ttl: float, session: Optional[Session] = None) -> None:
+        """종류별 조회 함수와 TTL 등록 (session: 휴장 중 TTL 연장용 장 상태 함수)"""
+
+        self._sources[kind] = _Source(load=load, ttl=ttl, session=session)
+        _debug("CACHE", f"source registered kind={kind} ttl={ttl}")
+
+    async def get(self, kind: str, code: str) -> Payload:
+        """
+        캐시 조회 → 미스면 업스트림 호출. 반환: {...값, "as_of", "stale"}
+
+        * TTL 이내 값이 있으면 바로 반환 (hit)
+        * 같은 키의 호출이 진행 중이면 그 결과를 함께 기다림 (coalesced)
+        * 그 외에는 업스트림 1회 호출 후 저장 (miss)
+        * 업스트림이 실패하거나 재시도 대기 중이면 QUOTE_STALE_MAX 이내의 이전 값을 stale=True 로 반환
+          (이전 값이 없거나 너무 오래됐으면 예외, 재시도 대기 중에는 업스트림 호출 없음)
+        """
+        src   = self._sources[kind]
+        key   = (kind, code)
+        entry = self._entries.get(key)
+        now   = time.monotonic()
+
+        if entry is not None and entry.expires > now:
+            src.hits += 1
+            return {**entry.value, "as_of": entry.as_of, "stale": False}
+
+        if entry is not None and entry.retry_at > now:
+            if not self._servable(entry):
+                raise RuntimeError(f"{key} 업스트림 재시도 대기 중")
+            src.stale += 1
+            return {**entry.value, "as_of": entry.as_of, "stale": True}
+
+        task = self._inflight.get(key)
+        if task is not None:
+            src.coalesced += 1
+        else:
+            src.misses += 1
+            task = asyncio.get_running_loop().create_task(self._load(src, key))
+            self._inflight[key] = task
+
+        # 기다리던 쪽이 취소돼도 업스트림 호출은 끝까지 진행
+        try:
+            entry = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            entry = self._entries.get(key)
+            if entry is None or not self._servable(entry):
+                raise
+            src.stale += 1
+            return {**entry.value, "as_of": entry.as_of, "stale": True}
+        return {**entry.value, "as_of": entry.as_of, "stale": False}
+
+    def put(self, kind: str, code: str, value: Payload) -> None:
+        """외부에서 조회한 값 저장 (배치 조회 결과 등)"""
+
+        if len(self._entries) >= self._max:
+            self._prune()
+        src = self._sources[kind]
+        ttl = src.ttl
+        if src.session is not None:
+            state, until = src.session(code)
+            if state == CLOSED:
+                ttl = max(ttl, min(until, QUOTE_CLOSED_TTL))
+        self._entries[(kind, code)] = _Entry(value=value, expires=time.monotonic() + ttl, as_of=time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        """종류별 hit / miss / coalesced / errors / stale 카운터와 TTL"""
+
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "kinds": {
+                kind: {
+                    "ttl"      : src.ttl,
+                    "hits"     : src.hits,
+                    "misses"   : src.misses,
+                    "coalesced": src.coalesced,
+                    "errors"   : src.errors,
+                    "stale"    : src.stale,
+                }
+                for kind, src in self._sources.items()
+            },
+        }
+
+    # ── 내부 ──────────────────────────────────────────
+    async def _load(self, src: _Source, key: Key) -> _Entry:
+        """업스트림 1회 호출 → 성공 시 TTL 과 함께 저장 (실패 시 재시도 대기 설정, 이전 값이 없으면 빈 항목)"""
+
+        try:
+            value = await src.load(key[1])
+        except Exception as e:
+            src.errors += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self._max:
+                    self._prune()
+                # as_of=0 → 오류 시 대신 내줄 값 없음 (대기 중 요청은 바로 예외)
+                entry = self._entries[key] = _Entry(value={}, expires=0.0, as_of=0.0)
+            entry.failures += 1
+            wait = min(QUOTE_RETRY_BASE * 2 ** (entry.failures - 1), QUOTE_RETRY_MAX)
+            entry.retry_at = time.monotonic() + wait
+            _debug("CACHE", f"load failed key={key} failures={entry.failures} retry_in={wait}s: {e}")
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self.put(key[0], key[1], value)
+        _debug("CACHE", f"stored key={key}")
+        return self._entries[key]
+
+    @staticmethod
+    def _servable(entry: _Entry) -> bool:
+        """오류 시 대신 내줄 만큼 최근 값인지"""
+
+        return time.time() - entry.as_of <= QUOTE_STALE_MAX
+
+    def _prune(self) -> None:
+        """오류 시에도 못 쓸 만큼 오래된 항목 제거 (재시도 대기 중은 유지), 그래도 가득 차면 가장 오래된 절반 제거"""
+
+        now = time.monotonic()
+        self._entries = {
+            k: e for k, e in self._entries.items()
+            if e.expires > now or e.retry_at > now or self._servable(e)
+        }
+        if len(self._entries) >= self._max:
+            keep = sorted(self._entries.items(), key=lambda kv: kv[1].expires)
+            self._entries = dict(keep[len(keep) // 2:])
+
+
+# 프로세스 전역 캐시 (fin_router 에서 source 등록)
+quote_cache = QuoteCache()
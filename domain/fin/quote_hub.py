@@ -0,0 +1,303 @@
+# File: domain/fin/quote_hub.py
+"""
+종목별 공유 시세 허브
+────────────────────────────────────────────
+- (종류, 코드) 하나당 업스트림 폴러(asyncio Task) 1개만 유지
+- 첫 구독자가 들어오면 폴러 시작, 마지막 구독자가 나가면 중지
+- 새 구독자는 다음 폴링을 기다리지 않고 마지막 스냅샷을 즉시 수신
+- 구독 단위는 소켓별 Mailbox: 여러 종목을 한 소켓으로 묶어 배치 전송
+- Mailbox 는 종목별 "최신 값 우선": 느린 소켓이 폴러를 막지 않음
+- 값이 바뀐 경우에만 브로드캐스트, 소켓별 DeltaEncoder 가 변경 필드만 전송
+- 실시간 피드가 publish() 로 값을 밀어 넣는 동안에는 REST 폴링을 건너뜀 (폴링은 폴백)
+- 장 상태(session)에 따라 폴링 간격 조절: 정규장은 등록 간격, 동시호가는 QUOTE_AUCTION_INTERVAL,
+  휴장 중에는 종가 스냅샷 1회만 받고 다음 장 시작까지 대기 (최대 QUOTE_CLOSED_RECHECK 마다 재확인)
+"""
+import asyncio
+import logging
+import time
+
+from dataclasses import dataclass, field
+from typing      import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from starlette.config import Config
+
+from .market_calendar import CLOSED, OPEN
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+# 실시간 피드 값이 이 시간(초) 이내에 들어왔으면 폴링 생략
+PUSH_GRACE_SECS = config("QUOTE_PUSH_GRACE_SECS", cast=float, default=3.0)
+
+QUOTE_AUCTION_INTERVAL = config("QUOTE_AUCTION_INTERVAL", cast=float, default=5.0)     # 동시호가 중 폴링 간격
+QUOTE_CLOSED_RECHECK   = config("QUOTE_CLOSED_RECHECK",   cast=float, default=3600.0)  # 휴장 중 최대 대기
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+# ────────────────────────── 타입 정의 ──────────────────────────
+Key     = Tuple[str, str]                                   # (종류, 코드)
+Payload = Dict[str, Any]
+Fetcher = Callable[[str], Awaitable[Optional[Payload]]]
+Watcher = Callable[[str, str, bool], None]                  # (종류, 코드, 활성 여부)
+Session = Callable[[str], Tuple[str, float]]                # 코드 → (장 상태, 다음 전환까지 초)
+
+
+@dataclass
+class _Feed:
+    """종류(kind)별 업스트림 조회 함수와 폴링 간격"""
+
+    fetch    : Fetcher
+    interval : float
+    session  : Optional[Session] = None
+
+
+class Mailbox:
+    """
+    소켓 1개의 수신함.
+
+    * 종목별로 마지막 값만 보관 (아직 전송 안 된 이전 값은 덮어씀)
+    * `drain()` 은 새 값이 올 때까지 대기 후 밀린 값을 한 번에 반환
+    """
+
+    def __init__(self) -> None:
+        self._pending : Dict[Key, Payload] = {}
+        self._event   = asyncio.Event()
+
+    def offer(self, key: Key, payload: Payload) -> None:
+        self._pending[key] = payload
+        self._event.set()
+
+    def discard(self, key: Key) -> None:
+        self._pending.pop(key, None)
+
+    async def drain(self) -> Dict[Key, Payload]:
+        await self._event.wait()
+        self._event.clear()
+        batch, self._pending = self._pending, {}
+        return batch
+
+
+class DeltaEncoder:
+    """
+    소켓 1개의 종목별 전송 상태.
+
+    * 첫 프레임(또는 resync 직후)은 전체 스냅샷: {"seq", "snapshot": true, ...}
+    * 이후에는 직전 전송 값과 달라진 필드만: {"seq", ...변경 필드}
+    * seq 는 종목별로 프레임마다 1씩 증가 → 클라이언트가 누락 감지 후 resync 요청
+    """
+
+    def __init__(self) -> None:
+        self._sent : Dict[Key, Payload] = {}
+        self._seq  : Dict[Key, int]     = {}
+
+    def encode(self, key: Key, payload: Payload) -> Optional[Payload]:
+        """전송할 프레임 (변경 없으면 None)"""
+
+        prev = self._sent.get(key)
+        if prev is None:
+            frame = {"snapshot": True, **payload}
+        else:
+            frame = {k: v for k, v in payload.items() if prev.get(k) != v}
+            if not frame:
+                return None
+
+        seq = self._seq[key] = self._seq.get(key, 0) + 1
+        self._sent[key] = payload
+        return {"seq": seq, **frame}
+
+    def reset(self, key: Key) -> None:
+        """다음 프레임을 전체 스냅샷으로 (seq 는 계속 증가)"""
+
+        self._sent.pop(key, None)
+
+    def forget(self, key: Key) -> None:
+        """구독 해제 시 상태 제거"""
+
+        self._sent.pop(key, None)
+        self._seq.pop(key, None)
+
+
+@dataclass
+class _Topic:
+    """활성 종목 1개의 구독자·폴러·마지막 스냅샷"""
+
+    key         : Key
+    subscribers : Set[Mailbox]            = field(default_factory=set)
+    task        : Optional[asyncio.Task]  = None
+    last        : Optional[Payload]       = None
+    pushed_at   : float                   = 0.0       # 실시간 피드 마지막 수신 시각
+    frozen      : bool                    = False     # 휴장 중 종가 스냅샷 확보 여부
+
+
+# ────────────────────────── 허브 ──────────────────────────
+class QuoteHub:
+    """종목당 폴러 1개 → 다수 구독자 브로드캐스트"""
+
+    def __init__(self) -> None:
+        self._feeds    : Dict[str, _Feed] = {}
+        self._topics   : Dict[Key, _Topic] = {}
+        self._watchers : List[Watcher] = []
+
+    # ── 등록 ──────────────────────────────────────────
+    def register(self, kind: str, fetch: Fetcher, interval: float, session: Optional[Session] = None) -> None:
+        """종류별 조회 함수 등록 (예: "stock" → 국내 종목 현재가). session 이 없으면 항상 interval 로 폴링"""
+
+        self._feeds[kind] = _Feed(fetch=fetch, interval=interval, session=session)
+        _debug("HUB", f"feed registered kind={kind} interval={interval}")
+
+    def watch(self, watcher: Watcher) -> None:
+        """종목 활성/비활성 알림 등록 (실시간 피드가 업스트림 구독을 맞추는 데 사용)"""
+
+        self._watchers.append(watcher)
+        for kind, code in self._topics:
+            watcher(kind, code, True)
+
+    def unwatch(self, watcher: Watcher) -> None:
+        """알림 해제"""
+
+        if watcher in self._watchers:
+            self._watchers.remove(watcher)
+
+    # ── 구독 ──────────────────────────────────────────
+    def subscribe(self, kind: str, code: str, mailbox: Mailbox) -> None:
+        """
+        종목 구독.
+
+        * 해당 종목의 첫 구독자면 폴러 Task 를 시작합니다.
+        * 캐시된 스냅샷이 있으면 Mailbox 에 바로 넣어 줍니다.
+        """
+        if kind not in self._feeds:
+            raise KeyError(f"등록되지 않은 시세 종류: {kind}")
+
+        key   = (kind, code)
+        topic = self._topics.get(key)
+
+        if topic is None:
+            topic = self._topics[key] = _Topic(key=key)
+            topic.task = asyncio.get_running_loop().create_task(self._poll(topic))
+            _debug("HUB", f"poller started key={key}")
+            self._notify(kind, code, True)
+
+        topic.subscribers.add(mailbox)
+        if topic.last is not None:
+            mailbox.offer(key, topic.last)
+
+        _debug("HUB", f"subscribe key={key} subscribers={len(topic.subscribers)}")
+
+    def unsubscribe(self, kind: str, code: str, mailbox: Mailbox) -> None:
+        """구독 해제. 마지막 구독자가 나가면 폴러 Task 중지"""
+
+        key   = (kind, code)
+        topic = self._topics.get(key)
+        if topic is None:
+            return
+
+        topic.subscribers.discard(mailbox)
+        mailbox.discard(key)
+        _debug("HUB", f"unsubscribe key={key} subscribers={len(topic.subscribers)}")
+
+        if not topic.subscribers:
+            del self._topics[key]
+            if topic.task is not None:
+                topic.task.cancel()
+            _debug("HUB", f"poller stopped key={key}")
+            self._notify(kind, code, False)
+
+    def publish(self, kind: str, code: str, payload: Payload) -> None:
+        """외부(실시간 피드)에서 받은 값 브로드캐스트. 구독자 없는 종목은 무시"""
+
+        topic = self._topics.get((kind, code))
+        if topic is None:
+            return
+        topic.pushed_at = time.monotonic()
+        self._broadcast(topic, payload)
+
+    def resync(self, kind: str, code: str, mailbox: Mailbox) -> None:
+        """마지막 스냅샷을 해당 Mailbox 에 다시 넣음 (클라이언트 resync 요청)"""
+
+        topic = self._topics.get((kind, code))
+        if topic is not None and mailbox in topic.subscribers and topic.last is not None:
+            mailbox.offer(topic.key, topic.last)
+
+    # ── 조회 ──────────────────────────────────────────
+    def stats(self) -> Dict[str, int]:
+        """활성 폴러 수 / 전체 구독자 수 / 휴장으로 멈춘 폴러 수"""
+
+        return {
+            "topics"     : len(self._topics),
+            "subscribers": sum(len(t.subscribers) for t in self._topics.values()),
+            "frozen"     : sum(t.frozen for t in self._topics.values()),
+        }
+
+    # ── 폴러 ──────────────────────────────────────────
+    def _notify(self, kind: str, code: str, active: bool) -> None:
+        for watcher in tuple(self._watchers):
+            try:
+                watcher(kind, code, active)
+            except Exception as e:
+                logger.warning(f"[HUB] watcher failed key={(kind, code)}: {e}")
+
+    def _broadcast(self, topic: _Topic, payload: Payload) -> None:
+        """값이 바뀐 경우에만 구독자 전체에 전달"""
+
+        if payload == topic.last:
+            return
+        topic.last = payload
+        for mailbox in tuple(topic.subscribers):
+            mailbox.offer(topic.key, payload)
+
+    async def _poll(self, topic: _Topic) -> None:
+        """업스트림 1회 조회 → 구독자 전체에 브로드캐스트 → 장 상태에 맞는 간격 대기"""
+
+        kind, code = topic.key
+        feed       = self._feeds[kind]
+
+        while True:
+            state, until = feed.session(code) if feed.session else (OPEN, float("inf"))
+            if state != CLOSED:
+                topic.frozen = False
+            elif topic.frozen:
+                # 종가 스냅샷 확보 후에는 다음 장 시작까지 업스트림 호출 없음
+                await asyncio.sleep(max(min(until, QUOTE_CLOSED_RECHECK), 1.0))
+                continue
+
+            interval = feed.interval if state == OPEN else max(feed.interval, QUOTE_AUCTION_INTERVAL)
+            interval = max(min(interval, until), 0.05)          # 상태 전환 시점에 맞춰 깨어남
+
+            # 실시간 피드가 살아 있으면 REST 폴링 생략
+            if time.monotonic() - topic.pushed_at < PUSH_GRACE_SECS:
+                await asyncio.sleep(interval)
+                continue
+
+            try:
+                payload = await feed.fetch(code)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[HUB] fetch failed key={topic.key}: {e}")
+                payload = None
+
+            if payload is not None:
+                self._broadcast(topic, payload)
+                topic.frozen = state == CLOSED
+
+            await asyncio.sleep(interval)
+
+
+# 프로세스 전역 허브 (fin_router 에서 feed 등록)
+quote_hub = QuoteHub()
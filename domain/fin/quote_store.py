@@ -0,0 +1,156 @@
+# File: domain/fin/quote_store.py
+"""
+컬럼형(struct-of-arrays) 시세 저장소
+────────────────────────────────────────────
+- (kind, code) → slot index, 시세는 공용 NumPy 컬럼(last, change, volume, ts)의 slot 위치에 저장
+- 종목당 dict/DataFrame 을 두지 않으므로 수천 종목도 컬럼 4개 크기만 차지
+- 여러 종목 조회는 slot 배열 1개로 fancy indexing → 배치 조회 · 히트맵 · 평가금액을 한 번에 계산
+- 업스트림 관측값(폴링 · 배치 · 실시간 체결)을 그대로 기록, 자체적으로 업스트림을 호출하지 않음
+- 용량이 차면 2배로 늘림 (slot 은 프로세스 수명 동안 고정)
+"""
+import logging
+import time
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from starlette.config import Config
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+QUOTE_STORE_CAPACITY = config("QUOTE_STORE_CAPACITY", cast=int, default=4096)   # 초기 slot 수
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+Key = Tuple[str, str]   # (kind, code)
+
+
+# ────────────────────────── 저장소 ──────────────────────────
+class QuoteStore:
+    """종목별 최신 시세를 slot 단위 NumPy 컬럼으로 보관"""
+
+    COLUMNS = {
+        "last":   np.float64,
+        "change": np.float64,
+        "volume": np.int64,
+        "ts":     np.float64,      # 관측 시각 (epoch 초, 0: 미관측)
+    }
+
+    def __init__(self, capacity: int = QUOTE_STORE_CAPACITY) -> None:
+        self._slots : Dict[Key, int] = {}
+        self._keys  : List[Key]      = []
+        self._cols  = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        self.writes = 0
+        self.reads  = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ── 기록 ──────────────────────────────────────────
+    def put(
+        self,
+        kind   : str,
+        code   : str,
+        price  : float,
+        change : float,
+        volume : Optional[int] = None,
+        ts     : Optional[float] = None,
+    ) -> None:
+        """시세 1건 기록 (volume 이 없으면 이전 값 유지)"""
+
+        i    = self._slot((kind, code))
+        cols = self._cols
+        cols["last"][i]   = price
+        cols["change"][i] = change
+        if volume is not None:
+            cols["volume"][i] = volume
+        cols["ts"][i] = time.time() if ts is None else ts
+        self.writes  += 1
+
+    # ── 조회 ──────────────────────────────────────────
+    def slots(self, keys: Iterable[Key]) -> np.ndarray:
+        """(kind, code) 목록 → slot 배열 (없는 종목은 -1)"""
+
+        get = self._slots.get
+        return np.fromiter((get(k, -1) for k in keys), dtype=np.int64)
+
+    def read(self, keys: Sequence[Key], max_age: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        여러 종목 시세를 컬럼 배열로 한 번에 조회.
+
+        * 반환: {"found": bool[], "last": float[], "change": float[], "volume": int[], "ts": float[]}
+          (입력 순서 그대로, 없는 종목은 found=False · 값 0)
+        * max_age 초보다 오래된 값은 found=False
+        """
+        idx   = self.slots(keys)
+        found = idx >= 0
+        safe  = np.where(found, idx, 0)
+        out   = {name: np.where(found, col[safe], 0) for name, col in self._cols.items()}
+        if max_age is not None:
+            found &= out["ts"] >= time.time() - max_age
+        out["found"] = found
+        self.reads  += 1
+        return out
+
+    def valuate(self, keys: Sequence[Key], qty: Sequence[float]) -> Dict[str, Any]:
+        """보유 수량 × 현재가 평가금액 / 전일 대비 손익 (시세 없는 종목은 missing)"""
+
+        cols  = self.read(keys)
+        q     = np.asarray(qty, dtype=np.float64)
+        found = cols["found"]
+        value = cols["last"] * q
+        return {
+            "value"  : float(value[found].sum()),
+            "change" : float((cols["change"] * q)[found].sum()),
+            "items"  : value.tolist(),
+            "missing": [keys[j] for j in np.flatnonzero(~found).tolist()],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols" : len(self._keys),
+            "capacity": len(self._cols["ts"]),
+            "writes"  : self.writes,
+            "reads"   : self.reads,
+        }
+
+    # ── 내부 ──────────────────────────────────────────
+    def _slot(self, key: Key) -> int:
+        i = self._slots.get(key)
+        if i is not None:
+            return i
+
+        i = len(self._keys)
+        if i == len(self._cols["ts"]):
+            self._grow()
+        self._slots[key] = i
+        self._keys.append(key)
+        return i
+
+    def _grow(self) -> None:
+        size = len(self._cols["ts"]) * 2
+        for name, col in self._cols.items():
+            grown = np.zeros(size, dtype=col.dtype)
+            grown[:len(col)] = col
+            self._cols[name] = grown
+        _debug("STORE", f"grown capacity={size}")
+
+
+# 프로세스 전역 저장소 (fin_router 에서 사용)
+quote_store = QuoteStore()
@@ -0,0 +1,197 @@
+# File: domain/fin/tick_recorder.py
+"""
+틱 기록 · 재생
+────────────────────────────────────────────
+- 시세 파이프라인을 지나는 모든 관측값(폴링 · 배치 · 실시간 체결)을 종목/날짜별 바이너리 파일에 추가
+  · 레코드 32바이트 고정 (ts f8, price f8, change f8, volume i8) → 헤더 없이 이어 붙이기만 함
+  · 경로: TICK_DIR/YYYYMMDD(KST)/{kind}_{code}.bin  (해외 코드의 "|" 는 "_" 로 치환)
+  · O_APPEND fd 에 레코드 단위 write → 읽는 쪽은 flush 없이 바로 볼 수 있음
+- 조회는 np.memmap 으로 파일을 그대로 매핑 (ts 오름차순 → searchsorted 로 구간 자르기)
+- replay: 기록된 하루를 원래 간격 / speed 배속(1~100x)으로 다시 흘려보냄 → KIS 없이 스트리밍 부하 테스트
+"""
+import asyncio
+import logging
+import os
+import time
+
+from collections import OrderedDict
+from datetime    import datetime
+from typing      import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+from starlette.config import Config
+
+from .chart_store import KST
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+TICK_RECORD   = config("TICK_RECORD",   default="true").lower() == "true"
+TICK_DIR      = config("TICK_DIR",      default=os.path.join(os.path.expanduser("~"), ".jandi", "ticks"))
+TICK_MAX_OPEN = config("TICK_MAX_OPEN", cast=int, default=256)   # 동시에 열어 둘 파일 수
+
+REPLAY_MAX_SPEED = 100.0
+
+TICK_DTYPE = np.dtype([
+    ("ts",     "<f8"),      # 관측 시각 (epoch 초)
+    ("price",  "<f8"),
+    ("change", "<f8"),
+    ("volume", "<i8"),      # 누적거래량 (없으면 0)
+])
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+def _ymd(ts: float) -> int:
+    d = datetime.fromtimestamp(ts, KST)
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+# ────────────────────────── 기록기 ──────────────────────────
+class TickRecorder:
+    """(kind, code, 날짜) 별 추가 전용 틱 파일"""
+
+    def __init__(self, root: str = TICK_DIR, max_open: int = TICK_MAX_OPEN, enabled: bool = TICK_RECORD) -> None:
+        self.root    = root
+        self.enabled = enabled
+        self._max    = max_open
+        self._fds    : "OrderedDict[Tuple[str, str, int], int]" = OrderedDict()
+        self.written = 0
+        self.errors  = 0
+
+    def path(self, kind: str, code: str, ymd: int) -> str:
+        return os.path.join(self.root, str(ymd), f"{kind}_{code.replace('|', '_')}.bin")
+
+    def record(
+        self,
+        kind   : str,
+        code   : str,
+        price  : float,
+        change : float,
+        volume : Optional[int] = None,
+        ts     : Optional[float] = None,
+    ) -> None:
+        """틱 1건 추가 (디스크 오류는 경고만 남기고 무시)"""
+
+        if not self.enabled:
+            return
+        ts  = time.time() if ts is None else ts
+        rec = np.array([(ts, price, change, volume or 0)], dtype=TICK_DTYPE)
+        try:
+            os.write(self._fd(kind, code, _ymd(ts)), rec.tobytes())
+            self.written += 1
+        except OSError as e:
+            self.errors += 1
+            logger.warning(f"[TICK] write failed key={(kind, code)}: {e}")
+
+    def close(self) -> None:
+        """열린 파일 모두 닫기 (앱 종료 시)"""
+
+        while self._fds:
+            _, fd = self._fds.popitem()
+            os.close(fd)
+
+    # ── 조회 ──────────────────────────────────────────
+    def read(
+        self,
+        kind  : str,
+        code  : str,
+        ymd   : int,
+        start : Optional[float] = None,
+        end   : Optional[float] = None,
+    ) -> np.ndarray:
+        """기록된 틱 (memmap, 읽기 전용). 파일이 없으면 빈 배열"""
+
+        path = self.path(kind, code, ymd)
+        try:
+            n = os.path.getsize(path) // TICK_DTYPE.itemsize    # 쓰는 중인 마지막 레코드는 제외
+        except FileNotFoundError:
+            n = 0
+        if n == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+
+        ticks = np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(n,))
+        lo = 0 if start is None else int(np.searchsorted(ticks["ts"], start, "left"))
+        hi = n if end   is None else int(np.searchsorted(ticks["ts"], end,   "right"))
+        return ticks[lo:hi]
+
+    def days(self, kind: str, code: str) -> List[int]:
+        """기록이 있는 날짜 목록 (오름차순)"""
+
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(int(d) for d in names if d.isdigit() and os.path.exists(self.path(kind, code, int(d))))
+
+    async def replay(
+        self,
+        kind  : str,
+        code  : str,
+        ymd   : int,
+        speed : float = 1.0,
+        start : Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        기록된 하루 재생 → {"ts", "price", "change", "volume"}.
+
+        * 틱 사이 간격을 speed 배로 줄여 대기 (1 ~ REPLAY_MAX_SPEED)
+        * 대기 기준은 재생 시작 시각 → 전송이 늦어져도 누적 지연이 생기지 않음
+        """
+        speed = min(max(speed, 1.0), REPLAY_MAX_SPEED)
+        ticks = self.read(kind, code, ymd, start=start)
+        if len(ticks) == 0:
+            return
+
+        loop   = asyncio.get_running_loop()
+        t0     = float(ticks["ts"][0])
+        wall0  = loop.time()
+        for ts, price, change, volume in ticks.tolist():
+            delay = wall0 + (ts - t0) / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield {"ts": ts, "price": price, "change": change, "volume": volume}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "open"   : len(self._fds),
+            "written": self.written,
+            "errors" : self.errors,
+        }
+
+    # ── 내부 ──────────────────────────────────────────
+    def _fd(self, kind: str, code: str, ymd: int) -> int:
+        key = (kind, code, ymd)
+        fd  = self._fds.get(key)
+        if fd is not None:
+            self._fds.move_to_end(key)
+            return fd
+
+        path = self.path(kind, code, ymd)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 날짜가 바뀌어 새 파일을 열면 이전 날짜 파일도 자연스럽게 LRU 로 밀려나 닫힘
+        fd = self._fds[key] = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        while len(self._fds) > self._max:
+            _, old = self._fds.popitem(last=False)
+            os.close(old)
+        _debug("TICK", f"opened {path}")
+        return fd
+
+
+# 프로세스 전역 기록기 (fin_router 에서 사용)
+tick_recorder = TickRecorder()
@@ -1,4 +1,16 @@
 # File: domain/open_api/codef_client.py
+"""
+CODEF API 클라이언트 (계좌 상세 조회 · 야간 동기화 공용)
+────────────────────────────────────────────
+- 프로세스 공용 httpx.AsyncClient (keep-alive 커넥션 풀, 선택적 HTTP/2) → 호출마다 TCP · TLS 재연결 없음
+- 풀은 이벤트 루프에 묶임: 앱은 lifespan, Celery 워커는 프로세스 전용 루프에서 재사용 후 aclose()
+- 토큰 발급은 TokenManager 스레드에서 실행되므로 별도 동기 httpx.Client 풀 사용 (발급마다 TLS 재연결 없음)
+- client-credentials 토큰은 TokenManager 로 관리: 동시 요청이 몰려도 발급 1건, 만료 전 백그라운드 갱신,
+  프로세스(uvicorn 워커 · Celery 워커) 간에는 공유 토큰 저장소(파일/Redis)로 같은 토큰 사용
+- RSA 암호화 · FAST 거래내역 조회
+"""
+import asyncio
+import threading
 import time
 import json
 import base64
@@ -10,8 +22,9 @@ from starlette.config import Config
 from Crypto.PublicKey import RSA
 from Crypto.Cipher    import PKCS1_v1_5
 
-from models         import Account, InternetBanking
-from ..utils.crypto import decrypt  # Fernet 복호화
+from models              import Account, InternetBanking
+from ..utils.crypto      import decrypt  # Fernet 복호화
+from ..utils.token_store import TokenManager, TokenRecord
 
 
 # ────────────────────────── 설정값 & 로깅 ──────────────────────────
@@ -43,13 +56,83 @@ CSECRET      = config("CODEF_CLIENT_SECRET" , default="")
 PUBKEY       = config("CODEF_PUBLIC_KEY"    , default="")
 CONNECTED_ID = config("CODEF_CONNECTED_ID"  , default="")
 
+# 커넥션 풀 설정
+CODEF_HTTP2           = config("CODEF_HTTP2"          , default="true").lower() == "true"
+CODEF_MAX_CONNECTIONS = config("CODEF_MAX_CONNECTIONS", cast=int,   default=20)
+CODEF_MAX_KEEPALIVE   = config("CODEF_MAX_KEEPALIVE"  , cast=int,   default=10)
+CODEF_KEEPALIVE_SECS  = config("CODEF_KEEPALIVE_SECS" , cast=float, default=60.0)
+CODEF_TIMEOUT_SECS    = config("CODEF_TIMEOUT_SECS"   , cast=float, default=30.0)
+
+# 토큰: 응답에 expires_in 이 없으면 50분 유효로 간주, 만료 10분 전부터 선제 갱신
+CODEF_TOKEN_TTL_SECS     = config("CODEF_TOKEN_TTL_SECS"    , cast=float, default=50 * 60.0)
+CODEF_TOKEN_REFRESH_SECS = config("CODEF_TOKEN_REFRESH_SECS", cast=float, default=10 * 60.0)
+
 # RSA 암호 객체 (공개키)
 _rsa_cipher = PKCS1_v1_5.new(
     RSA.import_key(base64.b64decode(PUBKEY))
 )
 
-# 메모리 내 액세스 토큰 캐시
-_TOKEN = {"value": "", "exp": 0}
+_client      : httpx.AsyncClient | None        = None
+_client_loop : asyncio.AbstractEventLoop | None = None
+
+_token_client      : httpx.Client | None = None     # 토큰 발급 전용 (동기, 스레드 안전)
+_token_client_lock = threading.Lock()
+
+
+# ───────────────────────────────────────────────────────────────────────────
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  (httpx[http2] 선택 의존성)
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에 묶인 공용 AsyncClient 반환 (없으면 생성)"""
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2   = CODEF_HTTP2 and _http2_available(),
+            timeout = CODEF_TIMEOUT_SECS,
+            limits  = httpx.Limits(
+                max_connections           = CODEF_MAX_CONNECTIONS,
+                max_keepalive_connections = CODEF_MAX_KEEPALIVE,
+                keepalive_expiry          = CODEF_KEEPALIVE_SECS,
+            ),
+        )
+        _client_loop = loop
+        _debug("HTTP", "pooled client created")
+    return _client
+
+
+def _token_http() -> httpx.Client:
+    """토큰 발급용 동기 Client (프로세스 공용, 없으면 생성)"""
+    global _token_client
+
+    with _token_client_lock:
+        if _token_client is None or _token_client.is_closed:
+            _token_client = httpx.Client(
+                timeout = 15,
+                limits  = httpx.Limits(max_connections = 2, keepalive_expiry = CODEF_KEEPALIVE_SECS),
+            )
+        return _token_client
+
+
+async def aclose() -> None:
+    """공용 AsyncClient · 토큰 발급 Client 종료 (앱 lifespan · 워커 프로세스 종료 시 호출)"""
+    global _client, _client_loop, _token_client
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client, _client_loop = None, None
+
+    with _token_client_lock:
+        if _token_client is not None:
+            _token_client.close()
+        _token_client = None
 
 
 # ───────────────────────────────────────────────────────────────────────────
@@ -63,9 +146,9 @@ def rsa_encrypt(plain: str) -> str:
 
 
 # ───────────────────────────────────────────────────────────────────────────
-async def _issue_token() -> str:
-    """new 토큰 발급 (client_credentials)."""
-    
+def _issue_token() -> TokenRecord:
+    """new 토큰 발급 (client_credentials). TokenManager 가 프로세스 간 1건만 호출"""
+
     basic_auth = base64.b64encode(f"{CID}:{CSECRET}".encode()).decode()
     headers    = {
         "Authorization": f"Basic {basic_auth}",
@@ -77,26 +160,28 @@ async def _issue_token() -> str:
     }
     _debug("TOKEN", "requesting new token")
 
-    async with httpx.AsyncClient(timeout = 15) as client:
-        resp = await client.post(TOKEN_URL, headers = headers, data = data)
-
+    # 발급은 TokenManager 스레드에서 실행 → 동기 Client (keep-alive 재사용)
+    resp = _token_http().post(TOKEN_URL, headers = headers, data = data)
     resp.raise_for_status()
-    token = resp.json().get("access_token", "")
-    _TOKEN.update(value = token, exp = time.time() + 50 * 60)  # 50분 유효
-    _debug("TOKEN", f"issued token expires at {_TOKEN['exp']}")
-    return token
 
+    body    = resp.json()
+    ttl     = float(body.get("expires_in") or CODEF_TOKEN_TTL_SECS)
+    record  = TokenRecord(token = body.get("access_token", ""), expires_at = time.time() + ttl)
+    _debug("TOKEN", f"issued token expires at {record.expires_at}")
+    return record
 
-# ───────────────────────────────────────────────────────────────────────────
-async def _get_token() -> str:
-    """유효한 토큰 반환, 없으면 발급."""
 
-    if time.time() < _TOKEN["exp"]:
-        _debug("TOKEN", "using cached token")
-        return _TOKEN["value"]
+_token = TokenManager(
+    f"codef-{CID[:8]}",
+    _issue_token,
+    refresh_secs = CODEF_TOKEN_REFRESH_SECS,
+)
+
+
+async def _get_token() -> str:
+    """유효한 토큰 반환 (메모리 → 공유 저장소 → 발급, 동시 발급은 1건으로 합침)"""
 
-    _debug("TOKEN", "cached token expired or missing")
-    return await _issue_token()
+    return await _token.aget()
 
 
 # ───────────────────────────────────────────────────────────────────────────
@@ -141,8 +226,7 @@ async def fetch_transactions(
         }
         payload = urllib.parse.quote(json.dumps(body, ensure_ascii = False))
         _debug("FETCH", f"posting to {FAST_URL} with token prefix {token[:6]}...")
-        async with httpx.AsyncClient(timeout = 30) as client:
-            return await client.post(FAST_URL, headers = headers, data = payload)
+        return await get_client().post(FAST_URL, headers = headers, data = payload)
 
     # ── API 호출 ────────────────────────────────────────
     token    = await _get_token()
@@ -151,7 +235,8 @@ async def fetch_transactions(
     # 토큰 만료 시 재발급 후 재시도
     if response.status_code == 401:
         _debug("FETCH", "token expired, reissuing and retrying")
-        token    = await _issue_token()
+        _token.invalidate()
+        token    = await _get_token()
         response = await _post(token)
 
     _debug("FETCH", f"response status {response.status_code}")
@@ -0,0 +1,301 @@
+# File: domain/utils/token_store.py
+"""
+프로세스 간 공유 토큰 저장소 + 토큰 관리자
+────────────────────────────────────────────
+- TokenStore      : 토큰 레코드 get / set + 프로세스 간 잠금
+    * FileTokenStore  : 로컬 개발용 (JSON 파일 + fcntl 잠금)
+    * RedisTokenStore : 운영용 (GET/SET PX + SET NX 잠금, Redis 호환 서버)
+- TokenManager    : 메모리 캐시 → 만료 전 선제 갱신 → 발급은 항상 1건만
+    * 핫패스(get)는 메모리만 읽음, 갱신 구간에 들어오면 백그라운드 스레드가 갱신
+    * aget(): 비동기 호출자용 — 발급이 필요할 때만 스레드에서 대기 (이벤트 루프를 막지 않음)
+    * 발급 전 저장소를 다시 확인 → 다른 프로세스가 먼저 발급했으면 그 토큰 사용
+
+저장소 선택: TOKEN_STORE_URL=redis://... 이면 Redis, 아니면 TOKEN_STORE_DIR 의 파일
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from dataclasses import dataclass
+from typing      import Callable, Iterator, Optional
+
+from starlette.config import Config
+
+
+# ────────────────────────── 설정값 & 로깅 ──────────────────────────
+config     = Config(".env")
+DEBUG_MODE = config("DEBUG_MODE", default="false").lower() == "true"
+
+TOKEN_STORE_URL    = config("TOKEN_STORE_URL",    default="")
+TOKEN_STORE_DIR    = config("TOKEN_STORE_DIR",    default=os.path.join(os.path.expanduser("~"), ".jandi", "tokens"))
+TOKEN_LOCK_SECS    = config("TOKEN_LOCK_SECS",    cast=float, default=30.0)     # 발급 잠금 최대 보유 시간
+TOKEN_REFRESH_SECS = config("TOKEN_REFRESH_SECS", cast=float, default=3600.0)   # 만료 이 시간 전부터 선제 갱신
+
+_log_level = logging.DEBUG if DEBUG_MODE else logging.WARNING
+logging.basicConfig(
+    level  = _log_level,
+    format = "[%(levelname)s][%(name)s] %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _debug(category: str, message: str) -> None:
+    """일관된 형식의 디버그 로그 기록"""
+
+    if DEBUG_MODE:
+        logger.debug(f"[{category}] {message}")
+
+
+# ────────────────────────── 레코드 ──────────────────────────
+@dataclass(frozen=True)
+class TokenRecord:
+    """토큰 값과 만료 시각 · 발급 시각 (epoch 초, 발급 시각은 모르면 None)"""
+
+    token      : str
+    expires_at : float
+    issued_at  : Optional[float] = None
+
+    def ttl(self, now: Optional[float] = None) -> float:
+        return self.expires_at - (time.time() if now is None else now)
+
+    def lifetime(self) -> Optional[float]:
+        """발급 시 유효 기간 (초)"""
+        return None if self.issued_at is None else self.expires_at - self.issued_at
+
+    def to_json(self) -> str:
+        return json.dumps({"token": self.token, "expires_at": self.expires_at, "issued_at": self.issued_at})
+
+    @classmethod
+    def from_json(cls, raw) -> Optional["TokenRecord"]:
+        try:
+            d = json.loads(raw)
+            issued_at = d.get("issued_at")
+            return cls(
+                token      = d["token"],
+                expires_at = float(d["expires_at"]),
+                issued_at  = None if issued_at is None else float(issued_at),
+            )
+        except (TypeError, ValueError, KeyError, AttributeError):
+            return None
+
+
+# ────────────────────────── 저장소 ──────────────────────────
+class TokenStore:
+    """토큰 저장소 인터페이스"""
+
+    def get(self, name: str) -> Optional[TokenRecord]:
+        raise NotImplementedError
+
+    def set(self, name: str, record: TokenRecord) -> None:
+        raise NotImplementedError
+
+    def lock(self, name: str, timeout: float = TOKEN_LOCK_SECS) -> "contextlib.AbstractContextManager":
+        """발급 구간 프로세스 간 잠금"""
+        raise NotImplementedError
+
+
+class FileTokenStore(TokenStore):
+    """디렉터리 하나에 이름별 JSON 파일, 잠금은 fcntl.flock (같은 호스트 프로세스 간)"""
+
+    def __init__(self, root: str = TOKEN_STORE_DIR) -> None:
+        self.root = root
+        os.makedirs(root, mode=0o700, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, f"{name}.json")
+
+    def get(self, name: str) -> Optional[TokenRecord]:
+        try:
+            with open(self._path(name), encoding="utf-8") as f:
+                return TokenRecord.from_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    def set(self, name: str, record: TokenRecord) -> None:
+        # 임시 파일에 쓴 뒤 rename → 읽는 쪽이 반쯤 쓴 파일을 보지 않음
+        path = self._path(name)
+        tmp  = f"{path}.{os.getpid()}.tmp"
+        fd   = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(record.to_json())
+        os.replace(tmp, path)
+
+    @contextlib.contextmanager
+    def lock(self, name: str, timeout: float = TOKEN_LOCK_SECS) -> Iterator[None]:
+        import fcntl
+
+        deadline = time.monotonic() + timeout
+        with open(os.path.join(self.root, f"{name}.lock"), "a") as f:
+            while True:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"token lock timeout: {name}")
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RedisTokenStore(TokenStore):
+    """Redis 호환 서버 (키: <prefix><name>, 잠금: <prefix><name>:lock)"""
+
+    # 내 잠금일 때만 해제
+    _UNLOCK = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str = TOKEN_STORE_URL, prefix: str = "jandi:token:") -> None:
+        import redis
+
+        self._r     = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, name: str) -> Optional[TokenRecord]:
+        raw = self._r.get(self.prefix + name)
+        return TokenRecord.from_json(raw) if raw else None
+
+    def set(self, name: str, record: TokenRecord) -> None:
+        ttl_ms = max(int(record.ttl() * 1000), 1)
+        self._r.set(self.prefix + name, record.to_json(), px=ttl_ms)
+
+    @contextlib.contextmanager
+    def lock(self, name: str, timeout: float = TOKEN_LOCK_SECS) -> Iterator[None]:
+        key      = f"{self.prefix}{name}:lock"
+        owner    = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        while not self._r.set(key, owner, nx=True, px=int(timeout * 1000)):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"token lock timeout: {name}")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            self._r.eval(self._UNLOCK, 1, key, owner)
+
+
+def default_store() -> TokenStore:
+    """TOKEN_STORE_URL 이 redis 계열이면 Redis, 아니면 파일 저장소"""
+
+    if TOKEN_STORE_URL.startswith(("redis://", "rediss://", "unix://")):
+        return RedisTokenStore(TOKEN_STORE_URL)
+    return FileTokenStore(TOKEN_STORE_DIR)
+
+
+# ────────────────────────── 토큰 관리자 ──────────────────────────
+Issuer = Callable[[], TokenRecord]
+
+
+class TokenManager:
+    """
+    공유 저장소 기반 토큰 관리자.
+
+    * get()        : 메모리 토큰 반환, 만료 임박이면 백그라운드 갱신 예약
+    * aget()       : get() 의 비동기 버전 (동시 호출이 몰려도 발급은 1건)
+    * 만료/없음     : 호출 스레드가 갱신 (프로세스 내 1건, 프로세스 간 저장소 잠금으로 1건)
+    * refresh_secs : 만료 이 시간 전부터 선제 갱신 (발급 유효 기간의 절반을 넘지 않음 → 짧은 토큰도 매번 재발급하지 않음)
+    """
+
+    def __init__(
+        self,
+        name         : str,
+        issue        : Issuer,
+        store        : Optional[TokenStore] = None,
+        refresh_secs : float = TOKEN_REFRESH_SECS,
+    ) -> None:
+        self.name         = name
+        self.issue        = issue
+        self.store        = store or default_store()
+        self.refresh_secs = refresh_secs
+        self._record      : Optional[TokenRecord] = None
+        self._lock        = threading.Lock()
+        self._refreshing  = False
+        self._retry_at    = 0.0                   # 선제 갱신 실패 후 재시도 시각 (monotonic)
+        self._rejected    : Optional[str] = None  # 서버가 거부한 토큰 (저장소에 남아 있어도 재사용 안 함)
+        self.issued       = 0                     # 이 프로세스가 실제 발급한 횟수
+        self.adopted      = 0                     # 저장소에서 가져온 횟수
+
+    def get(self) -> str:
+        rec = self._record
+        now = time.time()
+        if rec is not None and rec.ttl(now) > 0:
+            if rec.ttl(now) <= self._window(rec):
+                self._refresh_background()
+            return rec.token
+        return self._refresh().token
+
+    async def aget(self) -> str:
+        rec = self._record
+        now = time.time()
+        if rec is not None and rec.ttl(now) > 0:
+            if rec.ttl(now) <= self._window(rec):
+                self._refresh_background()
+            return rec.token
+        return (await asyncio.to_thread(self._refresh)).token
+
+    def invalidate(self) -> None:
+        """서버가 토큰을 거부했을 때 (다음 get 에서 새로 발급)"""
+
+        if self._record is not None:
+            self._rejected = self._record.token
+        self._record = None
+
+    # ── 내부 ──────────────────────────────────────────
+    def _window(self, rec: TokenRecord) -> float:
+        """선제 갱신 시작 시점 (만료 전 초) = min(refresh_secs, 발급 유효 기간 / 2)"""
+        lifetime = rec.lifetime()
+        return self.refresh_secs if lifetime is None else min(self.refresh_secs, lifetime / 2)
+
+    def _fresh(self, rec: Optional[TokenRecord]) -> bool:
+        return rec is not None and rec.token != self._rejected and rec.ttl() > self._window(rec)
+
+    def _refresh(self) -> TokenRecord:
+        """프로세스 내 singleflight → 저장소 확인 → 저장소 잠금 → 재확인 → 발급"""
+
+        with self._lock:
+            if self._fresh(self._record):
+                return self._record
+
+            rec = self.store.get(self.name)
+            if not self._fresh(rec):
+                with self.store.lock(self.name):
+                    rec = self.store.get(self.name)
+                    if not self._fresh(rec):
+                        rec = self.issue()
+                        if rec.issued_at is None:
+                            rec = TokenRecord(rec.token, rec.expires_at, time.time())
+                        self.store.set(self.name, rec)
+                        self.issued += 1
+                        _debug("TOKEN", f"issued name={self.name} ttl={rec.ttl():.0f}s")
+                        self._record = rec
+                        return rec
+
+            self.adopted += 1
+            _debug("TOKEN", f"adopted name={self.name} ttl={rec.ttl():.0f}s")
+            self._record = rec
+            return rec
+
+    def _refresh_background(self) -> None:
+        """선제 갱신 (진행 중이면 무시, 실패하면 기존 토큰으로 계속)"""
+
+        with self._lock:
+            if self._refreshing or time.monotonic() < self._retry_at:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self._refresh()
+            except Exception as e:
+                self._retry_at = time.monotonic() + 30.0
+                logger.warning(f"token refresh failed name={self.name}: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, name=f"token-refresh-{self.name}", daemon=True).start()
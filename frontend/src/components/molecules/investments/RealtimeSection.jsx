@@ -9,6 +9,7 @@ export default function RealtimeSection() {
   const [symbol, setSymbol] = useState("005930");
   const [priceData, setPriceData] = useState(null);
   const wsRef = useRef(null);
+  const seqRef = useRef(0);
   const baseUrl = useSelector((state) => state.FIN_SERVER_URL);
 
   // 컴포넌트 언마운트 시 WS 닫기
@@ -26,7 +27,13 @@ export default function RealtimeSection() {
     wsRef.current = ws;
 
     ws.onopen = () => ws.send(symbol); // 연결 시 심볼 전송
-    ws.onmessage = (e) => setPriceData(JSON.parse(e.data)); // 메시지 수신 처리
+    // 스냅샷 이후에는 변경 필드만 오므로 직전 값에 병합, seq 누락 시 resync 요청
+    ws.onmessage = (e) => {
+      const msg = JSON.parse(e.data);
+      if (!msg.snapshot && msg.seq !== seqRef.current + 1) ws.send("resync");
+      seqRef.current = msg.seq;
+      setPriceData((prev) => (msg.snapshot || !prev ? msg : { ...prev, ...msg }));
+    };
     ws.onerror = () => setPriceData({ error: "WebSocket error" }); // 에러 처리
   };
 
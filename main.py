@@ -1,6 +1,7 @@
 # File: main.py 
 import logging
 
+from contextlib                import asynccontextmanager
 from fastapi                   import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses       import FileResponse
@@ -14,6 +15,8 @@ from domain.fin          import fin_router
 from domain.account      import account_router
 from domain.spare_change import spare_change_router
 from domain.debug        import debug_router
+from domain.fin.kis      import kis_async
+from domain.open_api     import codef_client
 
 
 # ────────────────────────── 설정값 ────────────────────────────
@@ -37,7 +40,21 @@ def _debug(category: str, message: str) -> None:
         logger.debug(f"[{category}] {message}")
 
 
-app = FastAPI()
+# ────────────────────────── Lifespan ──────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 실시간 피드 시작, 종료 시 피드 · 틱 기록 파일 · 공용 HTTP 커넥션 풀(KIS · CODEF) 정리"""
+
+    await fin_router.start_realtime_feed()
+    yield
+    await fin_router.stop_realtime_feed()
+    fin_router.tick_recorder.close()
+    await kis_async.aclose()
+    await codef_client.aclose()
+    _debug("LIFESPAN", "KIS / CODEF async clients closed")
+
+
+app = FastAPI(lifespan=lifespan)
 logger.info("================== FastAPI app initializing ==================")
 logger.debug(f"[FastAPI Init] DEBUG_MODE = {DEBUG_MODE}")
 
@@ -68,14 +85,27 @@ _debug("CORS", f"origins set: {origins}")
 WS_DESCRIPTIONS = {
     "/ws/investments": """
 클라이언트 ↔ 서버 실시간 시세 스트림  
-**보내기**: 종목코드 6자리 텍스트 (예: `005930`)  
-**받기** (0.5초 간격):
+**보내기**: 종목코드 6자리 텍스트 (예: `005930`), 이후 누락 감지 시 `resync`  
+**받기**: 구독 직후 전체 스냅샷, 이후 값이 바뀐 필드만 (`seq` 는 프레임마다 1씩 증가)
 
 ```json
-{
-    "price": 84100,
-    "change": -600
-}
+{"seq": 1, "snapshot": true, "price": 84100, "change": -600}
+{"seq": 2, "price": 84200, "change": -500}
+```""",
+    "/api/fin/ws/market": """
+한 소켓으로 여러 종목(국내 종목 · 국내 지수 · 해외 종목)을 구독하는 멀티플렉스 스트림  
+**보내기**:
+
+```json
+{"action": "subscribe", "items": [{"type": "stock", "code": "005930"},
+                                  {"type": "index", "code": "0001"},
+                                  {"type": "overseas", "code": "AAPL|NAS"}]}
+```
+`"action": "unsubscribe"` 로 같은 형식의 구독 해제, `"action": "resync"` 로 스냅샷 재요청  
+**받기** (0.25초 단위 배치, 종목별 `seq` · 스냅샷 이후 변경 필드만):
+
+```json
+{"type": "quotes", "data": [{"type": "stock", "code": "005930", "seq": 1, "snapshot": true, "price": 84100, "change": -600}]}
 ```""",
     # 필요하다면 다른 WebSocket 경로도 여기에 추가…
 }
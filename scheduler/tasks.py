@@ -2,17 +2,24 @@
 import logging
 import asyncio
 
+import time as _time
+
 from datetime import datetime, timedelta, timezone, time
 from decimal  import Decimal
 from math     import ceil
-from typing   import Iterable, Optional, List
+from typing   import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy.orm   import Session
-from starlette.config import Config
+from celery                         import chord
+from celery.signals                 import worker_process_init, worker_process_shutdown
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite     import insert as sqlite_insert
+from sqlalchemy.orm                 import Session
+from starlette.config               import Config
 
 from scheduler.celery_app         import celery_app
 from database                     import SyncSessionLocal
 from models                       import User, Account, Transaction, SpareChange, InternetBanking
+from domain.open_api              import codef_client
 from domain.open_api.codef_client import fetch_transactions
 
 
@@ -22,6 +29,16 @@ KST            = timezone(timedelta(hours=9))
 WITHDRAW_TYPES = {"withdraw", "payment"}  # 잔돈 대상 거래 유형
 DEFAULT_UNIT   = 100                      # user.round_up_unit 가 비정상일 때 사용
 DEBUG_MODE     = config('DEBUG_MODE', default="false").lower() == "true"
+
+# CODEF 동시 조회 한도 (전체 / 기관별)
+SYNC_CONCURRENCY     = config('SYNC_CONCURRENCY'    , cast=int, default=16)
+SYNC_PER_INSTITUTION = config('SYNC_PER_INSTITUTION', cast=int, default=4)
+
+# 야간 동기화 샤드 수 (user_id % SYNC_SHARDS 로 분할, 샤드마다 서브태스크 1개)
+SYNC_SHARDS          = config('SYNC_SHARDS'         , cast=int, default=8)
+
+# 거래 일괄 INSERT 단위 (버퍼가 이만큼 차면 DB 반영)
+SYNC_WRITE_BATCH     = config('SYNC_WRITE_BATCH'    , cast=int, default=1000)
 # ──────────────────────────────────────────────────────────────
 
 
@@ -107,36 +124,59 @@ def _find_accounts(
 
 
 # ────────────────────────── util: async → sync ──────────────────────────
+# 워커 프로세스당 이벤트 루프 1개를 계속 사용 → CODEF 공용 커넥션 풀이 태스크 사이에서도 유지됨
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    """워커 프로세스 전용 이벤트 루프 (없거나 닫혔으면 생성)"""
+
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+@worker_process_init.connect
+def _init_worker_loop(**_) -> None:
+    """fork 된 워커 프로세스마다 새 루프 생성 (부모 루프 · 커넥션은 물려받지 않음)"""
+
+    global _loop
+    _loop = None
+    _worker_loop()
+    _debug("WORKER", "event loop ready")
+
+
+@worker_process_shutdown.connect
+def _close_worker_loop(**_) -> None:
+    """워커 종료 시 CODEF 커넥션 풀과 루프 정리"""
+
+    if _loop is None or _loop.is_closed():
+        return
+    _loop.run_until_complete(codef_client.aclose())
+    _loop.close()
+    _debug("WORKER", "event loop closed")
+
+
 def _run_async(coro):
     """Celery 워커 내부에서 비동기 함수를 동기 방식으로 호출"""
 
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        return asyncio.run(coro)
-
-    return loop.run_until_complete(coro)
+    return _worker_loop().run_until_complete(coro)
 # ─────────────────────────────────────────────────────────────────────────
 
 
 # ────────────────────────── 트랜잭션 & 잔돈 처리 ─────────────────────────
-def _upsert_tx_and_spare_change(
-    db      : Session,
-    user    : User,
-    account : Account,
-    item    : dict,
-) -> None:
-    """
-    * Transaction 없으면 INSERT  
-    * 출금 거래(resAccountOut)면 SpareChange 계산·삽입
-    """
+def _tx_row(user: User, account: Account, item: dict) -> dict:
+    """CODEF 거래 1건 → Transaction INSERT 행"""
+
     # 1) 거래 ID: "계좌ID-YYYYMMDDHHMMSS"
     tx_id = f"{account.id}-{item['resAccountTrDate']}{item['resAccountTrTime']}"
 
     # 2) 금액/거래 타입 판단
     out_amt = item.get("resAccountOut") or "0"
     in_amt  = item.get("resAccountIn")  or "0"
-    
+
     if out_amt != "0":
         amount  = Decimal(out_amt)
         tx_type = "withdraw"      # 출금 거래
@@ -148,85 +188,233 @@ def _upsert_tx_and_spare_change(
     descs = [item.get(f"resAccountDesc{i}") for i in (1, 2, 3, 4)]
     memo  = ";".join(filter(None, descs)) or None
 
-    _debug("TX", f"{tx_id} {tx_type.upper()} amount={amount}")
-
-    # 4) Transaction UPSERT
-    if db.get(Transaction, tx_id) is None:
-        db.add(Transaction(
-            id         = tx_id,
-            user_id    = user.id,
-            account_id = account.id,
-            amount     = amount,
-            tx_type    = tx_type,
-            memo       = memo,
-        ))
-        db.flush()  # FK 확인 및 ID 고정
-        _debug("TX", f"INSERT new Transaction {tx_id}")
-
-    # 5) 출금 → SpareChange
-    if tx_type in WITHDRAW_TYPES:
-        sc_pk = (user.id, tx_id)
-        if db.get(SpareChange, sc_pk) is None:
-            unit     = _get_unit(user)
-            raw_diff = Decimal(ceil(amount / unit)) * unit - amount
-            round_up = raw_diff.quantize(Decimal("0.01"))
-            
-            db.add(SpareChange(
-                user_id  = user.id,
-                tx_id    = tx_id,
-                round_up = round_up,
-            ))
-            
-            _debug("SC", f"user_id={user.id} tx_id={tx_id} round_up={round_up}")
+    return {
+        "id"         : tx_id,
+        "user_id"    : user.id,
+        "account_id" : account.id,
+        "amount"     : amount,
+        "tx_type"    : tx_type,
+        "memo"       : memo,
+    }
 
 
-# ─────────────────────────── Celery Task ──────────────────────
-@celery_app.task(name="tasks.sync_transactions")
-def sync_transactions() -> str:
-    """전 계좌 거래내역 동기화 + 잔돈 계산"""
+def _round_up(amount: Decimal, unit: int) -> Decimal:
+    """unit 단위 올림 잔돈 (소수 둘째 자리)"""
 
-    db : Session = SyncSessionLocal()
-    start, end   = _date_range_yesterday()
+    raw_diff = Decimal(ceil(amount / unit)) * unit - amount
+    return raw_diff.quantize(Decimal("0.01"))
+
+
+# 방언별 INSERT (ON CONFLICT DO NOTHING · RETURNING 지원)
+_DIALECT_INSERT = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _insert_ignore(db: Session, model, rows: List[dict], key) -> List:
+    """INSERT ... ON CONFLICT DO NOTHING RETURNING key → 실제로 들어간 행의 key 목록"""
+
+    if not rows:
+        return []
+    dialect = db.get_bind().dialect.name
+    insert  = _DIALECT_INSERT.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"bulk insert unsupported for dialect={dialect}")
 
-    _debug("TASK", "=== START sync_transactions ===")
+    stmt = insert(model).on_conflict_do_nothing().returning(key)
+    return db.execute(stmt, rows).scalars().all()
+
+
+def _write_batch(db: Session, rows: List[dict], units: Dict[int, int]) -> int:
+    """
+    * Transaction 일괄 INSERT (이미 있는 거래는 건너뜀)  
+    * 이번에 새로 들어간 출금 거래만 SpareChange 계산·일괄 INSERT  
+    * 반환: 새로 들어간 거래 수
+    """
+    inserted = set(_insert_ignore(db, Transaction, rows, Transaction.id))
+    spare    = [
+        {
+            "user_id"  : row["user_id"],
+            "tx_id"    : row["id"],
+            "round_up" : _round_up(row["amount"], units[row["user_id"]]),
+        }
+        for row in rows
+        if row["id"] in inserted and row["tx_type"] in WITHDRAW_TYPES
+    ]
+    _insert_ignore(db, SpareChange, spare, SpareChange.tx_id)
+
+    _debug("TX", f"batch rows={len(rows)} inserted={len(inserted)} spare_changes={len(spare)}")
+    return len(inserted)
+
+
+# ────────────────────────── 계좌 동시 조회 ──────────────────────────
+Job = Tuple[User, Account, InternetBanking]
+
+
+def _collect_jobs(db: Session, shard: int = 0, shards: int = 1) -> List[Job]:
+    """
+    (사용자, 계좌, 인터넷뱅킹) 조회 대상 목록 — 인터넷뱅킹 정보가 없는 계좌는 제외
+    ────────────────────────────────────────────────
+    • user_id % shards == shard 인 사용자만 (한 사용자의 계좌는 항상 같은 샤드)
+    """
+    jobs: List[Job] = []
+    q = db.query(User)
+    if shards > 1:
+        q = q.filter(User.id % shards == shard)
+    users: Iterable[User] = q.all()
+    _debug("TASK", f"shard={shard}/{shards} users={len(users)}")
+
+    for user in users:
+        for acc in _find_accounts(db, user):
+            ib = _find_ib(db, user, acc)
+            if ib is None:
+                logger.warning(f"[TASK] skip account_id={acc.id}: missing InternetBanking record")
+                continue
+            jobs.append((user, acc, ib))
+    return jobs
+
+
+async def _fetch_and_write(
+    db    : Session,
+    jobs  : List[Job],
+    start : str,
+    end   : str,
+) -> Dict[str, int]:
+    """
+    계좌별 CODEF 조회를 동시에 실행하고, 도착하는 순서대로 한 곳에서 DB 반영
+    ────────────────────────────────────────────────
+    • 전체 동시 조회는 SYNC_CONCURRENCY, 같은 기관은 SYNC_PER_INSTITUTION 까지  
+    • DB 쓰기는 이 코루틴(단일 writer)만 수행 → 세션을 여러 곳에서 건드리지 않음  
+      (일괄 INSERT 는 워커 스레드에서 실행 → 쓰는 동안에도 진행 중인 CODEF 조회가 멈추지 않음, 끝날 때까지 대기)  
+    • 조회에 실패한 계좌는 경고만 남기고 건너뜀 (다른 계좌 결과는 그대로 반영)  
+    • 거래는 버퍼에 모았다가 SYNC_WRITE_BATCH 건마다 일괄 INSERT
+    """
+    limit    = asyncio.Semaphore(SYNC_CONCURRENCY)
+    per_inst : Dict[str, asyncio.Semaphore] = {}
+
+    async def _fetch(job: Job):
+        user, acc, ib = job
+        inst = per_inst.setdefault(acc.institution_code, asyncio.Semaphore(SYNC_PER_INSTITUTION))
+        # 기관 한도를 먼저 잡아야 한 기관이 전체 슬롯을 점유하지 않음
+        async with inst, limit:
+            _debug("TASK", f"fetching account_id={acc.id} ({acc.institution_code}-{acc.account_number})")
+            res = await fetch_transactions(start, end, ib, acc)  # CODEF 호출
+        _debug("TASK", f"account_id={acc.id} response message={res['result']['message']}")
+        return job, res["data"]["resTrHistoryList"]
+
+    async def _guarded(job: Job):
+        try:
+            return await _fetch(job)
+        except Exception as e:
+            logger.warning(f"[TASK] fetch failed account_id={job[1].id}: {e}")
+            return job, None
+
+    stats   = {"accounts": len(jobs), "fetched": 0, "failed": 0, "items": 0, "inserted": 0}
+    pending : Dict[str, dict] = {}      # tx_id → 행 (같은 배치 안 중복은 먼저 온 것 유지)
+    units   : Dict[int, int]  = {}      # user_id → 라운드-업 단위
+    tasks   = [asyncio.ensure_future(_guarded(job)) for job in jobs]
     try:
-        users: Iterable[User] = db.query(User).all()
-        _debug("TASK", f"total users={len(users)}")
+        for next_done in asyncio.as_completed(tasks):
+            (user, acc, _), items = await next_done
+            if items is None:
+                stats["failed"] += 1
+                continue
+
+            _debug("TASK", f"account_id={acc.id} fetched items count={len(items)}")
+            units.setdefault(user.id, _get_unit(user))
+            for item in items:
+                row = _tx_row(user, acc, item)
+                pending.setdefault(row["id"], row)
+            stats["fetched"] += 1
+            stats["items"]   += len(items)
+
+            if len(pending) >= SYNC_WRITE_BATCH:
+                rows = list(pending.values())
+                pending.clear()
+                stats["inserted"] += await asyncio.to_thread(_write_batch, db, rows, units)
+
+        stats["inserted"] += await asyncio.to_thread(_write_batch, db, list(pending.values()), units)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return stats
 
-        for user in users:
-            _debug("TASK", f"user_id={user.id} accounts={len(user.accounts)}")
-            accounts = _find_accounts(db, user)
-            
-            for acc in accounts:
-                _debug("TASK", f"account_id={acc.id} ({acc.institution_code}-{acc.account_number})")
 
-                ib = _find_ib(db, user, acc)
-                _debug("TASK", f"IB exists={ib is not None}")
+# ─────────────────────────── Celery Task ──────────────────────
+@celery_app.task(name="tasks.sync_transactions")
+def sync_transactions() -> str:
+    """
+    야간 동기화 코디네이터
+    ────────────────────────────────────────────────
+    • 사용자 공간을 SYNC_SHARDS 개 샤드로 나눠 sync_shard 서브태스크 group 으로 배포  
+    • 모든 샤드가 끝나면 chord 콜백(summarize_sync)이 실행 요약을 집계  
+    • 워커를 늘리면 샤드가 병렬로 처리됨 (샤드 내부 동시 조회 한도는 워커 프로세스별)
+    """
+    start, end = _date_range_yesterday()
+    shards     = max(SYNC_SHARDS, 1)
+
+    result = chord(
+        sync_shard.s(shard, shards, start, end) for shard in range(shards)
+    )(summarize_sync.s(start, end))
+
+    _debug("TASK", f"=== DISPATCHED sync_transactions shards={shards} chord={result.id} ===")
+    return result.id
 
-                if ib:
-                    _debug("IB", f"institution_code={ib.institution_code} banking_id={ib.banking_id}")
-                else:
-                    _debug("IB", "missing InternetBanking record")
 
-                _debug("TASK", f"fetching transactions from {start} to {end}")
-                res         = _run_async(fetch_transactions(start, end, ib, acc)) # CODEF 호출
-                res_message = res["result"]["message"]
-                _debug("TASK", f"response message={res_message}")
+@celery_app.task(name="tasks.sync_shard")
+def sync_shard(shard: int, shards: int, start: str, end: str) -> Dict[str, object]:
+    """
+    샤드 1개 거래내역 동기화 + 잔돈 계산 (계좌 조회는 동시 실행, DB 반영은 단일 writer)
+    ────────────────────────────────────────────────
+    • 실패해도 예외 대신 {"shard", "error", "elapsed_ms"} 반환 → chord 콜백이 항상 실행되어 요약이 남음
+    """
 
-                items = res["data"]["resTrHistoryList"]
-                _debug("TASK", f"fetched items count={len(items)}")
+    db : Session = SyncSessionLocal()
+    t0           = _time.monotonic()
 
-                for item in items:
-                    _upsert_tx_and_spare_change(db, user, acc, item)
+    _debug("TASK", f"=== START sync_shard {shard}/{shards} ===")
+    try:
+        jobs  = _collect_jobs(db, shard, shards)
+        _debug("TASK", f"fetching {len(jobs)} accounts from {start} to {end} "
+                       f"(concurrency={SYNC_CONCURRENCY}, per_institution={SYNC_PER_INSTITUTION})")
+        stats = _run_async(_fetch_and_write(db, jobs, start, end))
 
         db.commit()
-        _debug("TASK", "=== DONE sync_transactions (OK) ===")
-        return "OK"
+        stats.update(shard=shard, elapsed_ms=int((_time.monotonic() - t0) * 1000))
+        _debug("TASK", f"=== DONE sync_shard {shard}/{shards} (OK) {stats} ===")
+        return stats
 
     except Exception as e:
         db.rollback()
-        _debug("ERROR", f"sync_transactions error: {e}")
-        raise
+        logger.error(f"[TASK] sync_shard {shard}/{shards} failed: {e}")
+        return {
+            "shard"      : shard,
+            "error"      : f"{type(e).__name__}: {e}",
+            "elapsed_ms" : int((_time.monotonic() - t0) * 1000),
+        }
 
     finally:
         db.close()
+
+
+@celery_app.task(name="tasks.summarize_sync")
+def summarize_sync(results: List[Dict[str, object]], start: str, end: str) -> Dict[str, object]:
+    """chord 콜백: 샤드별 결과 → 실행 요약 1건 (실패한 샤드는 failed_shards 에 오류와 함께)"""
+
+    done    = [r for r in results if "error" not in r]
+    errored = [{"shard": r["shard"], "error": r["error"]} for r in results if "error" in r]
+    summary = {
+        "start"         : start,
+        "end"           : end,
+        "shards"        : len(results),
+        "failed_shards" : errored,
+        "accounts"      : sum(r["accounts"] for r in done),
+        "fetched"       : sum(r["fetched"]  for r in done),
+        "failed"        : sum(r["failed"]   for r in done),
+        "items"         : sum(r["items"]    for r in done),
+        "inserted"      : sum(r["inserted"] for r in done),
+        "slowest_ms"    : max((r["elapsed_ms"] for r in results), default=0),
+    }
+    if errored:
+        logger.error(f"[TASK] sync_transactions finished with {len(errored)} failed shard(s) {summary}")
+    else:
+        logger.info(f"[TASK] sync_transactions summary {summary}")
+    return summary
@@ -0,0 +1,52 @@
+# File: tests/test_delta_encoder.py
+"""DeltaEncoder: 스냅샷 → 변경 필드 → resync 주기와 seq"""
+from domain.fin.quote_hub import DeltaEncoder
+
+KEY   = ("stock", "005930")
+OTHER = ("stock", "000660")
+
+
+def test_first_frame_is_snapshot():
+    enc = DeltaEncoder()
+    assert enc.encode(KEY, {"price": 84400, "volume": 10}) == {
+        "seq": 1, "snapshot": True, "price": 84400, "volume": 10,
+    }
+
+
+def test_following_frames_carry_only_changed_fields():
+    enc = DeltaEncoder()
+    enc.encode(KEY, {"price": 84400, "volume": 10})
+    assert enc.encode(KEY, {"price": 84500, "volume": 10}) == {"seq": 2, "price": 84500}
+    assert enc.encode(KEY, {"price": 84500, "volume": 12}) == {"seq": 3, "volume": 12}
+
+
+def test_unchanged_payload_sends_nothing_and_keeps_seq():
+    enc = DeltaEncoder()
+    enc.encode(KEY, {"price": 84400})
+    assert enc.encode(KEY, {"price": 84400}) is None
+    assert enc.encode(KEY, {"price": 84300}) == {"seq": 2, "price": 84300}
+
+
+def test_reset_sends_snapshot_and_seq_keeps_counting():
+    enc = DeltaEncoder()
+    enc.encode(KEY, {"price": 84400})
+    enc.encode(KEY, {"price": 84500})
+    enc.reset(KEY)
+    assert enc.encode(KEY, {"price": 84500}) == {"seq": 3, "snapshot": True, "price": 84500}
+    assert enc.encode(KEY, {"price": 84600}) == {"seq": 4, "price": 84600}
+
+
+def test_forget_starts_over():
+    enc = DeltaEncoder()
+    enc.encode(KEY, {"price": 84400})
+    enc.encode(KEY, {"price": 84500})
+    enc.forget(KEY)
+    assert enc.encode(KEY, {"price": 84500}) == {"seq": 1, "snapshot": True, "price": 84500}
+
+
+def test_keys_are_independent():
+    enc = DeltaEncoder()
+    enc.encode(KEY, {"price": 84400})
+    assert enc.encode(OTHER, {"price": 182500}) == {"seq": 1, "snapshot": True, "price": 182500}
+    enc.reset(OTHER)
+    assert enc.encode(KEY, {"price": 84500}) == {"seq": 2, "price": 84500}
@@ -0,0 +1,92 @@
+# File: tests/test_kis_frames.py
+"""실시간 프레임 디코더: bench/kis_frames.txt 녹화 전체 + 부호 · 다건 · 예외 프레임"""
+import os
+
+import pytest
+
+from domain.fin.kis.kis_frames import DECODERS, TR_BY_KIND, parse_frame, tr_key
+
+FRAMES_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "bench", "kis_frames.txt")
+
+
+def _recorded():
+    with open(FRAMES_PATH, encoding="utf-8") as f:
+        return [line.rstrip("\n").split("\t", 1)[1] for line in f if line.strip() and not line.startswith("#")]
+
+
+RECORDED = _recorded()
+
+
+def _fields(raw: str):
+    return raw.split("|", 3)[3].split("^")
+
+
+def test_every_recorded_frame_decodes():
+    codes = set()
+    for raw in RECORDED:
+        ticks = parse_frame(raw)
+        assert len(ticks) == 1, raw
+        kind, code, payload = ticks[0]
+        assert set(payload) == {"price", "change", "volume"}
+        assert payload["price"] > 0 and payload["volume"] > 0
+        codes.add((kind, code))
+    assert codes == {("stock", "005930"), ("stock", "000660"), ("overseas", "AAPL|NAS")}
+
+
+def test_stock_fields_and_sign():
+    for raw in RECORDED:
+        if "|H0STCNT0|" not in raw:
+            continue
+        f = _fields(raw)
+        _, code, payload = parse_frame(raw)[0]
+        assert code == f[0]
+        assert payload["price"]  == int(f[2])
+        assert payload["volume"] == int(f[13])
+        # 대비부호 4(하한) · 5(하락) 이면 음수, 그 외 양수
+        assert payload["change"] == (-abs(int(f[4])) if f[3] in ("4", "5") else int(f[4]))
+
+
+def test_overseas_fields_and_sign():
+    for raw in RECORDED:
+        if "|HDFSCNT0|" not in raw:
+            continue
+        f = _fields(raw)
+        _, code, payload = parse_frame(raw)[0]
+        assert code == f"{f[1]}|NAS"
+        assert payload["price"]  == float(f[11])
+        assert payload["volume"] == int(f[20])
+        assert payload["change"] == (-abs(float(f[13])) if f[12] in ("4", "5") else float(f[13]))
+
+
+def test_falling_stock_has_negative_change():
+    raw = next(r for r in RECORDED if "|H0STCNT0|" in r and _fields(r)[3] == "5")
+    assert parse_frame(raw)[0][2]["change"] < 0
+
+
+def test_multi_record_frame():
+    stock = [r for r in RECORDED if "|H0STCNT0|" in r]
+    raw   = "0|H0STCNT0|002|" + "^".join(_fields(stock[0]) + _fields(stock[1]))
+    ticks = parse_frame(raw)
+    assert [t[1] for t in ticks] == [_fields(stock[0])[0], _fields(stock[1])[0]]
+
+
+def test_truncated_record_is_dropped():
+    raw   = RECORDED[0]
+    ticks = parse_frame(raw.replace("|001|", "|002|", 1))
+    assert len(ticks) == 1
+
+
+@pytest.mark.parametrize("raw", [
+    "1|H0STCNT0|001|암호화된본문",                         # 암호화 프레임
+    "0|H0STASP0|001|005930^093000",                       # 지원하지 않는 TR (호가)
+    '{"header": {"tr_id": "PINGPONG"}}',                 # 제어 메시지
+])
+def test_unsupported_frames_are_ignored(raw):
+    assert parse_frame(raw) == []
+
+
+def test_tr_key_and_tr_ids():
+    assert tr_key("stock", "005930")      == "005930"
+    assert tr_key("overseas", "AAPL|NAS") == "DNASAAPL"
+    assert TR_BY_KIND == {"stock": "H0STCNT0", "overseas": "HDFSCNT0"}
+    assert {tr: spec[1] for tr, spec in DECODERS.items()} == {"H0STCNT0": 46, "HDFSCNT0": 26}
@@ -0,0 +1,76 @@
+# File: tests/test_kis_ratelimit.py
+"""TokenBucket: 우선순위 · 대기열 상한 · 데드라인 · 최근 1초 사용량"""
+import asyncio
+
+import pytest
+
+from domain.fin.kis.kis_ratelimit import Priority, RateLimitExceeded, TokenBucket, tr_priority
+
+
+def _drained(rate: float = 20.0, max_queue: int = 8) -> TokenBucket:
+    """토큰을 다 쓴 버킷 (burst 1)"""
+    bucket = TokenBucket(rate, 1.0, max_queue=max_queue)
+    bucket.acquire(Priority.QUOTE)
+    return bucket
+
+
+def test_higher_priority_waiter_goes_first():
+    bucket = _drained()
+    order  = []
+
+    async def take(prio):
+        await bucket.acquire_async(prio, timeout=1.0)
+        order.append(prio)
+
+    async def run():
+        chart = asyncio.create_task(take(Priority.CHART))
+        quote = asyncio.create_task(take(Priority.QUOTE))
+        await asyncio.sleep(0)                        # 하위 클래스가 먼저 대기열에 들어감
+        await take(Priority.ORDER)
+        await asyncio.gather(chart, quote)
+
+    asyncio.run(run())
+    assert order == [Priority.ORDER, Priority.QUOTE, Priority.CHART]
+
+
+def test_full_queue_is_rejected():
+    bucket = _drained(rate=5.0, max_queue=1)
+
+    async def run():
+        waiter = asyncio.create_task(bucket.acquire_async(Priority.QUOTE, timeout=1.0))
+        await asyncio.sleep(0)
+        with pytest.raises(RateLimitExceeded, match="대기열 초과"):
+            await bucket.acquire_async(Priority.QUOTE, timeout=1.0)
+        await waiter
+
+    asyncio.run(run())
+    assert bucket.stats()["classes"]["quote"]["rejected"] == 1
+
+
+def test_deadline_is_enforced():
+    bucket = _drained(rate=0.5)
+
+    with pytest.raises(RateLimitExceeded, match="데드라인 초과"):
+        bucket.acquire(Priority.QUOTE, timeout=0.05)
+    stats = bucket.stats()["classes"]["quote"]
+    assert stats["rejected"] == 1 and stats["waiting"] == 0
+
+
+def test_recent_grants_keep_only_the_last_second():
+    bucket = TokenBucket(1000.0, 5.0)
+    for _ in range(5):
+        bucket.acquire(Priority.QUOTE)
+    assert bucket.stats()["last_1s"] == 5
+
+    # 허가 시각을 2초 전으로 → 다음 허가 때 정리됨
+    bucket._recent = type(bucket._recent)(t - 2.0 for t in bucket._recent)
+    bucket.acquire(Priority.QUOTE)
+    assert len(bucket._recent) == 1
+    assert bucket.stats()["last_1s"] == 1
+
+
+def test_tr_priority():
+    assert tr_priority("TTTC0802U")     == Priority.ORDER
+    assert tr_priority("TTTC8434R")     == Priority.ACCOUNT
+    assert tr_priority("FHKST01010100") == Priority.QUOTE
+    assert tr_priority("FHKST03010200") == Priority.CHART
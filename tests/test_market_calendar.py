@@ -0,0 +1,87 @@
+# File: tests/test_market_calendar.py
+"""시장 달력: 휴장일 · 세션 경계 · 조기 폐장 · 다음 개장"""
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from domain.fin.market_calendar import AUCTION, CLOSED, KRX, OPEN, US, calendar_for, session
+
+SEOUL    = ZoneInfo("Asia/Seoul")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def _kst(*args) -> float:
+    return datetime(*args, tzinfo=SEOUL).timestamp()
+
+
+def _et(*args) -> float:
+    return datetime(*args, tzinfo=NEW_YORK).timestamp()
+
+
+# ────────────────────────── 거래일 ──────────────────────────
+def test_krx_holidays_and_weekends_have_no_sessions():
+    assert KRX.sessions(date(2026, 10, 9)) == []        # 한글날
+    assert KRX.sessions(date(2026, 10, 10)) == []       # 토요일
+    assert KRX.sessions(date(2026, 10, 11)) == []       # 일요일
+    assert KRX.is_trading_day(date(2026, 10, 8))
+
+
+def test_us_holiday_has_no_sessions():
+    assert US.sessions(date(2026, 11, 26)) == []        # 추수감사절
+    assert US.is_trading_day(date(2026, 11, 25))
+
+
+# ────────────────────────── 세션 ──────────────────────────
+def test_krx_session_edges():
+    assert KRX.sessions(date(2026, 10, 8)) == [
+        (_kst(2026, 10, 8, 8, 30),  _kst(2026, 10, 8, 9, 0),   AUCTION),
+        (_kst(2026, 10, 8, 9, 0),   _kst(2026, 10, 8, 15, 20), OPEN),
+        (_kst(2026, 10, 8, 15, 20), _kst(2026, 10, 8, 15, 35), AUCTION),
+    ]
+
+
+def test_krx_state_through_the_day():
+    assert KRX.state(_kst(2026, 10, 8, 8, 0))   == (CLOSED,  _kst(2026, 10, 8, 8, 30))
+    assert KRX.state(_kst(2026, 10, 8, 8, 45))  == (AUCTION, _kst(2026, 10, 8, 9, 0))
+    assert KRX.state(_kst(2026, 10, 8, 10, 0))  == (OPEN,    _kst(2026, 10, 8, 15, 20))
+    assert KRX.state(_kst(2026, 10, 8, 15, 25)) == (AUCTION, _kst(2026, 10, 8, 15, 35))
+
+
+def test_krx_next_open_skips_holiday_and_weekend():
+    # 목요일 장 마감 후 → 금(한글날) · 토 · 일 건너뛰고 월요일 동시호가
+    assert KRX.state(_kst(2026, 10, 8, 16, 0)) == (CLOSED, _kst(2026, 10, 12, 8, 30))
+    assert KRX.state(_kst(2026, 10, 10, 12, 0)) == (CLOSED, _kst(2026, 10, 12, 8, 30))
+
+
+def test_krx_closed_at_is_last_session_end():
+    assert KRX.closed_at(_kst(2026, 10, 12, 8, 0)) == _kst(2026, 10, 8, 15, 35)
+    assert KRX.closed_at(_kst(2026, 10, 8, 16, 0)) == _kst(2026, 10, 8, 15, 35)
+    # 장중이면 직전에 끝난 세션(개장 동시호가) 종료
+    assert KRX.closed_at(_kst(2026, 10, 8, 10, 0)) == _kst(2026, 10, 8, 9, 0)
+    assert KRX.closed_at(_kst(2026, 10, 8, 8, 45)) == _kst(2026, 10, 7, 15, 35)
+
+
+def test_us_early_close():
+    sessions = US.sessions(date(2026, 11, 27))
+    assert sessions[1] == (_et(2026, 11, 27, 9, 30), _et(2026, 11, 27, 13, 0), OPEN)
+    assert US.state(_et(2026, 11, 27, 13, 2)) == (AUCTION, _et(2026, 11, 27, 13, 5))
+    assert US.state(_et(2026, 11, 27, 14, 0)) == (CLOSED,  _et(2026, 11, 30, 9, 25))
+
+
+def test_us_sessions_follow_local_time_across_dst():
+    # 2026-11-01 서머타임 종료 → 개장 시각(UTC)이 한 시간 늦어짐
+    before = US.sessions(date(2026, 10, 30))[1][0]
+    after  = US.sessions(date(2026, 11, 2))[1][0]
+    assert datetime.fromtimestamp(before, ZoneInfo("UTC")).hour == 13
+    assert datetime.fromtimestamp(after,  ZoneInfo("UTC")).hour == 14
+
+
+# ────────────────────────── 종목 → 달력 ──────────────────────────
+def test_calendar_for():
+    assert calendar_for("stock", "005930") is KRX
+    assert calendar_for("index", "0001") is KRX
+    assert calendar_for("overseas", "AAPL|NAS") is US
+    assert calendar_for("overseas", "0700|HKS") is None
+
+
+def test_session_without_calendar_is_always_open():
+    assert session("overseas", "0700|HKS") == (OPEN, float("inf"))
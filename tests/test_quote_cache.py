@@ -0,0 +1,176 @@
+# File: tests/test_quote_cache.py
+"""QuoteCache: TTL · 요청 합치기 · 오류 시 이전 값 응답 · 재시도 대기"""
+import asyncio
+import time
+
+import pytest
+
+from domain.fin import quote_cache as qc
+
+
+class _Upstream:
+    """호출 수를 세고, fail=True 면 예외를 내는 조회 함수"""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.fail  = False
+        self.delay = delay
+
+    async def __call__(self, code: str) -> dict:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"code": code, "price": 100 + self.calls}
+
+
+def _cache(upstream: _Upstream, ttl: float = 0.0) -> qc.QuoteCache:
+    cache = qc.QuoteCache()
+    cache.register("stock", upstream, ttl=ttl)
+    return cache
+
+
+def _expire(cache: qc.QuoteCache, code: str = "005930") -> qc._Entry:
+    """TTL 과 재시도 대기를 지난 것으로 만듦"""
+    entry = cache._entries[("stock", code)]
+    entry.expires  = 0.0
+    entry.retry_at = 0.0
+    return entry
+
+
+@pytest.fixture(autouse=True)
+def _retry(monkeypatch):
+    monkeypatch.setattr(qc, "QUOTE_RETRY_BASE", 10.0)
+    monkeypatch.setattr(qc, "QUOTE_RETRY_MAX",  15.0)
+    monkeypatch.setattr(qc, "QUOTE_STALE_MAX",  600.0)
+
+
+# ────────────────────────── TTL · 합치기 ──────────────────────────
+def test_hit_within_ttl():
+    up    = _Upstream()
+    cache = _cache(up, ttl=60.0)
+
+    async def run():
+        first  = await cache.get("stock", "005930")
+        second = await cache.get("stock", "005930")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert up.calls == 1
+    assert first == second
+    assert first["stale"] is False and first["as_of"] > 0
+
+
+def test_concurrent_misses_share_one_call():
+    up    = _Upstream(delay=0.01)
+    cache = _cache(up)
+
+    async def run():
+        return await asyncio.gather(*(cache.get("stock", "005930") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert up.calls == 1
+    assert {r["price"] for r in results} == {101}
+    assert cache.stats()["kinds"]["stock"]["coalesced"] == 4
+
+
+# ────────────────────────── 오류 시 이전 값 ──────────────────────────
+def test_error_serves_last_good_value_as_stale():
+    up    = _Upstream()
+    cache = _cache(up)
+
+    async def run():
+        good = await cache.get("stock", "005930")
+        _expire(cache)
+        up.fail = True
+        return good, await cache.get("stock", "005930")
+
+    good, stale = asyncio.run(run())
+    assert stale["stale"] is True
+    assert stale["price"] == good["price"]
+    assert stale["as_of"] == good["as_of"]
+
+
+def test_no_upstream_call_while_waiting_to_retry():
+    up    = _Upstream()
+    cache = _cache(up)
+
+    async def run():
+        await cache.get("stock", "005930")
+        _expire(cache)
+        up.fail = True
+        await cache.get("stock", "005930")              # 실패 → 재시도 대기
+        calls = up.calls
+        for _ in range(3):
+            assert (await cache.get("stock", "005930"))["stale"] is True
+        return calls
+
+    calls = asyncio.run(run())
+    assert up.calls == calls
+
+
+def test_retry_wait_doubles_up_to_max():
+    up    = _Upstream()
+    cache = _cache(up)
+    waits = []
+
+    async def run():
+        await cache.get("stock", "005930")
+        up.fail = True
+        for _ in range(3):
+            _expire(cache)
+            await cache.get("stock", "005930")
+            waits.append(cache._entries[("stock", "005930")].retry_at - time.monotonic())
+
+    asyncio.run(run())
+    assert [round(w) for w in waits] == [10, 15, 15]
+
+
+def test_success_after_failures_clears_backoff():
+    up    = _Upstream()
+    cache = _cache(up)
+
+    async def run():
+        await cache.get("stock", "005930")
+        _expire(cache)
+        up.fail = True
+        await cache.get("stock", "005930")
+        _expire(cache)
+        up.fail = False
+        return await cache.get("stock", "005930")
+
+    fresh = asyncio.run(run())
+    assert fresh["stale"] is False
+    assert cache._entries[("stock", "005930")].failures == 0
+
+
+def test_too_old_value_is_not_served():
+    up    = _Upstream()
+    cache = _cache(up)
+
+    async def run():
+        await cache.get("stock", "005930")
+        _expire(cache).as_of -= 601.0
+        up.fail = True
+        await cache.get("stock", "005930")
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        asyncio.run(run())
+
+
+# ────────────────────────── 값이 없는 종목 ──────────────────────────
+def test_never_loaded_symbol_backs_off():
+    up      = _Upstream()
+    up.fail = True
+    cache   = _cache(up)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="upstream down"):
+            await cache.get("stock", "999999")
+        with pytest.raises(RuntimeError, match="재시도 대기"):
+            await cache.get("stock", "999999")
+
+    asyncio.run(run())
+    assert up.calls == 1
+    assert cache._entries[("stock", "999999")].as_of == 0.0
@@ -0,0 +1,65 @@
+# File: tests/test_token_store.py
+"""TokenManager: 발급 1건 · 저장소 공유 · 짧은 토큰 선제 갱신 구간 · 거부 토큰 재발급"""
+import time
+
+from domain.utils.token_store import FileTokenStore, TokenManager, TokenRecord
+
+
+class _Issuer:
+    """호출마다 새 토큰을 lifetime 초 유효로 발급"""
+
+    def __init__(self, lifetime: float) -> None:
+        self.lifetime = lifetime
+        self.calls    = 0
+
+    def __call__(self) -> TokenRecord:
+        self.calls += 1
+        return TokenRecord(f"tok-{self.calls}", time.time() + self.lifetime)
+
+
+def test_issues_once_and_caches(tmp_path):
+    issue = _Issuer(86400)
+    mgr   = TokenManager("kis", issue, FileTokenStore(str(tmp_path)))
+    assert mgr.get() == mgr.get() == "tok-1"
+    assert issue.calls == 1 and mgr.issued == 1
+
+
+def test_second_process_adopts_stored_token(tmp_path):
+    issue = _Issuer(86400)
+    first = TokenManager("kis", issue, FileTokenStore(str(tmp_path)))
+    other = TokenManager("kis", issue, FileTokenStore(str(tmp_path)))
+    assert first.get() == other.get() == "tok-1"
+    assert issue.calls == 1 and other.adopted == 1
+
+
+def test_short_lived_token_is_not_reissued_every_call(tmp_path):
+    # 유효 10분 토큰 + 선제 갱신 1시간 → 갱신 구간은 유효 기간의 절반(5분)
+    issue = _Issuer(600)
+    mgr   = TokenManager("codef", issue, FileTokenStore(str(tmp_path)), refresh_secs=3600)
+    for _ in range(5):
+        assert mgr.get() == "tok-1"
+    assert issue.calls == 1
+    assert round(mgr._window(mgr._record)) == 300
+
+
+def test_window_is_refresh_secs_for_long_tokens_and_legacy_records():
+    mgr = TokenManager("kis", _Issuer(86400), store=object(), refresh_secs=3600)
+    now = time.time()
+    assert mgr._window(TokenRecord("t", now + 86400, now)) == 3600
+    assert mgr._window(TokenRecord("t", now + 600)) == 3600          # 발급 시각 모름 → 기존 동작
+
+
+def test_invalidate_reissues_even_if_store_has_token(tmp_path):
+    issue = _Issuer(86400)
+    mgr   = TokenManager("kis", issue, FileTokenStore(str(tmp_path)))
+    mgr.get()
+    mgr.invalidate()
+    assert mgr.get() == "tok-2"
+    assert issue.calls == 2
+
+
+def test_record_json_round_trip():
+    rec = TokenRecord("t", 2000.0, 1000.0)
+    assert TokenRecord.from_json(rec.to_json()) == rec
+    assert TokenRecord.from_json('{"token": "t", "expires_at": 2000}') == TokenRecord("t", 2000.0)
+    assert TokenRecord.from_json("not json") is None